@@ -1,37 +1,158 @@
 from __future__ import annotations
 
 import datetime
+import functools
+import sys
 import uuid
-from typing import TYPE_CHECKING, Annotated
+from typing import TYPE_CHECKING, Annotated, cast
 
 from pydantic import BaseModel, Field
 
+from todo._typing import AssetDelivery, DataFormat, FontSource, StorageBackend
+
 if TYPE_CHECKING:
-    from todo._typing import ActionType, HistoryItemDict, TaskDict, TaskType
+    from collections.abc import Callable
+
+    from todo._typing import ActionType, EventPayload, HistoryItemDict, TaskDict, TaskType
+
+
+# ========================
+# Temporal Fields
+# ========================
+# 时间字段在加载时解析一次，内存中以整数保存：日期为 date.toordinal()，
+# 时刻为 ordinal * 1440 + 分钟数（无时区），排序时直接比较整数，只在 to_dict() 时转回字符串。
+MINUTES_PER_DAY = 1440
+MAX_ORDINAL = datetime.date.max.toordinal()
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_day(value: str) -> int | None:
+    try:
+        if len(value) != 10 or value[4] != "-" or value[7] != "-":
+            raise ValueError(value)
+        return datetime.date(int(value[:4]), int(value[5:7]), int(value[8:])).toordinal()
+    except ValueError:
+        return None
+
+
+def parse_date(value: str | None) -> int | None:
+    """解析 ``%Y-%m-%d``，返回日期序数；为空或格式错误时返回 None。"""
+    if not value:
+        return None
+    return _parse_day(value)
+
+
+def parse_minutes(value: str | None) -> int | None:
+    """解析 ``%Y-%m-%d %H:%M``，返回分钟序数；为空或格式错误时返回 None。"""
+    if not value or len(value) != 16 or value[10] != " " or value[13] != ":":
+        return None
+    day = _parse_day(value[:10])
+    if day is None:
+        return None
+    try:
+        hour, minute = int(value[11:13]), int(value[14:])
+    except ValueError:
+        return None
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        return None
+    return day * MINUTES_PER_DAY + hour * 60 + minute
+
+
+@functools.lru_cache(maxsize=4096)
+def format_date(ordinal: int) -> str:
+    return datetime.date.fromordinal(ordinal).isoformat()
+
+
+def format_minutes(minutes: int) -> str:
+    day, minute_of_day = divmod(minutes, MINUTES_PER_DAY)
+    return f"{format_date(day)} {minute_of_day // 60:02d}:{minute_of_day % 60:02d}"
+
+
+def minutes_to_datetime(minutes: int) -> datetime.datetime:
+    day, minute_of_day = divmod(minutes, MINUTES_PER_DAY)
+    return datetime.datetime.combine(
+        datetime.date.fromordinal(day), datetime.time(minute_of_day // 60, minute_of_day % 60)
+    )
+
+
+def now_minutes() -> int:
+    now = datetime.datetime.now()
+    return now.toordinal() * MINUTES_PER_DAY + now.hour * 60 + now.minute
 
 
 # ========================
 # Data Models
 # ========================
 class Task:
+    """待办任务。
+
+    ``created_min``/``completed_min``/``due_ord`` 是解析后的整数时间，
+    ``created_at``/``completed_at``/``due_date`` 属性按原格式读写字符串。
+    无法解析的原始字符串保存在 ``_raw`` 中，以便原样写回。
+    ``recurrence`` 为重复规则（见 ``todo.core.recurrence``），只有当前未完成的一次带有规则。
+    """
+
+    __slots__ = (
+        "_raw",
+        "color",
+        "completed",
+        "completed_min",
+        "created_min",
+        "due_ord",
+        "id",
+        "recurrence",
+        "task",
+        "task_type",
+    )
+
     def __init__(
         self,
         task: str,
         task_type: TaskType = "daily",
         color: str = "#007AFF",
         due_date: str | None = None,
+        recurrence: str | None = None,
     ):
         self.id = str(uuid.uuid4())
         self.task = task
         self.task_type: TaskType = task_type
         self.color = color if color else "#007AFF"
-        self.created_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        self.created_min: int = now_minutes()
         self.completed = False
-        self.completed_at: str | None = None
+        self.completed_min: int | None = None
+        self._raw: dict[str, str] | None = None
+        self.due_ord: int | None = None
         self.due_date = due_date
+        self.recurrence = recurrence
+
+    @property
+    def created_at(self) -> str:
+        return self._text("created_at", self.created_min)
+
+    @created_at.setter
+    def created_at(self, value: str) -> None:
+        self.created_min = self._parse("created_at", value, parse_minutes) or 0
+
+    @property
+    def completed_at(self) -> str | None:
+        return None if self.completed_min is None else format_minutes(self.completed_min)
+
+    @completed_at.setter
+    def completed_at(self, value: str | None) -> None:
+        self.completed_min = parse_minutes(value)
+
+    @property
+    def due_date(self) -> str | None:
+        if self.due_ord is not None:
+            return format_date(self.due_ord)
+        return self._raw.get("due_date") if self._raw else None
+
+    @due_date.setter
+    def due_date(self, value: str | None) -> None:
+        self.due_ord = self._parse("due_date", value, parse_date)
 
     def to_dict(self) -> TaskDict:
-        return {
+        data: TaskDict = {
             "id": self.id,
             "task": self.task,
             "task_type": self.task_type,
@@ -41,48 +162,187 @@ class Task:
             "completed_at": self.completed_at,
             "due_date": self.due_date,
         }
+        if self.recurrence:
+            data["recurrence"] = self.recurrence
+        return data
 
     @classmethod
     def from_dict(cls, data: TaskDict) -> Task:
-        task = cls(
-            task=data["task"],
-            task_type=data["task_type"],
-            color=data.get("color", "#007AFF"),
-            due_date=data.get("due_date"),
-        )
+        # 绕过 __init__，避免为每个已存在的任务生成 uuid 和读取当前时间
+        task = cls.__new__(cls)
         task.id = data["id"]
-        task.created_at = data["created_at"]
+        task.task = data["task"]
+        task.task_type = cast("TaskType", sys.intern(data["task_type"]))
+        task.color = sys.intern(data.get("color") or "#007AFF")
         task.completed = data["completed"]
-        task.completed_at = data.get("completed_at")
+        task.recurrence = data.get("recurrence")
+        task._raw = None
+        created_min = parse_minutes(data["created_at"])
+        task.created_min = created_min or 0
+        task.completed_min = parse_minutes(data.get("completed_at"))
+        due_date = data.get("due_date")
+        task.due_ord = parse_date(due_date)
+        if created_min is None or (task.due_ord is None and due_date is not None):
+            # 少见的非法时间走属性 setter，保留原始字符串
+            task.created_at = data["created_at"]
+            task.due_date = due_date
         return task
 
+    @classmethod
+    def from_parsed(
+        cls,
+        id: str,
+        task: str,
+        task_type: TaskType,
+        color: str,
+        created_min: int,
+        completed: bool,
+        completed_min: int | None,
+        due_ord: int | None,
+        recurrence: str | None = None,
+    ) -> Task:
+        """由已解析的整数时间直接构造，供二进制快照等不经过字符串的加载路径使用。"""
+        obj = cls.__new__(cls)
+        obj.id = id
+        obj.task = task
+        obj.task_type = task_type
+        obj.color = color
+        obj.created_min = created_min
+        obj.completed = completed
+        obj.completed_min = completed_min
+        obj.due_ord = due_ord
+        obj.recurrence = recurrence
+        obj._raw = None
+        return obj
+
+    @property
+    def raw_fields(self) -> dict[str, str]:
+        """无法解析而原样保留的时间字段。"""
+        return dict(self._raw) if self._raw else {}
+
+    def _text(self, field: str, value: int) -> str:
+        if self._raw and field in self._raw:
+            return self._raw[field]
+        return format_minutes(value)
+
+    def _parse(self, field: str, value: str | None, parser: Callable[[str | None], int | None]) -> int | None:
+        parsed = parser(value)
+        if self._raw:
+            self._raw.pop(field, None)
+        if parsed is None and value is not None:
+            self._raw = {**(self._raw or {}), field: value}
+        return parsed
+
 
 class HistoryItem:
-    def __init__(self, action: ActionType, task_description: str, task_type: str):
+    """一条操作记录，也是事件日志中的一个事件。
+
+    ``payload`` 保存受影响任务在操作前后的完整状态，足以重放或撤销这次操作；
+    早期版本写入的记录没有 ``task_id`` 与 ``payload``，只用于显示。
+    """
+
+    __slots__ = ("action", "id", "payload", "task_description", "task_id", "task_type", "ts_min")
+
+    def __init__(
+        self,
+        action: ActionType,
+        task_description: str,
+        task_type: str,
+        task_id: str | None = None,
+        payload: EventPayload | None = None,
+    ):
         self.id = str(uuid.uuid4())
         self.action: ActionType = action
         self.task_description = task_description[:50] + ("..." if len(task_description) > 50 else "")
         self.task_type = task_type if task_type else "unknown"
-        self.timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
+        self.ts_min: int = now_minutes()
+        self.task_id = task_id
+        self.payload = payload
+
+    @property
+    def timestamp(self) -> str:
+        return format_minutes(self.ts_min) if self.ts_min else ""
+
+    @timestamp.setter
+    def timestamp(self, value: str) -> None:
+        self.ts_min = parse_minutes(value) or 0
 
     def to_dict(self) -> HistoryItemDict:
-        return {
+        data: HistoryItemDict = {
             "id": self.id,
             "action": self.action,
             "task_description": self.task_description,
             "task_type": self.task_type,
             "timestamp": self.timestamp,
         }
+        if self.task_id is not None:
+            data["task_id"] = self.task_id
+        if self.payload is not None:
+            data["payload"] = self.payload
+        return data
+
+    @classmethod
+    def from_parsed(
+        cls,
+        id: str,
+        action: ActionType,
+        task_description: str,
+        task_type: str,
+        ts_min: int,
+        task_id: str | None = None,
+        payload: EventPayload | None = None,
+    ) -> HistoryItem:
+        item = cls.__new__(cls)
+        item.id = id
+        item.action = action
+        item.task_description = task_description
+        item.task_type = task_type
+        item.ts_min = ts_min
+        item.task_id = task_id
+        item.payload = payload
+        return item
 
     @classmethod
     def from_dict(cls, data: HistoryItemDict) -> HistoryItem:
-        return cls(
-            action=data["action"],
-            task_description=data["task_description"],
-            task_type=data["task_type"],
-        )
+        item = cls.__new__(cls)
+        item.id = data["id"]
+        item.action = cast("ActionType", sys.intern(data["action"]))
+        item.task_description = data["task_description"]
+        item.task_type = sys.intern(data["task_type"] or "unknown")
+        item.timestamp = data["timestamp"]
+        item.task_id = data.get("task_id")
+        item.payload = data.get("payload")
+        return item
 
 
 class ToDoSettings(BaseModel):
     history_file_path: Annotated[str, Field("./config/todo_data_simplified.json", title="历史文件路径")]
     as_package: Annotated[bool, Field(False, title="是否作为子项目")]
+    storage_backend: Annotated[StorageBackend, Field("json", title="存储后端")]
+    data_format: Annotated[DataFormat, Field("json", title="数据文件格式(json/json-compact/jsonl/binary)")]
+    data_format_auto_detect: Annotated[bool, Field(True, title="读取时自动识别数据文件格式")]
+    sqlite_file_path: Annotated[str, Field("./config/todo_data.sqlite3", title="SQLite 数据库路径")]
+    query_limit: Annotated[int, Field(500, ge=1, title="可查询后端每页最多读取的任务数")]
+    page_size: Annotated[int, Field(50, ge=0, title="每页显示的任务数(0 表示不分页)")]
+    lazy_tabs: Annotated[bool, Field(False, title="是否只渲染当前选中的分类")]
+    history_max_items: Annotated[int, Field(0, ge=0, title="最多保留的操作记录条数(0 表示不限)")]
+    history_max_age_days: Annotated[int, Field(0, ge=0, title="操作记录保留天数(0 表示不限)")]
+    history_archive_path: Annotated[str, Field("./config/todo_history_archive.jsonl", title="过期操作记录归档路径")]
+    journal_checkpoint_interval: Annotated[int, Field(1000, ge=1, title="日志检查点间隔(记录数)")]
+    write_behind: Annotated[bool, Field(False, title="是否在后台合并写入")]
+    write_coalesce_ms: Annotated[int, Field(200, ge=0, title="后台写入合并窗口(毫秒)")]
+    import_workers: Annotated[int, Field(0, ge=0, title="批量导入的校验进程数(0 表示 CPU 核数)")]
+    import_parallel_min_rows: Annotated[int, Field(20000, ge=1, title="超过该行数才使用多进程校验")]
+    font_source: Annotated[FontSource, Field("google", title="字体来源(google/local/system)")]
+    asset_delivery: Annotated[AssetDelivery, Field("inline", title="样式注入方式(inline/static)")]
+    metrics_enabled: Annotated[bool, Field(False, title="是否记录性能指标")]
+    metrics_debug_panel: Annotated[bool, Field(False, title="是否在侧边栏显示性能面板")]
+    metrics_file_path: Annotated[
+        str, Field("./config/todo_metrics.jsonl", title="性能指标文件路径(JSON Lines，空字符串表示不写入)")
+    ]
+    metrics_file_max_kb: Annotated[int, Field(1024, ge=1, title="性能指标文件轮转大小(KB)")]
+    metrics_file_backups: Annotated[int, Field(3, ge=0, title="保留的已轮转指标文件数")]
+    metrics_prometheus_path: Annotated[str, Field("", title="Prometheus 文本格式指标文件路径(空字符串表示不写入)")]
+    watch_interval_s: Annotated[float, Field(2.0, ge=0, title="检查数据文件变化的间隔(秒，0 表示不检查)")]
+    undo_depth: Annotated[int, Field(50, ge=0, title="最多可撤销的操作步数(0 表示不可撤销)")]
+    show_analytics: Annotated[bool, Field(True, title="是否显示统计标签页")]
@@ -1,68 +1,6 @@
 from __future__ import annotations
 
-LANGUAGES = {
-    "en": {
-        "title": "✓ Simple & Clear To-Do",
-        "add_task": "Add Task",
-        "task_desc": "Task Description",
-        "task_placeholder": "What needs to be done?",
-        "due_date": "Due Date",
-        "today": "General",
-        "week": "Weekly",
-        "month": "Monthly",
-        "completed": "Completed",
-        "no_tasks": "All clear! No tasks here.",
-        "mark_complete": "Mark as complete",
-        "mark_incomplete": "Mark as incomplete",
-        "delete": "Delete",
-        "history": "Activity Log",
-        "no_history": "No activity yet",
-        "task_type": "Category",
-        "daily": "General",
-        "weekly": "Weekly",
-        "monthly": "Monthly",
-        "color": "Color",
-        "Overdue": "Overdue",
-        "days": "days",
-        "Due today": "Due today",
-        "Due in": "Due in",
-        "Due": "Due",
-        "Completed": "Completed",
-        "Added": "Added",
-        "Deleted": "Deleted",
-        "Uncompleted": "Uncompleted",
-        "Completed_action": "Completed",
-    },
-    "zh": {
-        "title": "✓ 轻简待办事项",
-        "add_task": "添加任务",
-        "task_desc": "任务描述",
-        "task_placeholder": "需要做什么？",
-        "due_date": "截止日期",
-        "today": "日常",
-        "week": "每周",
-        "month": "每月",
-        "completed": "已完成",
-        "no_tasks": "太棒了，当前没有任务！",
-        "mark_complete": "标记完成",
-        "mark_incomplete": "取消完成",
-        "delete": "删除",
-        "history": "操作记录",
-        "no_history": "暂无操作记录",
-        "task_type": "分类",
-        "daily": "日常",
-        "weekly": "每周",
-        "monthly": "每月",
-        "color": "颜色",
-        "Overdue": "已过期",
-        "days": "天",
-        "Due today": "今日截止",
-        "Due in": "还剩",
-        "Due": "截止于",
-        "Completed": "完成于",
-        "Added": "已添加",
-        "Deleted": "已删除",
-        "Uncompleted": "已取消完成",
-        "Completed_action": "已完成",
-    },
-}
+from todo.locales import Catalogs
+
+# 词条保存在 todo/locales/<语言代码>.json 中，按需加载
+LANGUAGES = Catalogs()
@@ -1,10 +1,17 @@
 # _typing.py
 from __future__ import annotations
 
-from typing import Literal, TypedDict  # 保留TypedDict和Literal
+from typing import Literal, NotRequired, TypedDict  # 保留TypedDict和Literal
 
 TaskType = Literal["daily", "weekly", "monthly"]
-ActionType = Literal["Added", "Completed_action", "Deleted", "Uncompleted"]
+ActionType = Literal["Added", "Completed_action", "Deleted", "Uncompleted", "Imported", "Undone", "Redone"]
+TaskCategory = Literal["daily", "weekly", "monthly", "completed"]
+DueStatus = Literal["overdue", "today", "soon", "later"]
+TabKey = Literal[TaskCategory, "analytics"]
+StorageBackend = Literal["json", "journal", "sqlite"]
+DataFormat = Literal["json", "json-compact", "jsonl", "binary"]
+FontSource = Literal["google", "local", "system"]
+AssetDelivery = Literal["inline", "static"]
 
 
 class TaskDict(TypedDict):
@@ -16,6 +23,15 @@ class TaskDict(TypedDict):
     completed: bool
     completed_at: str | None
     due_date: str | None
+    recurrence: NotRequired[str]
+
+
+class EventPayload(TypedDict):
+    """受影响任务在操作前后的完整状态；撤销、重做记录的 ``ref`` 为原操作的记录 id。"""
+
+    before: list[TaskDict]
+    after: list[TaskDict]
+    ref: NotRequired[str]
 
 
 class HistoryItemDict(TypedDict):
@@ -24,12 +40,45 @@ class HistoryItemDict(TypedDict):
     task_description: str
     task_type: str
     timestamp: str
+    task_id: NotRequired[str]
+    payload: NotRequired[EventPayload]
 
 
 class DataDict(TypedDict):
+    revision: NotRequired[int]
     tasks: list[TaskDict]
     history: list[HistoryItemDict]
     last_updated: str
 
 
+class JsonlHeader(TypedDict):
+    kind: Literal["header"]
+    format: str
+    version: int
+    revision: NotRequired[int]
+    last_updated: str
+
+
+class TaskRecord(TypedDict):
+    op: Literal["task"]
+    data: TaskDict
+
+
+class DeleteRecord(TypedDict):
+    op: Literal["delete"]
+    id: str
+
+
+class HistoryRecord(TypedDict):
+    op: Literal["history"]
+    data: HistoryItemDict
+
+
+class DropHistoryRecord(TypedDict):
+    op: Literal["drop_history"]
+    id: str
+
+
+JournalRecord = TaskRecord | DeleteRecord | HistoryRecord | DropHistoryRecord
+
 LanguageDict = dict[str, dict[str, str]]
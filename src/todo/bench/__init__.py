@@ -0,0 +1,6 @@
+from __future__ import annotations
+
+from todo.bench.data import generate_tasks
+from todo.bench.runner import compare, run
+
+__all__ = ["compare", "generate_tasks", "run"]
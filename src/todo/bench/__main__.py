@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from todo.bench.runner import FORMATS, compare, run
+
+
+def parse_size(value: str) -> int:
+    value = value.strip().lower()
+    scale = {"k": 1_000, "m": 1_000_000}.get(value[-1:], 1)
+    return int(float(value.rstrip("km")) * scale)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m todo.bench", description="任务仓库性能基准")
+    parser.add_argument("--sizes", default="1k,10k,100k", help="逗号分隔的任务数，如 1k,10k,100k,1m")
+    parser.add_argument("--formats", default=",".join(FORMATS), help="要测试的数据文件格式")
+    parser.add_argument("--no-app", action="store_true", help="跳过 AppTest 整页运行")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="结果 JSON 的输出路径，默认输出到标准输出")
+    parser.add_argument("--compare", type=Path, help="与之前的结果 JSON 对比，变慢超过 10% 时返回非零")
+    args: Any = parser.parse_args(argv)
+
+    sizes = [parse_size(size) for size in args.sizes.split(",") if size]
+    formats = [f for f in args.formats.split(",") if f]
+    results = run(sizes, formats=formats, app=not args.no_app, seed=args.seed)
+    text = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+    if args.compare:
+        regressions = compare(results, json.loads(args.compare.read_text(encoding="utf-8")))
+        if regressions:
+            print(f"{len(regressions)} 项变慢超过 10%", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
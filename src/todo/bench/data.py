@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import datetime
+import random
+import uuid
+from typing import TYPE_CHECKING
+
+from todo._dataclass import MINUTES_PER_DAY, HistoryItem, Task
+
+if TYPE_CHECKING:
+    from todo._typing import ActionType, TaskType
+
+WORDS = (
+    "review report write email call plan fix update meeting prepare read buy clean send check "
+    "design deploy test refactor book pay schedule draft sync backup invoice budget notes"
+).split()
+CJK_WORDS = "写周报 回复邮件 整理 会议 买菜 打扫 复习 计划 预算 备份 报销 发票 读书 跑步 缴费 提交 设计 测试".split()
+COLORS = ("#007AFF", "#FF3B30", "#34C759", "#FF9500", "#AF52DE", "#5AC8FA")
+TASK_TYPES: tuple[TaskType, ...] = ("daily", "weekly", "monthly")
+# 生成数据所用的“今天”固定，结果与运行日期无关
+BASE_DATE = datetime.date(2025, 1, 1)
+
+
+def description(rng: random.Random) -> str:
+    words = [rng.choice(CJK_WORDS) if rng.random() < 0.4 else rng.choice(WORDS) for _ in range(rng.randint(2, 8))]
+    return " ".join(words)
+
+
+def generate_tasks(count: int, seed: int = 0, today: datetime.date = BASE_DATE) -> tuple[list[Task], list[HistoryItem]]:
+    """生成固定种子的 ``count`` 个任务及其历史记录。
+
+    任务在过去一年内创建，约 40% 已完成、60% 设有截止日期（以 ``today`` 为中心前后 60 天），
+    历史包含每个任务的添加/完成记录，以及约 10% 已删除任务留下的添加/删除记录，按时间倒序排列。
+    """
+    rng = random.Random(seed)
+    today_min = today.toordinal() * MINUTES_PER_DAY
+    tasks: list[Task] = []
+    history: list[HistoryItem] = []
+
+    def record(action: ActionType, task: Task, ts_min: int) -> None:
+        text = task.task[:50] + ("..." if len(task.task) > 50 else "")
+        item_id = str(uuid.UUID(int=rng.getrandbits(128), version=4))
+        history.append(HistoryItem.from_parsed(item_id, action, text, task.task_type, ts_min))
+
+    while len(tasks) < count:
+        task_type = rng.choices(TASK_TYPES, weights=(6, 3, 1))[0]
+        created_min = today_min - rng.randrange(365 * MINUTES_PER_DAY)
+        completed = rng.random() < 0.4
+        completed_min = min(created_min + rng.randrange(30 * MINUTES_PER_DAY), today_min) if completed else None
+        due_ord = today.toordinal() + rng.randint(-60, 60) if rng.random() < 0.6 else None
+        task = Task.from_parsed(
+            str(uuid.UUID(int=rng.getrandbits(128), version=4)),
+            description(rng),
+            task_type,
+            rng.choice(COLORS),
+            created_min,
+            completed,
+            completed_min,
+            due_ord,
+        )
+        record("Added", task, created_min)
+        if completed_min is not None:
+            record("Completed_action", task, completed_min)
+        if rng.random() < 0.1:
+            # 已删除的任务只留在历史中
+            record("Deleted", task, min(created_min + rng.randrange(7 * MINUTES_PER_DAY), today_min))
+        else:
+            tasks.append(task)
+    history.sort(key=lambda item: item.ts_min, reverse=True)
+    return tasks, history
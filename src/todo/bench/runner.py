@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import datetime
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import tomli_w
+
+from todo.bench.data import BASE_DATE, generate_tasks
+from todo.core import CATEGORIES, SearchIndex, TaskIndex, Translator
+from todo.core.analytics import compute_analytics
+from todo.core.index import (
+    filter_completed_tasks,
+    filter_daily_tasks,
+    filter_monthly_tasks,
+    filter_weekly_tasks,
+    sort_completed_tasks,
+    sort_tasks_by_due_date,
+)
+from todo.storage import JsonStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Sequence
+
+    from todo._dataclass import HistoryItem, Task
+    from todo._typing import DataFormat, TaskCategory
+
+SCRIPT = Path(__file__).parent.parent / "streamlit_to_do.py"
+FORMATS: tuple[DataFormat, ...] = ("json", "jsonl", "binary")
+# 生成的描述由常用词随机组合，每个常用词约出现在十分之一的任务中
+SEARCH_QUERIES = {"word": "report", "words": "report budget", "cjk": "写周报", "mixed": "review 写周报"}
+SEARCH_LIMIT = 50
+FILTERS: dict[TaskCategory, Callable[[Task], bool]] = {
+    "daily": filter_daily_tasks,
+    "weekly": filter_weekly_tasks,
+    "monthly": filter_monthly_tasks,
+    "completed": filter_completed_tasks,
+}
+
+
+def measure(fn: Callable[[], object], repeat: int) -> tuple[float, float]:
+    """运行 ``repeat`` 次，返回最短与中位耗时（秒）。"""
+    timings: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings)
+
+
+def repeat_for(size: int) -> int:
+    # 小数据集多跑几次降低噪声，大数据集只跑一次
+    return max(1, min(7, 100_000 // size))
+
+
+def filter_sort(tasks: list[Task], category: TaskCategory) -> list[Task]:
+    selected = [task for task in tasks if FILTERS[category](task)]
+    if category == "completed":
+        selected.sort(key=sort_completed_tasks, reverse=True)
+    else:
+        selected.sort(key=sort_tasks_by_due_date)
+    return selected
+
+
+@contextmanager
+def working_directory(path: Path) -> Generator[None]:
+    previous = Path.cwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+class Recorder:
+    def __init__(self):
+        self.results: list[dict[str, Any]] = []
+
+    def time(self, name: str, variant: str, size: int, fn: Callable[[], object], repeat: int) -> None:
+        best, median = measure(fn, repeat)
+        self.results.append(
+            {
+                "name": name,
+                "variant": variant,
+                "size": size,
+                "repeat": repeat,
+                "min_s": best,
+                "median_s": median,
+                "per_task_us": best / size * 1e6 if size else 0.0,
+            }
+        )
+        print(f"{name:<12} {variant:<10} {size:>9,} {best * 1e3:>10.2f} ms", file=sys.stderr)
+
+
+def bench_size(
+    recorder: Recorder, size: int, workdir: Path, formats: Sequence[DataFormat], app: bool, seed: int
+) -> None:
+    tasks, history = generate_tasks(size, seed=seed)
+    repeat = repeat_for(size)
+
+    for data_format in formats:
+        storage = JsonStorage(workdir / f"data-{size}.{data_format}", data_format=data_format)
+        recorder.time("save", data_format, size, partial(storage.save, tasks, history), repeat)
+        recorder.time("load", data_format, size, storage.load, repeat)
+
+    for category in CATEGORIES:
+        recorder.time("filter_sort", category, size, partial(filter_sort, tasks, category), repeat)
+    recorder.time("index_build", "all", size, lambda: TaskIndex(tasks), repeat)
+    recorder.time("search_build", "all", size, lambda: SearchIndex(tasks), repeat)
+    search_index = SearchIndex(tasks)
+    for variant, query in SEARCH_QUERIES.items():
+        recorder.time("search", variant, size, partial(search_index.search, query, SEARCH_LIMIT), max(repeat, 7))
+
+    today_ord = BASE_DATE.toordinal()
+    recorder.time("due_info", "cold", size, lambda: [Translator("en").task_info(t, today_ord) for t in tasks], repeat)
+    warm = Translator("en")
+    recorder.time("due_info", "warm", size, lambda: [warm.task_info(t, today_ord) for t in tasks], repeat)
+    recorder.time("analytics", "all", size, partial(compute_analytics, tasks, history, today_ord), repeat)
+
+    if app:
+        bench_app(recorder, size, workdir, tasks, history)
+
+
+# 整页运行固定的配置：不整理历史（否则 cold 测到的是一次性的归档迁移，且会改写数据）、
+# 不定时检查文件，统计标签页由 analytics 单独计时
+APP_SETTINGS = {"history_max_items": 0, "history_max_age_days": 0, "watch_interval_s": 0, "show_analytics": False}
+
+
+def bench_app(recorder: Recorder, size: int, workdir: Path, tasks: list[Task], history: list[HistoryItem]) -> None:
+    """用 AppTest 跑完整脚本：cold 包含加载数据，warm 为之后的一次重跑。数据文件单独写出，与 ``--formats`` 无关。"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    config = workdir / f"app-{size}" / "config"
+    config.mkdir(parents=True)
+    data_file = config / "todo_data.json"
+    JsonStorage(data_file).save(tasks, history)
+    (config / "todo.toml").write_text(tomli_w.dumps({"history_file_path": data_file.as_posix(), **APP_SETTINGS}))
+    with working_directory(config.parent):
+        st.cache_resource.clear()
+        at = AppTest.from_file(str(SCRIPT), default_timeout=600)
+        recorder.time("app_run", "cold", size, at.run, 1)
+        if at.exception:
+            raise RuntimeError(f"脚本运行出错: {at.exception[0].value}")
+        recorder.time("app_run", "warm", size, at.run, repeat_for(size))
+        st.cache_resource.clear()
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SCRIPT.parent, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def run(
+    sizes: Sequence[int], formats: Sequence[DataFormat] = FORMATS, app: bool = True, seed: int = 0
+) -> dict[str, Any]:
+    recorder = Recorder()
+    with tempfile.TemporaryDirectory(prefix="todo-bench-") as tmp:
+        for size in sizes:
+            bench_size(recorder, size, Path(tmp), formats, app, seed)
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "seed": seed,
+        },
+        "results": recorder.results,
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float = 1.1) -> list[str]:
+    """按 (name, variant, size) 对比两次结果的最短耗时，返回变慢超过 ``threshold`` 倍的条目。"""
+    previous = {(r["name"], r["variant"], r["size"]): r["min_s"] for r in baseline["results"]}
+    regressions: list[str] = []
+    for r in current["results"]:
+        before = previous.get((r["name"], r["variant"], r["size"]))
+        if not before:
+            continue
+        ratio = r["min_s"] / before
+        line = f"{r['name']:<12} {r['variant']:<10} {r['size']:>9,} {ratio:>6.2f}x"
+        print(line, file=sys.stderr)
+        if ratio > threshold:
+            regressions.append(line)
+    return regressions
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+from todo.core.display import Translator, get_due_date_info, get_translator, translate
+from todo.core.history import HistoryLog, sort_history_items
+from todo.core.index import (
+    CATEGORIES,
+    DUE_STATUSES,
+    TaskIndex,
+    due_statuses,
+    filter_completed_tasks,
+    filter_daily_tasks,
+    filter_monthly_tasks,
+    filter_weekly_tasks,
+    sort_completed_tasks,
+    sort_tasks_by_due_date,
+)
+from todo.core.recurrence import Recurrence, parse_rule
+from todo.core.search import SearchIndex, tokenize
+from todo.core.store import STORE_SETTINGS, StoreHolder, TaskStore, open_store
+
+__all__ = [
+    "CATEGORIES",
+    "DUE_STATUSES",
+    "HistoryLog",
+    "Recurrence",
+    "STORE_SETTINGS",
+    "SearchIndex",
+    "StoreHolder",
+    "TaskIndex",
+    "TaskStore",
+    "Translator",
+    "due_statuses",
+    "filter_completed_tasks",
+    "filter_daily_tasks",
+    "filter_monthly_tasks",
+    "filter_weekly_tasks",
+    "get_due_date_info",
+    "get_translator",
+    "open_store",
+    "parse_rule",
+    "sort_completed_tasks",
+    "sort_history_items",
+    "sort_tasks_by_due_date",
+    "tokenize",
+    "translate",
+]
@@ -0,0 +1,182 @@
+# pandas 没有完整的类型标注，严格模式下的相关检查在本文件中关闭
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from todo._dataclass import MINUTES_PER_DAY
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from numpy.typing import NDArray
+
+    from todo._dataclass import HistoryItem, Task
+    from todo._typing import TaskType
+
+TASK_TYPES: tuple[TaskType, ...] = ("daily", "weekly", "monthly")
+TYPE_CODES = {task_type: code for code, task_type in enumerate(TASK_TYPES)}
+# 日期序数与 Unix 纪元相差的天数，减去它后 pandas 即可按天解释
+EPOCH_ORD = datetime.date(1970, 1, 1).toordinal()
+NONE = -1
+
+
+class TaskColumns:
+    """任务的列式表示：每个字段一个 NumPy 数组，缺失值为 -1，分类为在 ``TASK_TYPES`` 中的下标。
+
+    时间字段在 ``Task`` 中本来就是整数，只需逐个取出一次，之后的统计都是整列运算。
+    """
+
+    def __init__(self, tasks: Sequence[Task]):
+        n = len(tasks)
+        self.task_type = np.fromiter((TYPE_CODES[t.task_type] for t in tasks), dtype=np.int64, count=n)
+        self.completed = np.fromiter((t.completed for t in tasks), dtype=bool, count=n)
+        self.created_min = np.fromiter((t.created_min for t in tasks), dtype=np.int64, count=n)
+        self.completed_min = np.fromiter(
+            (NONE if t.completed_min is None else t.completed_min for t in tasks), dtype=np.int64, count=n
+        )
+        self.due_ord = np.fromiter((NONE if t.due_ord is None else t.due_ord for t in tasks), dtype=np.int64, count=n)
+
+
+class HistoryColumns:
+    """历史记录的列式表示，只保留统计用到的日期序数与是否为完成、添加操作。
+
+    时间无法解析的记录 ``ts_min`` 为 0，不计入按天的统计。
+    """
+
+    def __init__(self, history: Sequence[HistoryItem]):
+        n = len(history)
+        ts_min = np.fromiter((item.ts_min for item in history), dtype=np.int64, count=n)
+        valid = ts_min > 0
+        self.day = ts_min[valid] // MINUTES_PER_DAY
+        self.completed = np.fromiter((item.action == "Completed_action" for item in history), dtype=bool, count=n)[
+            valid
+        ]
+        self.added = np.fromiter((item.action == "Added" for item in history), dtype=bool, count=n)[valid]
+
+
+class Analytics:
+    """完成量、完成耗时与逾期率的汇总结果。
+
+    各表都已按天、按周或按分类聚合，行数与任务和历史的数量无关，可以直接交给图表；
+    对象可被序列化，界面按仓库的 ``revision`` 缓存它。
+    """
+
+    def __init__(
+        self,
+        daily: pd.DataFrame,
+        weekly: pd.DataFrame,
+        latency: pd.DataFrame,
+        overdue: pd.DataFrame,
+        completed_7d: int,
+        median_latency_days: float,
+        overdue_share: float,
+        task_count: int,
+        event_count: int,
+    ):
+        self.daily = daily
+        self.weekly = weekly
+        self.latency = latency
+        self.overdue = overdue
+        self.completed_7d = completed_7d
+        self.median_latency_days = median_latency_days
+        self.overdue_share = overdue_share
+        self.task_count = task_count
+        self.event_count = event_count
+
+    @property
+    def empty(self) -> bool:
+        return not (self.task_count or self.event_count)
+
+
+def relabel(frame: pd.DataFrame, label: Callable[[str], str]) -> pd.DataFrame:
+    """按 ``label``（一般为翻译器）替换列名与分类索引，日期索引保持不变。"""
+    renamed = frame.rename(columns=label)
+    if isinstance(frame.index, pd.DatetimeIndex):
+        return renamed
+    return renamed.rename(index=label).rename_axis(None)
+
+
+def to_dates(ordinals: NDArray[np.int64]) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(pd.to_datetime(ordinals - EPOCH_ORD, unit="D"))
+
+
+def count_by(ordinals: NDArray[np.int64], masks: dict[str, NDArray[np.bool_]], step: int = 1) -> pd.DataFrame:
+    """按日期序数计数，每 ``step`` 天一行（``ordinals`` 须已对齐到行的起始日）。
+
+    范围内没有记录的行记为 0，图表上不会断开。
+    """
+    if not len(ordinals):
+        return pd.DataFrame({column: np.zeros(0, dtype=np.int64) for column in masks}, index=to_dates(ordinals))
+    first = int(ordinals.min())
+    rows = (ordinals - first) // step
+    length = int(rows.max()) + 1
+    counts = {column: np.bincount(rows[mask], minlength=length) for column, mask in masks.items()}
+    return pd.DataFrame(counts, index=to_dates(first + step * np.arange(length, dtype=np.int64)))
+
+
+def throughput(history: HistoryColumns) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """按天与按周（周一开始）统计完成与添加的操作数。"""
+    masks = {"completed": history.completed, "added": history.added}
+    # 序数 1（公元 1 年 1 月 1 日）是周一
+    monday = history.day - (history.day - 1) % 7
+    return count_by(history.day, masks), count_by(monday, masks, step=7)
+
+
+def latency_days(tasks: TaskColumns) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+    """已完成任务从创建到完成的天数及其分类；没有完成时间或创建时间无法解析（为 0）的任务不计入。"""
+    done = tasks.completed & (tasks.completed_min >= 0) & (tasks.created_min > 0)
+    days = (tasks.completed_min[done] - tasks.created_min[done]).clip(min=0) / MINUTES_PER_DAY
+    return days, tasks.task_type[done]
+
+
+def completion_latency(days: NDArray[np.float64], types: NDArray[np.int64]) -> pd.DataFrame:
+    """各分类完成天数的中位数、90 分位、平均值与任务数。"""
+    columns: dict[str, list[float]] = {"median": [], "p90": [], "mean": []}
+    counts: list[int] = []
+    for code in range(len(TASK_TYPES)):
+        selected = days[types == code]
+        counts.append(len(selected))
+        empty = not len(selected)
+        columns["median"].append(np.nan if empty else float(np.median(selected)))
+        columns["p90"].append(np.nan if empty else float(np.quantile(selected, 0.9)))
+        columns["mean"].append(np.nan if empty else float(selected.mean()))
+    return pd.DataFrame({**columns, "count": counts}, index=pd.Index(TASK_TYPES, name="task_type"))
+
+
+def overdue_rate(tasks: TaskColumns, today_ord: int) -> pd.DataFrame:
+    """设有截止日期的任务中逾期的比例：未完成且已过截止日期，或完成日期晚于截止日期。"""
+    dated = tasks.due_ord >= 0
+    due = tasks.due_ord[dated]
+    completed_day = tasks.completed_min[dated] // MINUTES_PER_DAY
+    late = np.where(tasks.completed[dated], completed_day > due, due < today_ord)
+    types = tasks.task_type[dated]
+    overdue = np.bincount(types[late], minlength=len(TASK_TYPES))
+    total = np.bincount(types, minlength=len(TASK_TYPES))
+    rate = np.divide(overdue, total, out=np.full(len(TASK_TYPES), np.nan), where=total > 0)
+    return pd.DataFrame({"overdue": overdue, "due": total, "rate": rate}, index=pd.Index(TASK_TYPES, name="task_type"))
+
+
+def compute_analytics(tasks: Sequence[Task], history: Sequence[HistoryItem], today_ord: int) -> Analytics:
+    """完成量来自历史中的操作记录（包括之后被删除的任务），完成耗时与逾期率来自当前的任务。"""
+    task_columns, history_columns = TaskColumns(tasks), HistoryColumns(history)
+    daily, weekly = throughput(history_columns)
+    days, types = latency_days(task_columns)
+    recent = history_columns.completed & (history_columns.day > today_ord - 7) & (history_columns.day <= today_ord)
+    overdue = overdue_rate(task_columns, today_ord)
+    due_total = int(overdue["due"].sum())
+    return Analytics(
+        daily,
+        weekly,
+        completion_latency(days, types),
+        overdue,
+        int(recent.sum()),
+        float(np.median(days)) if len(days) else 0.0,
+        int(overdue["overdue"].sum()) / due_total if due_total else 0.0,
+        len(tasks),
+        len(history),
+    )
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import datetime
+from functools import cache
+from typing import TYPE_CHECKING
+
+from todo._dataclass import minutes_to_datetime
+from todo.core.index import SOON_DAYS
+from todo.core.recurrence import parse_rule
+from todo.locales import load_catalog
+
+if TYPE_CHECKING:
+    from todo._dataclass import Task
+
+
+class Translator:
+    """绑定到一种语言的词条查找与日期格式化。
+
+    词条查找只是一次字典查找，与语言数量无关；截止日期与完成时间的格式化结果
+    按日期缓存，同一天内相同的日期只调用一次 ``strftime``。
+    """
+
+    # 完成时间精确到分钟，缓存超过该条数时清空，避免无限增长
+    MAX_CACHED = 65536
+
+    def __init__(self, lang: str):
+        self.lang = lang
+        self.catalog = load_catalog(lang)
+        self._completed: dict[int, str] = {}
+        self._due: dict[int, str] = {}
+        self._today = 0
+
+    def __call__(self, key: str) -> str:
+        return self.catalog.get(key, key)
+
+    def completed_info(self, completed_min: int | None) -> str:
+        if completed_min is None:
+            return f"✓ {self('Completed')}"
+        text = self._completed.get(completed_min)
+        if text is None:
+            if len(self._completed) >= self.MAX_CACHED:
+                self._completed.clear()
+            completed_str = minutes_to_datetime(completed_min).strftime(self("datetime_format"))
+            text = self._completed[completed_min] = f"✓ {self('Completed')} {completed_str}"
+        return text
+
+    def due_info(self, due_ord: int, today_ord: int) -> str:
+        if today_ord != self._today:
+            # 相对天数随日期变化，换日后整体失效
+            self._due.clear()
+            self._today = today_ord
+        text = self._due.get(due_ord)
+        if text is None:
+            days_diff = due_ord - today_ord
+            if days_diff < 0:
+                text = f"🔥 {self('Overdue')} {-days_diff} {self('days')}"
+            elif days_diff == 0:
+                text = f"⏰ {self('Due today')}"
+            elif days_diff <= SOON_DAYS:
+                text = f"🗓️ {self('Due in')} {days_diff} {self('days')}"
+            else:
+                due_date_str = datetime.date.fromordinal(due_ord).strftime(self("date_format"))
+                text = f"🗓️ {self('Due')} {due_date_str}"
+            self._due[due_ord] = text
+        return text
+
+    def recurrence_info(self, text: str) -> str:
+        rule = parse_rule(text)
+        if rule is None:
+            return ""
+        if rule.interval == 1:
+            return f"🔁 {self(f'repeat_{rule.freq}')}"
+        return f"🔁 {self(f'repeat_every_{rule.freq}').format(n=rule.interval)}"
+
+    def task_info(self, task: Task, today_ord: int) -> str:
+        """返回任务的截止日期信息和状态"""
+        if task.completed:
+            return self.completed_info(task.completed_min)
+        if task.due_ord is not None:
+            info = self.due_info(task.due_ord, today_ord)
+        elif task.due_date:
+            info = f"🗓️ {task.due_date} (Invalid)"
+        else:
+            info = ""
+        if task.recurrence:
+            info = " · ".join(filter(None, (info, self.recurrence_info(task.recurrence))))
+        return info
+
+
+@cache
+def get_translator(lang: str) -> Translator:
+    """每种语言只创建一个翻译器，各会话共用。"""
+    return Translator(lang)
+
+
+def translate(key: str, lang: str) -> str:
+    return get_translator(lang)(key)
+
+
+def get_due_date_info(task: Task, lang: str, today: datetime.date) -> str:
+    """返回任务的截止日期信息和状态"""
+    return get_translator(lang).task_info(task, today.toordinal())
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING
+
+from todo._dataclass import MINUTES_PER_DAY, HistoryItem
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from todo._typing import EventPayload
+
+
+def sort_history_items(item: HistoryItem) -> int:
+    return item.ts_min
+
+
+class HistoryLog:
+    """最新在前的操作记录。
+
+    基于 deque，新记录从头部 O(1) 插入，过期记录从尾部 O(1) 移出。
+    ``max_items``/``max_age_days`` 为 0 时表示不限制。
+    """
+
+    def __init__(self, items: Iterable[HistoryItem] = (), max_items: int = 0, max_age_days: int = 0):
+        self.items: deque[HistoryItem] = deque(items)
+        self.max_items = max_items
+        self.max_age_days = max_age_days
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self) -> Iterator[HistoryItem]:
+        return iter(self.items)
+
+    def __getitem__(self, index: int) -> HistoryItem:
+        return self.items[index]
+
+    def __reversed__(self) -> Iterator[HistoryItem]:
+        return reversed(self.items)
+
+    def push(self, item: HistoryItem) -> None:
+        self.items.appendleft(item)
+
+    def recent(self, limit: int) -> list[HistoryItem]:
+        return list(islice(self.items, limit))
+
+    def cutoff(self, now_min: int) -> int:
+        """早于该分钟序数的记录已过期；不限时长时返回 0。"""
+        return now_min - self.max_age_days * MINUTES_PER_DAY if self.max_age_days else 0
+
+    def expired(self, now_min: int) -> list[HistoryItem]:
+        """超出保留策略的最旧记录，按最新在前的顺序返回。只查找不移出，归档成功后再调用 ``drop_oldest``。"""
+        cutoff = self.cutoff(now_min)
+        count = max(len(self.items) - self.max_items, 0) if self.max_items else 0
+        for item in islice(reversed(self.items), count, None):
+            if item.ts_min >= cutoff:
+                break
+            count += 1
+        expired = list(islice(reversed(self.items), count))
+        expired.reverse()
+        return expired
+
+    def drop_oldest(self, count: int) -> None:
+        for _ in range(count):
+            self.items.pop()
+
+
+class UndoStack:
+    """由事件日志推出的撤销/重做栈，栈中保存的是原始事件。
+
+    事件按时间先后传入 ``push``：普通事件进入撤销栈并清空重做栈；``Undone`` 把所引用的事件从撤销栈顶移到重做栈，
+    ``Redone`` 反之。栈完全由日志决定，因此重启后、其他进程写入后都能从日志重新得到。
+    没有载荷的早期记录无法撤销，遇到时清空两个栈，以免越过它去撤销更早的操作。
+    """
+
+    def __init__(self, events: Iterable[HistoryItem] = (), depth: int = 50):
+        self.undo: deque[HistoryItem] = deque(maxlen=depth)
+        self.redo: list[HistoryItem] = []
+        for item in events:
+            self.push(item)
+
+    def push(self, item: HistoryItem) -> None:
+        if item.action in ("Undone", "Redone"):
+            ref = item.payload.get("ref") if item.payload is not None else None
+            source, target = (self.undo, self.redo) if item.action == "Undone" else (self.redo, self.undo)
+            if source and source[-1].id == ref:
+                target.append(source.pop())
+            return
+        if item.payload is None:
+            self.undo.clear()
+        elif self.undo.maxlen:
+            self.undo.append(item)
+        self.redo.clear()
+
+
+def undo_event(item: HistoryItem) -> HistoryItem:
+    """撤销 ``item`` 的事件：前后状态互换。"""
+    payload = event_payload(item)
+    return HistoryItem(
+        "Undone",
+        item.task_description,
+        item.task_type,
+        item.task_id,
+        {"before": payload["after"], "after": payload["before"], "ref": item.id},
+    )
+
+
+def redo_event(item: HistoryItem) -> HistoryItem:
+    """重做 ``item`` 的事件：再次应用原来的前后状态。"""
+    payload = event_payload(item)
+    return HistoryItem(
+        "Redone",
+        item.task_description,
+        item.task_type,
+        item.task_id,
+        {"before": payload["before"], "after": payload["after"], "ref": item.id},
+    )
+
+
+def event_payload(item: HistoryItem) -> EventPayload:
+    if item.payload is None:
+        raise ValueError(f"操作记录 {item.id} 没有事件载荷，无法撤销或重做")
+    return item.payload
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from todo._dataclass import Task
+from todo._dictionary import LANGUAGES
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from concurrent.futures import Future
+    from typing import BinaryIO
+
+    from todo._typing import TaskType
+    from todo.core.store import TaskStore
+
+# (行号, 原始字段)；行号从 1 开始，CSV 为文件中的行号，JSON 为记录序号
+Row = tuple[int, dict[str, Any]]
+# 校验通过为 (行号, 描述, 类型, 颜色, 截止日期序数)，失败为 (行号, 错误信息)
+NormalizedRow = tuple[int, str, str, str, int | None] | tuple[int, str]
+
+FIELD_ALIASES: dict[str, tuple[str, ...]] = {
+    "task": ("task", "title", "name", "content", "description", "任务", "描述"),
+    "task_type": ("task_type", "type", "category", "分类", "类型"),
+    "color": ("color", "colour", "颜色"),
+    "due_date": ("due_date", "due", "deadline", "截止日期"),
+}
+TASK_TYPES: tuple[TaskType, ...] = ("daily", "weekly", "monthly")
+# 接受类型名本身以及各语言界面上显示的名称
+TASK_TYPE_ALIASES: dict[str, str] = {
+    **{task_type: task_type for task_type in TASK_TYPES},
+    **{words[task_type].casefold(): task_type for words in LANGUAGES.values() for task_type in TASK_TYPES},
+}
+COLOR_PATTERN = re.compile(r"#?([0-9a-fA-F]{6}|[0-9a-fA-F]{3})")
+DATE_PATTERN = re.compile(r"(\d{4})[-/.年](\d{1,2})[-/.月](\d{1,2})日?|(\d{4})(\d{2})(\d{2})")
+DEFAULT_COLOR = "#007AFF"
+
+
+# ========================
+# Reading
+# ========================
+def iter_rows(f: BinaryIO, name: str) -> Iterator[Row]:
+    """按扩展名逐条读取记录。CSV 与 JSON Lines 流式读取；JSON 数组需要整体解析。"""
+    suffix = Path(name).suffix.lower()
+    if suffix == ".csv":
+        text = io.TextIOWrapper(f, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, dict(record)
+    elif suffix in (".jsonl", ".ndjson"):
+        for line_num, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            record: Any = json.loads(line)
+            # 本应用 JSON Lines 数据文件中的文件头与历史记录不是任务
+            if isinstance(record, dict) and cast("dict[str, Any]", record).get("kind", "task") != "task":
+                continue
+            yield line_num, record
+    elif suffix == ".json":
+        data: Any = json.load(f)
+        records: Any = cast("dict[str, Any]", data).get("tasks") if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ValueError("JSON 文件的顶层应为任务数组，或包含 tasks 数组的对象")
+        yield from enumerate(cast("list[Any]", records), 1)
+    else:
+        raise ValueError(f"不支持的导入格式: {name}（支持 .csv/.json/.jsonl）")
+
+
+# ========================
+# Validation
+# ========================
+def normalize_row(line_num: int, record: Any) -> NormalizedRow:
+    """校验并规范化一条记录，只使用可序列化的参数和返回值，以便在子进程中运行。"""
+    if not isinstance(record, dict):
+        return line_num, "记录不是对象"
+    fields = {str(key).strip().casefold(): value for key, value in cast("dict[Any, Any]", record).items()}
+
+    def get(field: str) -> str:
+        for alias in FIELD_ALIASES[field]:
+            value = fields.get(alias)
+            if value is not None and str(value).strip():
+                return str(value).strip()
+        return ""
+
+    task = get("task")
+    if not task:
+        return line_num, "缺少任务描述"
+
+    raw_type = get("task_type")
+    task_type = TASK_TYPE_ALIASES.get(raw_type.casefold(), "") if raw_type else "daily"
+    if not task_type:
+        return line_num, f"无效的任务类型: {raw_type}"
+
+    raw_color = get("color")
+    color = normalize_color(raw_color) if raw_color else DEFAULT_COLOR
+    if not color:
+        return line_num, f"无效的颜色: {raw_color}"
+
+    raw_due = get("due_date")
+    due_ord = normalize_due_date(raw_due) if raw_due else None
+    if due_ord == -1:
+        return line_num, f"无效的截止日期: {raw_due}"
+    return line_num, task, task_type, color, due_ord
+
+
+@lru_cache(maxsize=4096)
+def normalize_color(value: str) -> str:
+    """规范为 ``#RRGGBB``，无效时返回空字符串。导出文件中的颜色与日期重复率很高，结果按原始字符串缓存。"""
+    match = COLOR_PATTERN.fullmatch(value)
+    if match is None:
+        return ""
+    hex_digits = match.group(1)
+    if len(hex_digits) == 3:
+        hex_digits = "".join(c * 2 for c in hex_digits)
+    return "#" + hex_digits.upper()
+
+
+@lru_cache(maxsize=4096)
+def normalize_due_date(value: str) -> int:
+    """返回日期序数，无效时返回 -1。"""
+    match = DATE_PATTERN.fullmatch(value)
+    if match is None:
+        return -1
+    year, month, day = (int(g) for g in match.groups() if g is not None)
+    try:
+        return datetime.date(year, month, day).toordinal()
+    except ValueError:
+        return -1
+
+
+def normalize_rows(rows: list[Row]) -> list[NormalizedRow]:
+    return [normalize_row(line_num, record) for line_num, record in rows]
+
+
+def iter_normalized(
+    rows: Iterable[Row], workers: int, chunk_size: int, parallel_min_rows: int
+) -> Iterator[NormalizedRow]:
+    """分块校验记录并按原顺序产出结果。
+
+    读到的记录超过 ``parallel_min_rows`` 条时才启动进程池，小文件不必承担子进程的启动开销；
+    同时提交的分块数有上限，读取、校验与写入可以流水进行而不会把整个文件堆在内存里。
+    """
+    rows = iter(rows)
+    chunks = iter(lambda: list(islice(rows, chunk_size)), [])
+    buffered: list[list[Row]] = []
+    for chunk in chunks:
+        buffered.append(chunk)
+        if workers > 1 and len(buffered) * chunk_size >= parallel_min_rows:
+            break
+    else:
+        for chunk in buffered:
+            yield from normalize_rows(chunk)
+        return
+
+    # Streamlit 在多线程中运行，使用 spawn 避免 fork 复制锁状态
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        pending: deque[Future[list[NormalizedRow]]] = deque()
+        for chunk in chain(buffered, chunks):
+            pending.append(pool.submit(normalize_rows, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def dedupe_key(task: str, task_type: str, due_ord: int | None) -> tuple[str, str, int | None]:
+    """描述忽略大小写与多余空白后，类型和截止日期都相同的任务视为重复。"""
+    return " ".join(task.casefold().split()), task_type, due_ord
+
+
+# ========================
+# Import
+# ========================
+class ImportReport:
+    """一次导入的统计结果。``errors`` 为 (行号, 错误信息) 列表。"""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.rows = 0
+        self.imported = 0
+        self.duplicates = 0
+        self.errors: list[tuple[int, str]] = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.source}: 共 {self.rows} 行，导入 {self.imported}，重复 {self.duplicates}，"
+            f"错误 {len(self.errors)}，耗时 {self.seconds:.2f}s（{self.rows_per_second:,.0f} 行/秒）"
+        )
+
+
+def import_tasks(
+    store: TaskStore,
+    f: BinaryIO,
+    name: str,
+    workers: int = 0,
+    chunk_size: int = 2000,
+    parallel_min_rows: int = 20000,
+    dry_run: bool = False,
+) -> ImportReport:
+    """从 CSV/JSON 导入任务，全部任务通过 ``TaskStore.add_many`` 一次写入。
+
+    与已有任务或文件中前面的记录重复的行会被跳过；``workers`` 为 0 时使用 CPU 核数。
+    """
+    report = ImportReport(Path(name).name)
+    start = time.perf_counter()
+    seen = {dedupe_key(task.task, task.task_type, task.due_ord) for task in store.all_tasks()}
+    tasks: list[Task] = []
+    normalized = iter_normalized(iter_rows(f, name), workers or os.cpu_count() or 1, chunk_size, parallel_min_rows)
+    try:
+        for result in normalized:
+            report.rows += 1
+            if len(result) == 2:
+                report.errors.append(result)
+                continue
+            _, description, task_type, color, due_ord = result
+            key = dedupe_key(description, task_type, due_ord)
+            if key in seen:
+                report.duplicates += 1
+                continue
+            seen.add(key)
+            task = Task(description, cast("TaskType", task_type), color)
+            task.due_ord = due_ord
+            tasks.append(task)
+    except (ValueError, UnicodeDecodeError, csv.Error) as e:
+        # 文件本身无法继续解析时保留已读部分的统计，不写入任何任务
+        report.errors.append((report.rows + 1, f"无法解析文件: {e}"))
+        tasks.clear()
+    if tasks and not dry_run:
+        store.add_many(tasks, report.source)
+    report.imported = len(tasks)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    from todo._dataclass import ToDoSettings
+    from todo.core.store import open_store
+    from todo.utils.config import load_settings_file
+
+    parser = argparse.ArgumentParser(prog="python -m todo.core.importer", description="从 CSV/JSON 批量导入任务")
+    parser.add_argument("files", type=Path, nargs="+")
+    parser.add_argument("--workers", type=int, default=None, help="校验进程数，默认读取配置")
+    parser.add_argument("--dry-run", action="store_true", help="只校验，不写入")
+    args: Any = parser.parse_args(argv)
+
+    settings = load_settings_file("todo.toml", ToDoSettings)
+    store = open_store(settings)
+    try:
+        for path in args.files:
+            with path.open("rb") as f:
+                report = import_tasks(
+                    store,
+                    f,
+                    path.name,
+                    workers=settings.import_workers if args.workers is None else args.workers,
+                    parallel_min_rows=settings.import_parallel_min_rows,
+                    dry_run=args.dry_run,
+                )
+            print(report.summary())
+            for line_num, error in report.errors[:20]:
+                print(f"  第 {line_num} 行: {error}")
+            if len(report.errors) > 20:
+                print(f"  ……另有 {len(report.errors) - 20} 条错误")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
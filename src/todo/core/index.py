@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from itertools import repeat
+from typing import TYPE_CHECKING
+
+from todo._dataclass import MAX_ORDINAL
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+
+    from todo._dataclass import Task
+    from todo._typing import DueStatus, TaskCategory
+
+CATEGORIES: tuple[TaskCategory, ...] = ("daily", "weekly", "monthly", "completed")
+DUE_STATUSES: tuple[DueStatus, ...] = ("overdue", "today", "soon", "later")
+# 截止日期在几天之内算作“即将到期”
+SOON_DAYS = 3
+# 各截止状态的任务数：(逾期, 今天, SOON_DAYS 天内, 更晚)，不含未设置截止日期的任务
+DueCounts = tuple[int, int, int, int]
+
+
+# ========================
+# Filter Functions
+# ========================
+def filter_daily_tasks(task: Task) -> bool:
+    return task.task_type == "daily" and not task.completed
+
+
+def filter_weekly_tasks(task: Task) -> bool:
+    return task.task_type == "weekly" and not task.completed
+
+
+def filter_monthly_tasks(task: Task) -> bool:
+    return task.task_type == "monthly" and not task.completed
+
+
+def filter_completed_tasks(task: Task) -> bool:
+    return task.completed
+
+
+# ========================
+# Sorting Functions
+# ========================
+def sort_tasks_by_due_date(task: Task) -> tuple[int, int]:
+    """Sort key function for tasks - by due date (earliest first) then creation date (oldest first)"""
+    # Tasks without a (valid) due date go last
+    return (MAX_ORDINAL if task.due_ord is None else task.due_ord, task.created_min)
+
+
+def sort_completed_tasks(task: Task) -> tuple[int, int]:
+    return (task.completed_min or 0, task.created_min)
+
+
+def completed_bucket_key(task: Task) -> tuple[int, int]:
+    """已完成桶按完成时间倒序排列，取负后可以与其他桶一样升序插入。"""
+    completed_min, created_min = sort_completed_tasks(task)
+    return (-completed_min, -created_min)
+
+
+def category_of(task: Task) -> str:
+    return "completed" if task.completed else task.task_type
+
+
+def due_thresholds(today_ord: int) -> tuple[int, int, int, int]:
+    """各截止状态的日期下界之后的第一天：早于第 i 个值的任务属于前 i 个状态。"""
+    return today_ord, today_ord + 1, today_ord + SOON_DAYS + 1, MAX_ORDINAL
+
+
+def due_statuses(counts: DueCounts, start: int, stop: int) -> list[DueStatus | None]:
+    """按截止日期排好的列表中第 ``start`` 到 ``stop`` 个任务的截止状态，只由各状态的数量推出。"""
+    statuses: list[DueStatus | None] = []
+    bound = 0
+    for i, count in enumerate(counts):
+        lo, bound = bound, bound + count
+        statuses.extend(repeat(DUE_STATUSES[i], max(min(bound, stop) - max(lo, start), 0)))
+    statuses.extend([None] * (stop - start - len(statuses)))
+    return statuses
+
+
+class TaskIndex:
+    """任务的 id 查找表与按标签页分组的有序桶。
+
+    每个桶都按标签页的显示顺序排好，渲染时直接切片即可；
+    增删任务时用二分查找定位，桶内无需重新排序。
+    任务的排序字段（完成状态、截止日期等）只能在 ``remove`` 与 ``add`` 之间修改。
+
+    未完成的桶本身按截止日期排序，``due_counts`` 用二分查找定位逾期、今天、即将到期与更晚之间的分界，
+    结果按天缓存：换日时只重新定位这几个分界，增删任务时只让所在桶的缓存失效。
+    """
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self.by_id: dict[str, Task] = {}
+        self.buckets: dict[str, list[Task]] = {category: [] for category in CATEGORIES}
+        for task in tasks:
+            self.by_id[task.id] = task
+            self.buckets.setdefault(category_of(task), []).append(task)
+        for category, bucket in self.buckets.items():
+            bucket.sort(key=self._key_for(category))
+        self._due_day = 0
+        self._due_counts: dict[str, DueCounts] = {}
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> Iterator[Task]:
+        return iter(self.by_id.values())
+
+    def __contains__(self, task_id: object) -> bool:
+        return task_id in self.by_id
+
+    def get(self, task_id: str) -> Task | None:
+        return self.by_id.get(task_id)
+
+    def bucket(self, category: str) -> list[Task]:
+        return self.buckets.get(category, [])
+
+    def add(self, task: Task) -> None:
+        if task.id in self.by_id:
+            self.remove(self.by_id[task.id])
+        self.by_id[task.id] = task
+        category = category_of(task)
+        insort(self.buckets.setdefault(category, []), task, key=self._key_for(category))
+        self._due_counts.pop(category, None)
+
+    def remove(self, task: Task) -> None:
+        del self.by_id[task.id]
+        category = category_of(task)
+        self._due_counts.pop(category, None)
+        bucket = self.buckets[category]
+        key = self._key_for(category)
+        task_key = key(task)
+        lo, hi = bisect_left(bucket, task_key, key=key), bisect_right(bucket, task_key, key=key)
+        for i in range(lo, hi):
+            if bucket[i] is task:
+                del bucket[i]
+                return
+        bucket.remove(task)  # 排序字段在索引外被改过，退回线性查找
+
+    def discard(self, task: Task) -> bool:
+        """任务在索引中时移除并返回 True。"""
+        if self.by_id.get(task.id) is not task:
+            return False
+        self.remove(task)
+        return True
+
+    def due_counts(self, category: str, today_ord: int) -> DueCounts:
+        if today_ord != self._due_day:
+            self._due_counts.clear()
+            self._due_day = today_ord
+        counts = self._due_counts.get(category)
+        if counts is None:
+            bucket = [] if category == "completed" else self.bucket(category)
+            overdue, today, soon, later = (
+                bisect_left(bucket, (day,), key=sort_tasks_by_due_date) for day in due_thresholds(today_ord)
+            )
+            counts = self._due_counts[category] = (overdue, today - overdue, soon - today, later - soon)
+        return counts
+
+    @staticmethod
+    def _key_for(category: str) -> Callable[[Task], tuple[int, int]]:
+        return completed_bucket_key if category == "completed" else sort_tasks_by_due_date
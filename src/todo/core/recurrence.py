@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import calendar
+import datetime
+from functools import lru_cache
+from typing import Literal, cast
+
+Frequency = Literal["DAILY", "WEEKLY", "MONTHLY"]
+FREQUENCIES: tuple[Frequency, ...] = ("DAILY", "WEEKLY", "MONTHLY")
+STEP_DAYS = {"DAILY": 1, "WEEKLY": 7}
+
+
+class Recurrence:
+    """任务的重复规则，文本形式为 iCalendar RRULE 的子集，如 ``FREQ=WEEKLY;INTERVAL=2``。
+
+    每次出现的日期都在以当前截止日期为起点的等距序列上：按天、按周时步长固定，
+    按月时以月份序号为步长，日期取 ``month_day``（超过当月天数时取月末），不会因短月份而漂移。
+    下一次与错过的次数都直接算出，不逐日循环。
+    """
+
+    __slots__ = ("freq", "interval", "month_day")
+
+    def __init__(self, freq: Frequency, interval: int = 1, month_day: int | None = None):
+        if freq not in FREQUENCIES:
+            raise ValueError(f"不支持的重复频率: {freq}")
+        if interval < 1:
+            raise ValueError(f"重复间隔必须为正整数: {interval}")
+        if month_day is not None and not 1 <= month_day <= 31:
+            raise ValueError(f"无效的日期: {month_day}")
+        self.freq: Frequency = freq
+        self.interval = interval
+        self.month_day = month_day
+
+    @property
+    def text(self) -> str:
+        parts = [f"FREQ={self.freq}", f"INTERVAL={self.interval}"]
+        if self.freq == "MONTHLY" and self.month_day is not None:
+            parts.append(f"BYMONTHDAY={self.month_day}")
+        return ";".join(parts)
+
+    def next_after(self, due_ord: int, after_ord: int) -> int:
+        """序列中第一个晚于 ``after_ord`` 且晚于 ``due_ord`` 的日期。"""
+        after_ord = max(after_ord, due_ord)
+        if self.freq != "MONTHLY":
+            step = STEP_DAYS[self.freq] * self.interval
+            return due_ord + ((after_ord - due_ord) // step + 1) * step
+        start, day = self._month_anchor(due_ord)
+        k = (month_index(after_ord) - start) // self.interval
+        occurrence = month_day_ord(start + k * self.interval, day)
+        if occurrence <= after_ord:
+            occurrence = month_day_ord(start + (k + 1) * self.interval, day)
+        return occurrence
+
+    def catch_up(self, due_ord: int, today_ord: int) -> tuple[int, int]:
+        """返回不晚于今天的最近一次日期与其间错过的次数；还没到期时原样返回。"""
+        if today_ord <= due_ord:
+            return due_ord, 0
+        if self.freq != "MONTHLY":
+            step = STEP_DAYS[self.freq] * self.interval
+            missed = (today_ord - due_ord) // step
+            return due_ord + missed * step, missed
+        start, day = self._month_anchor(due_ord)
+        missed = (month_index(today_ord) - start) // self.interval
+        occurrence = month_day_ord(start + missed * self.interval, day)
+        if occurrence > today_ord:
+            missed -= 1
+            occurrence = month_day_ord(start + missed * self.interval, day)
+        return occurrence, missed
+
+    def _month_anchor(self, due_ord: int) -> tuple[int, int]:
+        return month_index(due_ord), self.month_day or datetime.date.fromordinal(due_ord).day
+
+
+def month_index(ordinal: int) -> int:
+    date = datetime.date.fromordinal(ordinal)
+    return date.year * 12 + date.month - 1
+
+
+def month_day_ord(index: int, day: int) -> int:
+    year, month = divmod(index, 12)
+    return datetime.date(year, month + 1, min(day, calendar.monthrange(year, month + 1)[1])).toordinal()
+
+
+@lru_cache(maxsize=256)
+def parse_rule(text: str) -> Recurrence | None:
+    """解析规则文本，无法识别时返回 ``None``（任务按不重复处理）。"""
+    try:
+        fields = dict(part.split("=", 1) for part in text.upper().split(";") if part)
+        month_day = fields.get("BYMONTHDAY")
+        return Recurrence(
+            cast("Frequency", fields["FREQ"]), int(fields.get("INTERVAL", 1)), int(month_day) if month_day else None
+        )
+    except (KeyError, ValueError):
+        return None
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+from bisect import bisect_left, insort
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from todo._dataclass import Task
+
+# 中日韩文字没有空格分词，按字切分；其余文字按单词切分
+CJK_CHARS = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff"
+TOKEN_PATTERN = re.compile(f"([{CJK_CHARS}]+)|([^\\W{CJK_CHARS}]+)")
+# 排序键为整数：创建时间（分钟）左移后加上加入顺序，比较与排序都很快
+SEQ_BITS = 32
+
+
+def tokenize(text: str) -> set[str]:
+    """索引用的词元：拉丁文字取小写单词，中日韩文字取单字与相邻两字。"""
+    tokens: set[str] = set()
+    for cjk, word in TOKEN_PATTERN.findall(text.casefold()):
+        if word:
+            tokens.add(word)
+        else:
+            tokens.update(cjk)
+            tokens.update(cjk[i : i + 2] for i in range(len(cjk) - 1))
+    return tokens
+
+
+def query_tokens(query: str) -> tuple[set[str], list[str]]:
+    """查询用的词元与需要逐条核对的中日韩片段。
+
+    两字以上的片段只取相邻两字，比单字更有区分度；
+    但两字词元全部命中不代表片段连续出现，因此命中后还要核对原文。
+    """
+    tokens: set[str] = set()
+    phrases: list[str] = []
+    for cjk, word in TOKEN_PATTERN.findall(query.casefold()):
+        if word:
+            tokens.add(word)
+        elif len(cjk) == 1:
+            tokens.add(cjk)
+        else:
+            tokens.update(cjk[i : i + 2] for i in range(len(cjk) - 1))
+            if len(cjk) > 2:
+                phrases.append(cjk)
+    return tokens, phrases
+
+
+class SearchIndex:
+    """任务描述的倒排索引，增删任务时增量维护。
+
+    多个词之间为“且”的关系，结果按创建时间倒序（同一分钟内后加入的在前）。
+    每个词元同时保存任务 id 的集合与按创建时间排好序的列表：先从最短的集合开始求交集（在 C 中完成），
+    命中少时直接排序；命中多时沿最短的有序列表从最新往前取，凑够 ``limit`` 条即停止。
+    开销主要是交集，与最短倒排列表的长度成正比：10 万个任务、每个常用词约 1 万个任务时约 1 毫秒。
+    """
+
+    # 命中超过该数量且有 limit 时改为沿有序列表扫描，不再整体排序
+    SCAN_THRESHOLD = 512
+
+    def __init__(self, tasks: Iterable[Task] = ()):
+        self.postings: dict[str, set[str]] = {}
+        # 词元 -> 按排序键升序排列的列表
+        self.ordered: dict[str, list[int]] = {}
+        self.keys: dict[str, int] = {}
+        self.by_key: dict[int, Task] = {}
+        self._seq = 0
+        # 按创建时间（相同时按原顺序）依次加入，键单调递增，直接追加即保持有序
+        for task in sorted(tasks, key=created_at):
+            self._add(task, bulk=True)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def add(self, task: Task) -> None:
+        if task.id in self.keys:
+            self.remove(task)
+        self._add(task, bulk=False)
+
+    def _add(self, task: Task, bulk: bool) -> None:
+        key = (task.created_min << SEQ_BITS) + self._seq
+        self._seq += 1
+        self.keys[task.id] = key
+        self.by_key[key] = task
+        for token in tokenize(task.task):
+            self.postings.setdefault(token, set()).add(task.id)
+            ordered = self.ordered.setdefault(token, [])
+            if bulk:
+                ordered.append(key)
+            else:
+                insort(ordered, key)
+
+    def remove(self, task: Task) -> None:
+        key = self.keys.pop(task.id, None)
+        if key is not None:
+            task = self.by_key.pop(key)
+        for token in tokenize(task.task):
+            posting = self.postings.get(token)
+            if posting is None:
+                continue
+            posting.discard(task.id)
+            if not posting:
+                del self.postings[token]
+                del self.ordered[token]
+            elif key is not None:
+                ordered = self.ordered[token]
+                del ordered[bisect_left(ordered, key)]
+
+    def search(self, query: str, limit: int | None = None) -> list[Task]:
+        tokens, phrases = query_tokens(query)
+        if not tokens:
+            return []
+        ranked = sorted(tokens, key=lambda token: len(self.postings.get(token, ())))
+        postings = [self.postings.get(token, set()) for token in ranked]
+        ids = postings[0].intersection(*postings[1:]) if len(postings) > 1 else postings[0]
+        if limit is not None and len(ids) > self.SCAN_THRESHOLD:
+            return self._scan(self.ordered[ranked[0]], ids, phrases, limit)
+        keys = sorted([self.keys[task_id] for task_id in ids], reverse=True)
+        matches = [self.by_key[key] for key in keys]
+        if phrases:
+            matches = [task for task in matches if matches_phrases(task, phrases)]
+        return matches[:limit]
+
+    def _scan(self, ordered: list[int], ids: set[str], phrases: list[str], limit: int) -> list[Task]:
+        # 命中的任务在最短列表中至少占 SCAN_THRESHOLD / len(ordered)，很快就能凑够一页
+        matches: list[Task] = []
+        for key in reversed(ordered):
+            task = self.by_key[key]
+            if task.id in ids:
+                if not phrases or matches_phrases(task, phrases):
+                    matches.append(task)
+                    if len(matches) == limit:
+                        break
+        return matches
+
+
+def created_at(task: Task) -> int:
+    return task.created_min
+
+
+def matches_phrases(task: Task, phrases: list[str]) -> bool:
+    text = task.task.casefold()
+    return all(phrase in text for phrase in phrases)
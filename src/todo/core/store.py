@@ -0,0 +1,509 @@
+from __future__ import annotations
+
+import datetime
+import threading
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from todo._dataclass import HistoryItem, Task, format_minutes, now_minutes
+from todo.core.history import HistoryLog, UndoStack, event_payload, redo_event, sort_history_items, undo_event
+from todo.core.index import TaskIndex, due_thresholds
+from todo.core.recurrence import parse_rule
+from todo.core.search import SearchIndex
+from todo.storage import ChangeSet, QueryableStorage, event_changes, open_storage
+from todo.storage.archive import append_history_archive
+from todo.utils.metrics import span
+
+if TYPE_CHECKING:
+    from todo._dataclass import ToDoSettings
+    from todo._typing import ActionType, EventPayload, TaskCategory, TaskDict
+    from todo.core.index import DueCounts
+    from todo.storage import Storage
+
+
+class TaskStore:
+    """进程内共享的任务仓库。
+
+    所有浏览器会话共用同一份任务与历史，读写都在 ``lock`` 内完成，
+    会话本身只保存语言等界面状态，不再各自持有一份完整副本。
+    任务保存在 ``TaskIndex`` 中，各标签页的列表随修改增量维护。
+    任务描述的倒排索引在加载后由后台线程建立，不占用 ``lock``；建立期间的增删先记下，建好后补上，
+    之后随增删增量维护。索引建好之前的搜索只等待索引，不阻塞其他会话。
+    ``revision`` 在每次修改后递增，可用于判断数据是否变化；
+    ``refresh`` 检查其他进程对数据文件的修改，只把变化的记录应用到内存中。
+
+    ``due_counts`` 给出各标签页逾期、今天、即将到期与更晚到期的任务数，每天只统计一次，之后随修改增量维护。
+
+    重复任务只保存当前未完成的一次：完成时才按规则生成下一次，``catch_up`` 每天一次把错过的重复任务
+    直接移到最近一次的日期。
+    ``query_limit`` 限制可查询后端每次分页查询读取的行数，标签页的任务总数不受它限制。
+
+    历史记录按 ``history_max_items``/``history_max_age_days`` 保留，
+    过期记录定期归档到 ``archive_path`` 并从数据文件中移除；归档失败时保留这些记录，错误记在 ``archive_error`` 中。
+
+    每条历史记录都带有受影响任务的前后状态，是一个可逆的事件：``undo``/``redo`` 追加一条前后状态
+    互换或重放的新事件，而不改写日志，撤销栈始终可以从日志重新推出（最多 ``undo_depth`` 步）。
+    """
+
+    # 每隔多少次修改检查一次历史保留策略
+    COMPACT_EVERY = 256
+
+    def __init__(
+        self,
+        storage: Storage,
+        query_limit: int = 500,
+        history_max_items: int = 0,
+        history_max_age_days: int = 0,
+        archive_path: Path | None = None,
+        undo_depth: int = 50,
+    ):
+        self.storage = storage
+        self.query_limit = query_limit
+        self.archive_path = archive_path
+        self.archive_error: OSError | None = None
+        self.lock = threading.RLock()
+        self.revision = 0
+        self._search_index: SearchIndex | None = None
+        self._search_ready = threading.Event()
+        # 索引建立期间的增删：(是否为加入, 任务)；不在建立时为 None
+        self._search_log: list[tuple[bool, Task]] | None = None
+        self._search_generation = 0
+        self.caught_up_ord = 0
+        # 可查询后端的截止状态计数：(日期序数, revision) 不变时直接复用
+        self._due_key = (0, -1)
+        self._due_cache: dict[str, DueCounts] = {}
+        if isinstance(storage, QueryableStorage):
+            # 可查询的后端按需分页读取，内存中不保留完整数据
+            self.index = TaskIndex()
+            history: list[HistoryItem] = []
+        else:
+            with span("store.load"):
+                tasks, history = storage.load()
+            self.index = TaskIndex(tasks)
+            history.sort(key=sort_history_items, reverse=True)
+        self.history = HistoryLog(history, max_items=history_max_items, max_age_days=history_max_age_days)
+        self.undo_depth = undo_depth
+        self.undo_stack = self._load_undo_stack()
+        if not isinstance(storage, QueryableStorage):
+            self._start_search_build()
+        self.compact_history()
+
+    @property
+    def tasks(self) -> list[Task]:
+        with self.lock:
+            return list(self.index)
+
+    # ========================
+    # Queries
+    # ========================
+    def tasks_in(self, category: TaskCategory, start: int = 0, stop: int | None = None) -> list[Task]:
+        """返回某个标签页中按显示顺序排列的任务切片。"""
+        if isinstance(self.storage, QueryableStorage):
+            limit = self.query_limit if stop is None else min(stop - start, self.query_limit)
+            return self.storage.query_tasks(category, limit=max(limit, 0), offset=start)
+        with self.lock:
+            return self.index.bucket(category)[start:stop]
+
+    def count(self, category: TaskCategory) -> int:
+        if isinstance(self.storage, QueryableStorage):
+            return self.storage.count_tasks(category)
+        with self.lock:
+            return len(self.index.bucket(category))
+
+    def due_counts(self, category: TaskCategory, today_ord: int) -> DueCounts:
+        """某个标签页中 (逾期, 今天, 即将到期, 更晚) 的任务数；列表按截止日期排序，据此也能推出每个任务的状态。"""
+        if category == "completed":
+            return (0, 0, 0, 0)
+        if not isinstance(self.storage, QueryableStorage):
+            with self.lock:
+                return self.index.due_counts(category, today_ord)
+        with self.lock:
+            if self._due_key != (today_ord, self.revision):
+                self._due_cache.clear()
+                self._due_key = (today_ord, self.revision)
+            counts = self._due_cache.get(category)
+            if counts is None:
+                overdue, today, soon, later = self.storage.count_due(category, due_thresholds(today_ord))
+                counts = self._due_cache[category] = (overdue, today - overdue, soon - today, later - soon)
+            return counts
+
+    def all_tasks(self) -> list[Task]:
+        """全部任务；可查询的后端需要整体读取一次，只用于导入等批量操作。"""
+        if isinstance(self.storage, QueryableStorage):
+            return self.storage.load()[0]
+        return self.tasks
+
+    def snapshot(self) -> tuple[list[Task], list[HistoryItem]]:
+        """全部任务与历史记录的一致快照，用于统计；可查询的后端整体读取一次。"""
+        if isinstance(self.storage, QueryableStorage):
+            return self.storage.load()
+        with self.lock:
+            return list(self.index), list(self.history.items)
+
+    def get(self, task_id: str) -> Task | None:
+        with self.lock:
+            return self.index.get(task_id)
+
+    def search(self, query: str, limit: int | None = None) -> list[Task]:
+        """按描述搜索任务，多个词需同时出现，结果按创建时间倒序。"""
+        if isinstance(self.storage, QueryableStorage):
+            return self.storage.search_tasks(query, self.query_limit if limit is None else limit)
+        while True:
+            self._search_ready.wait()
+            with self.lock:
+                # 等待期间数据可能被整体替换，索引正在重建
+                if self._search_index is not None:
+                    return self._search_index.search(query, limit)
+
+    def recent_history(self, limit: int) -> list[HistoryItem]:
+        if isinstance(self.storage, QueryableStorage):
+            return self.storage.recent_history(limit)
+        with self.lock:
+            return self.history.recent(limit)
+
+    # ========================
+    # Mutations
+    # ========================
+    def add(self, task: Task) -> None:
+        with self.lock:
+            if not isinstance(self.storage, QueryableStorage):
+                self.index.add(task)
+                self._search_add(task)
+            self._commit("Added", task, ChangeSet([task]), [])
+
+    def add_many(self, tasks: list[Task], source: str) -> None:
+        """批量添加任务：一次持久化写入，只记录一条“导入”历史。"""
+        if not tasks:
+            return
+        with self.lock:
+            if not isinstance(self.storage, QueryableStorage):
+                for task in tasks:
+                    self.index.add(task)
+                    self._search_add(task)
+            task_types = {task.task_type for task in tasks}
+            item = HistoryItem(
+                "Imported",
+                f"{len(tasks)} × {source}",
+                task_types.pop() if len(task_types) == 1 else "mixed",
+                payload={"before": [], "after": [task.to_dict() for task in tasks]},
+            )
+            self._commit_item(item, ChangeSet(tasks))
+
+    def complete(self, task: Task) -> None:
+        with self.lock:
+            task = self._resolve(task)
+            before = [task.to_dict()]
+            indexed = self.index.discard(task)
+            task.completed = True
+            task.completed_min = now_minutes()
+            changes = ChangeSet([task])
+            following = self._next_occurrence(task)
+            if following is not None:
+                changes.upserted.append(following)
+                if not isinstance(self.storage, QueryableStorage):
+                    self.index.add(following)
+                    self._search_add(following)
+            if indexed:
+                self.index.add(task)
+            self._commit("Completed_action", task, changes, before)
+
+    def uncomplete(self, task: Task) -> None:
+        with self.lock:
+            task = self._resolve(task)
+            before = [task.to_dict()]
+            indexed = self.index.discard(task)
+            task.completed = False
+            task.completed_min = None
+            if indexed:
+                self.index.add(task)
+            self._commit("Uncompleted", task, ChangeSet([task]), before)
+
+    def delete(self, task: Task) -> None:
+        with self.lock:
+            task = self._resolve(task)
+            self.index.discard(task)
+            self._search_remove(task)
+            self._commit("Deleted", task, ChangeSet(deleted=[task.id]), [task.to_dict()])
+
+    def undo(self, steps: int = 1) -> list[HistoryItem]:
+        """撤销最近的 ``steps`` 次操作，返回被撤销的原始事件（最新在前）。"""
+        with self.lock:
+            undone: list[HistoryItem] = []
+            while len(undone) < steps and self.undo_stack.undo:
+                item = self.undo_stack.undo[-1]
+                self._commit_event(undo_event(item))
+                undone.append(item)
+            return undone
+
+    def redo(self, steps: int = 1) -> list[HistoryItem]:
+        """重做最近撤销的 ``steps`` 次操作，返回被重做的原始事件。"""
+        with self.lock:
+            redone: list[HistoryItem] = []
+            while len(redone) < steps and self.undo_stack.redo:
+                item = self.undo_stack.redo[-1]
+                self._commit_event(redo_event(item))
+                redone.append(item)
+            return redone
+
+    def refresh(self) -> bool:
+        """检查数据是否被其他写入方修改过。未修改时只比较文件状态，返回是否有变化。"""
+        with self.lock:
+            merged = self.storage.take_merged()
+            if merged is not None:
+                self._replace(*merged)
+                return True
+            changes = self.storage.poll(self.index.by_id, self.history.items)
+            if changes is None:
+                return False
+            if isinstance(self.storage, QueryableStorage):
+                self.undo_stack = self._load_undo_stack()
+            else:
+                self._apply(changes)
+            self.revision += 1
+            return True
+
+    def catch_up(self, today_ord: int) -> int:
+        """把截止日期已过的重复任务移到不晚于今天的最近一次，返回共错过的次数。
+
+        每天只检查一次；每个任务的新日期直接算出，与停机天数无关。
+        """
+        if today_ord == self.caught_up_ord:
+            return 0
+        with self.lock:
+            self.caught_up_ord = today_ord
+            moved: list[Task] = []
+            missed_total = 0
+            candidates = (
+                self.storage.overdue_recurring(today_ord)
+                if isinstance(self.storage, QueryableStorage)
+                else list(self.index)
+            )
+            for task in candidates:
+                if task.completed or not task.recurrence or task.due_ord is None or task.due_ord >= today_ord:
+                    continue
+                rule = parse_rule(task.recurrence)
+                if rule is None:
+                    continue
+                due_ord, missed = rule.catch_up(task.due_ord, today_ord)
+                if not missed:
+                    continue
+                indexed = self.index.discard(task)
+                task.due_ord = due_ord
+                if indexed:
+                    self.index.add(task)
+                moved.append(task)
+                missed_total += missed
+            if moved:
+                self.revision += 1
+                self._write(ChangeSet(moved))
+            return missed_total
+
+    def compact_history(self) -> int:
+        """按保留策略移出过期的历史记录：先追加到归档文件，再从数据文件中删除。返回移出的条数。"""
+        history = self.history
+        if not (history.max_items or history.max_age_days):
+            return 0
+        with self.lock:
+            now_min = now_minutes()
+            cutoff = history.cutoff(now_min)
+            if isinstance(self.storage, QueryableStorage):
+                expired = self.storage.expired_history(history.max_items, format_minutes(cutoff) if cutoff else "")
+            else:
+                expired = history.expired(now_min)
+            if not expired:
+                return 0
+            with span("store.compact"):
+                if self.archive_path is not None:
+                    try:
+                        append_history_archive(self.archive_path, expired)
+                    except OSError as e:
+                        # 记录仍留在内存与数据文件中，下次整理时重试
+                        self.archive_error = e
+                        return 0
+                    self.archive_error = None
+                if isinstance(self.storage, QueryableStorage):
+                    self.storage.delete_history(item.id for item in expired)
+                else:
+                    history.drop_oldest(len(expired))
+                    self._write(ChangeSet(dropped_history=[item.id for item in expired]))
+            return len(expired)
+
+    def close(self) -> None:
+        self.storage.close()
+
+    def _resolve(self, task: Task) -> Task:
+        """界面上拿到的可能是旧对象，统一换成索引中的当前对象。"""
+        return self.index.get(task.id) or task
+
+    @staticmethod
+    def _next_occurrence(task: Task) -> Task | None:
+        """完成重复任务时生成下一次；完成的这一次不再带有规则，作为普通的已完成任务保留。"""
+        rule = parse_rule(task.recurrence) if task.recurrence else None
+        if rule is None:
+            return None
+        today_ord = datetime.date.today().toordinal()
+        following = Task(task.task, task.task_type, task.color, recurrence=task.recurrence)
+        following.due_ord = rule.next_after(today_ord if task.due_ord is None else task.due_ord, today_ord)
+        task.recurrence = None
+        return following
+
+    def _start_search_build(self) -> None:
+        """在后台线程中为当前任务建立搜索索引；需持有 ``lock``（或在构造函数中）调用。"""
+        self._search_index = None
+        self._search_ready.clear()
+        self._search_generation += 1
+        self._search_log = []
+        threading.Thread(
+            target=self._build_search_index,
+            args=(self._search_generation, list(self.index)),
+            name="todo-search-index",
+            daemon=True,
+        ).start()
+
+    def _build_search_index(self, generation: int, tasks: list[Task]) -> None:
+        with span("store.search_index"):
+            index = SearchIndex(tasks)
+        with self.lock:
+            if generation != self._search_generation:
+                return
+            for added, task in self._search_log or ():
+                if added:
+                    index.add(task)
+                else:
+                    index.remove(task)
+            self._search_log = None
+            self._search_index = index
+            self._search_ready.set()
+
+    def _search_add(self, task: Task) -> None:
+        if self._search_index is not None:
+            self._search_index.add(task)
+        elif self._search_log is not None:
+            self._search_log.append((True, task))
+
+    def _search_remove(self, task: Task) -> None:
+        if self._search_index is not None:
+            self._search_index.remove(task)
+        elif self._search_log is not None:
+            self._search_log.append((False, task))
+
+    def _load_undo_stack(self) -> UndoStack:
+        # 可查询的后端只读取最近的一段历史；撤销与重做记录成对出现，多读几倍以覆盖完整的撤销深度
+        events = (
+            self.storage.recent_history(self.undo_depth * 4)
+            if isinstance(self.storage, QueryableStorage)
+            else self.history
+        )
+        return UndoStack(reversed(events), self.undo_depth)
+
+    def _commit(self, action: ActionType, task: Task, changes: ChangeSet, before: list[TaskDict]) -> None:
+        """``before`` 为受影响任务修改前的状态，修改后的状态即 ``changes`` 中写入的任务。"""
+        payload: EventPayload = {"before": before, "after": [changed.to_dict() for changed in changes.upserted]}
+        self._commit_item(HistoryItem(action, task.task, task.task_type, task.id, payload), changes)
+
+    def _commit_event(self, item: HistoryItem) -> None:
+        """提交撤销或重做事件：按事件载荷修改任务，再像普通操作一样记录。"""
+        changes = ChangeSet(*event_changes(event_payload(item)))
+        if not isinstance(self.storage, QueryableStorage):
+            self._apply(changes)
+        self._commit_item(item, changes)
+
+    def _commit_item(self, item: HistoryItem, changes: ChangeSet) -> None:
+        changes.history.append(item)
+        self.undo_stack.push(item)
+        if not isinstance(self.storage, QueryableStorage):
+            self.history.push(item)
+        self.revision += 1
+        self._write(changes)
+        if self.revision % self.COMPACT_EVERY == 0:
+            self.compact_history()
+
+    def _write(self, changes: ChangeSet) -> None:
+        with span("store.commit"):
+            merged = self.storage.commit(self.index.by_id.values(), self.history.items, changes)
+        if merged is not None:
+            self._replace(*merged)
+
+    def _apply(self, changes: ChangeSet) -> None:
+        """把其他写入方的增量修改应用到索引与历史中，开销只与变化的记录数有关。"""
+        # 同 id 的旧任务由 add 替换
+        for task in changes.upserted:
+            self.index.add(task)
+            self._search_add(task)
+        for task_id in changes.deleted:
+            old = self.index.get(task_id)
+            if old is not None:
+                self.index.discard(old)
+                self._search_remove(old)
+        for item in changes.history:
+            self.history.push(item)
+            self.undo_stack.push(item)
+        if changes.dropped_history:
+            dropped = set(changes.dropped_history)
+            self.history.items = deque(item for item in self.history.items if item.id not in dropped)
+
+    def _replace(self, tasks: list[Task], history: list[HistoryItem]) -> None:
+        """其他写入方修改过数据文件时，换成按任务 id 合并后的完整状态。"""
+        self.index = TaskIndex(tasks)
+        self._start_search_build()
+        history.sort(key=sort_history_items, reverse=True)
+        self.history = HistoryLog(history, max_items=self.history.max_items, max_age_days=self.history.max_age_days)
+        self.undo_stack = self._load_undo_stack()
+        self.revision += 1
+
+
+def open_store(settings: ToDoSettings) -> TaskStore:
+    """按配置打开存储后端并创建仓库，界面与命令行工具共用。"""
+    return TaskStore(
+        open_storage(settings),
+        query_limit=settings.query_limit,
+        history_max_items=settings.history_max_items,
+        history_max_age_days=settings.history_max_age_days,
+        archive_path=Path(settings.history_archive_path),
+        undo_depth=settings.undo_depth,
+    )
+
+
+# 影响存储后端与仓库行为的配置项；其余配置只影响界面，修改后下一次重跑即生效
+STORE_SETTINGS = frozenset(
+    {
+        "history_file_path",
+        "storage_backend",
+        "data_format",
+        "data_format_auto_detect",
+        "sqlite_file_path",
+        "query_limit",
+        "history_max_items",
+        "history_max_age_days",
+        "history_archive_path",
+        "journal_checkpoint_interval",
+        "write_behind",
+        "write_coalesce_ms",
+        "undo_depth",
+    }
+)
+
+
+class StoreHolder:
+    """持有按当前配置打开的仓库。
+
+    ``STORE_SETTINGS`` 中的配置变化时先关闭旧仓库（写完积压的修改），再按新配置重新打开，
+    避免新旧两个仓库同时写同一个文件。
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.key: str | None = None
+        self.store: TaskStore | None = None
+
+    def get(self, settings: ToDoSettings) -> TaskStore:
+        key = settings.model_dump_json(include=set(STORE_SETTINGS))
+        with self.lock:
+            if self.store is None or key != self.key:
+                if self.store is not None:
+                    self.store.close()
+                    self.store = None
+                self.store = open_store(settings)
+                self.key = key
+            return self.store
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import json
+from collections.abc import Mapping
+from functools import cache, lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# 每种语言一个 JSON 文件（<语言代码>.json），新增语言只需放入新文件
+LOCALES_DIR = Path(__file__).parent
+DEFAULT_LANGUAGE = "en"
+
+
+@lru_cache(maxsize=1)
+def available_languages() -> tuple[str, ...]:
+    """只列出目录中的语言文件，不读取内容；默认语言排在最前。"""
+    codes = sorted(path.stem for path in LOCALES_DIR.glob("*.json"))
+    return tuple(sorted(codes, key=lambda code: code != DEFAULT_LANGUAGE))
+
+
+@cache
+def load_catalog(lang: str) -> dict[str, str]:
+    """第一次用到某种语言时才读取其文件。缺失的词条在加载时用默认语言补齐，查询时只需一次字典查找。"""
+    path = LOCALES_DIR / f"{lang}.json"
+    if lang not in available_languages():
+        return load_catalog(DEFAULT_LANGUAGE) if lang != DEFAULT_LANGUAGE else {}
+    with path.open("r", encoding="utf-8") as f:
+        catalog: dict[str, str] = json.load(f)
+    if lang == DEFAULT_LANGUAGE:
+        return catalog
+    return {**load_catalog(DEFAULT_LANGUAGE), **catalog}
+
+
+class Catalogs(Mapping[str, dict[str, str]]):
+    """按语言代码访问词条的只读映射，访问某种语言时才加载对应文件。"""
+
+    def __getitem__(self, lang: str) -> dict[str, str]:
+        if lang not in available_languages():
+            raise KeyError(lang)
+        return load_catalog(lang)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(available_languages())
+
+    def __len__(self) -> int:
+        return len(available_languages())
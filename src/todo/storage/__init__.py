@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import atexit
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from todo.storage.base import ChangeSet, QueryableStorage, Storage, event_changes
+from todo.storage.journal import JournalStorage
+from todo.storage.json_file import JsonStorage
+from todo.storage.jsonl import iter_jsonl
+from todo.storage.sqlite import SqliteStorage, migrate_json_to_sqlite
+from todo.storage.writer import QueryableWriteBehindStorage, WriteBehindStorage
+
+if TYPE_CHECKING:
+    from todo._dataclass import ToDoSettings
+
+__all__ = [
+    "ChangeSet",
+    "JournalStorage",
+    "JsonStorage",
+    "QueryableStorage",
+    "QueryableWriteBehindStorage",
+    "SqliteStorage",
+    "Storage",
+    "WriteBehindStorage",
+    "event_changes",
+    "iter_jsonl",
+    "migrate_json_to_sqlite",
+    "open_storage",
+]
+
+
+def open_storage(settings: ToDoSettings) -> Storage:
+    """根据配置创建持久化后端；开启 ``write_behind`` 时包装为后台合并写入，并在进程退出时落盘。"""
+    storage = open_backend(settings)
+    if settings.write_behind:
+        window = settings.write_coalesce_ms / 1000
+        if isinstance(storage, QueryableStorage):
+            storage = QueryableWriteBehindStorage(storage, window=window)
+        else:
+            storage = WriteBehindStorage(storage, window=window)
+        atexit.register(storage.close)
+    return storage
+
+
+def open_backend(settings: ToDoSettings) -> Storage:
+    path = Path(settings.history_file_path)
+    if settings.storage_backend == "sqlite":
+        db_path = Path(settings.sqlite_file_path)
+        if not db_path.exists() and path.exists():
+            migrate_json_to_sqlite(path, db_path)
+        return SqliteStorage(db_path)
+    if settings.storage_backend == "journal":
+        return JournalStorage(
+            path,
+            checkpoint_interval=settings.journal_checkpoint_interval,
+            data_format=settings.data_format,
+            auto_detect=settings.data_format_auto_detect,
+        )
+    return JsonStorage(path, data_format=settings.data_format, auto_detect=settings.data_format_auto_detect)
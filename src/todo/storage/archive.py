@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from todo._dataclass import HistoryItem
+
+
+def append_history_archive(path: Path, items: Iterable[HistoryItem]) -> None:
+    """把过期的历史记录以 JSON Lines 追加到归档文件，写入并 fsync 后才会从数据文件中删除。"""
+    lines = "".join(json.dumps(item.to_dict(), ensure_ascii=False, separators=(",", ":")) + "\n" for item in items)
+    if not lines:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as f:
+        f.write(lines)
+        f.flush()
+        os.fsync(f.fileno())
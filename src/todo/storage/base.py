@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from operator import attrgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+from todo._dataclass import Task
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Generator, Iterable, Mapping, Sequence
+
+    from todo._dataclass import HistoryItem
+    from todo._typing import EventPayload, TaskCategory
+
+
+class ChangeSet:
+    """一次用户操作产生的增量修改，供支持增量写入的后端使用。
+
+    ``dropped_history`` 为按保留策略移出的历史记录 id。
+    """
+
+    def __init__(
+        self,
+        upserted: Iterable[Task] = (),
+        deleted: Iterable[str] = (),
+        history: Iterable[HistoryItem] = (),
+        dropped_history: Iterable[str] = (),
+    ):
+        self.upserted: list[Task] = list(upserted)
+        self.deleted: list[str] = list(deleted)
+        self.history: list[HistoryItem] = list(history)
+        self.dropped_history: list[str] = list(dropped_history)
+
+    def __bool__(self) -> bool:
+        return bool(self.upserted or self.deleted or self.history or self.dropped_history)
+
+    def merge(self, other: ChangeSet) -> None:
+        """合并之后发生的修改，同一任务只保留最终状态。"""
+        later_deleted = set(other.deleted)
+        upserted = {task.id: task for task in self.upserted if task.id not in later_deleted}
+        upserted.update((task.id, task) for task in other.upserted)
+        deleted = dict.fromkeys(task_id for task_id in self.deleted if task_id not in upserted)
+        deleted.update(dict.fromkeys(other.deleted))
+        self.upserted = list(upserted.values())
+        self.deleted = list(deleted)
+        self.history.extend(other.history)
+        self.dropped_history.extend(other.dropped_history)
+
+
+def apply_changes(
+    tasks: Iterable[Task], history: Iterable[HistoryItem], changes: ChangeSet
+) -> tuple[list[Task], list[HistoryItem]]:
+    """把一次操作的增量按任务 id 合并到另一份完整状态上，用于并发写入冲突时的逐条合并。
+
+    新增或修改的任务覆盖同 id 的任务，删除的任务被移除；历史记录按 id 去重后加在最前面。
+    """
+    tasks_by_id = {task.id: task for task in tasks}
+    tasks_by_id.update((task.id, task) for task in changes.upserted)
+    for task_id in changes.deleted:
+        tasks_by_id.pop(task_id, None)
+    dropped = set(changes.dropped_history)
+    history = [item for item in history if item.id not in dropped]
+    seen = {item.id for item in history}
+    new_history = [item for item in reversed(changes.history) if item.id not in seen and item.id not in dropped]
+    return list(tasks_by_id.values()), new_history + history
+
+
+def event_changes(payload: EventPayload) -> tuple[list[Task], list[str]]:
+    """事件对任务的效果：``after`` 中的任务写入为该状态，只出现在 ``before`` 中的任务被删除。"""
+    after = [Task.from_dict(data) for data in payload["after"]]
+    kept = {task.id for task in after}
+    return after, [data["id"] for data in payload["before"] if data["id"] not in kept]
+
+
+task_fields = attrgetter(*Task.__slots__)
+
+
+def diff_state(
+    tasks: Mapping[str, Task],
+    history: Iterable[HistoryItem],
+    new_tasks: Iterable[Task],
+    new_history: Iterable[HistoryItem],
+) -> ChangeSet:
+    """比较内存中的状态与重新读取的完整状态，返回两者之间变化的记录。历史记录按时间先后排列。"""
+    changes = ChangeSet()
+    remaining = dict(tasks)
+    for task in new_tasks:
+        old = remaining.pop(task.id, None)
+        if old is None or task_fields(old) != task_fields(task):
+            changes.upserted.append(task)
+    changes.deleted = list(remaining)
+    old_ids = {item.id for item in history}
+    new_items: list[HistoryItem] = []
+    for item in new_history:
+        if item.id in old_ids:
+            old_ids.discard(item.id)
+        else:
+            new_items.append(item)
+    changes.history = new_items[::-1]
+    changes.dropped_history = list(old_ids)
+    return changes
+
+
+class Storage(ABC):
+    """持久化后端的公共接口。
+
+    ``load``/``save`` 读写完整的任务与历史列表；``commit`` 只持久化一次操作的增量，
+    默认实现退化为整体重写，增量后端（日志、SQLite）会覆盖它。
+
+    可以直接按标签页分页查询的后端实现 ``QueryableStorage``，调用方无需把全部数据读入内存。
+
+    多个进程可能同时写同一份数据：``commit`` 发现数据已被其他写入方修改时，
+    把本次增量合并到磁盘上的最新状态后写入，并返回合并后的完整状态，调用方据此更新内存中的数据；
+    没有冲突时返回 ``None``。
+    """
+
+    @abstractmethod
+    def load(self) -> tuple[list[Task], list[HistoryItem]]: ...
+
+    @abstractmethod
+    def save(self, tasks: Collection[Task], history: Sequence[HistoryItem]) -> None: ...
+
+    def commit(
+        self, tasks: Collection[Task], history: Sequence[HistoryItem], changes: ChangeSet
+    ) -> tuple[list[Task], list[HistoryItem]] | None:
+        self.save(tasks, history)
+        return None
+
+    def poll(self, tasks: Mapping[str, Task], history: Iterable[HistoryItem]) -> ChangeSet | None:
+        """检查数据是否被其他写入方修改，返回相对 ``tasks``/``history`` 变化的记录，没有变化时返回 ``None``。
+
+        未修改时的开销应与数据量无关（例如只比较文件的修改时间与大小）。
+        """
+        return None
+
+    def take_merged(self) -> tuple[list[Task], list[HistoryItem]] | None:
+        """后台写入时与其他写入方合并后的完整状态，每次合并只返回一次；同步写入的后端直接由 ``commit`` 返回。"""
+        return None
+
+    def files(self) -> list[Path]:
+        """后端在磁盘上使用的文件，用于统计数据大小。"""
+        return []
+
+    def close(self) -> None:  # noqa: B027
+        """释放后端持有的资源，默认无需处理。"""
+
+
+class QueryableStorage(Storage):
+    """可以直接按标签页分页查询的后端，调用方按需读取，不把全部数据读入内存。"""
+
+    @abstractmethod
+    def query_tasks(self, category: TaskCategory, limit: int, offset: int = 0) -> list[Task]: ...
+
+    @abstractmethod
+    def count_tasks(self, category: TaskCategory) -> int: ...
+
+    @abstractmethod
+    def count_due(self, category: TaskCategory, thresholds: Sequence[int]) -> list[int]:
+        """未完成任务中截止日期早于各个日期序数的任务数。"""
+
+    @abstractmethod
+    def overdue_recurring(self, today_ord: int) -> list[Task]:
+        """截止日期早于 ``today_ord`` 的未完成重复任务。"""
+
+    @abstractmethod
+    def search_tasks(self, query: str, limit: int) -> list[Task]:
+        """描述中包含 ``query`` 里每个词的任务，按创建时间倒序。"""
+
+    @abstractmethod
+    def recent_history(self, limit: int) -> list[HistoryItem]: ...
+
+    @abstractmethod
+    def expired_history(self, max_items: int, cutoff: str) -> list[HistoryItem]:
+        """返回超出保留条数或早于 ``cutoff`` 的历史记录。"""
+
+    @abstractmethod
+    def delete_history(self, history_ids: Iterable[str]) -> None: ...
+
+
+@contextmanager
+def atomic_writer(path: Path) -> Generator[BinaryIO]:
+    """写入同目录下的临时文件，成功后 fsync 并原子替换目标文件，写到一半崩溃也不会截断原文件。"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    tmp_path = Path(tmp_name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    if hasattr(os, "O_DIRECTORY"):  # Windows 无法对目录 fsync
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    with atomic_writer(path) as f:
+        f.write(data)
@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import re
+import struct
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from itertools import accumulate
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, ClassVar, cast
+
+from todo._dataclass import HistoryItem, Task
+from todo.storage.base import atomic_writer
+from todo.storage.jsonl import HEADER_PREFIX, load_jsonl, write_jsonl
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+    from typing import BinaryIO
+
+    from todo._typing import ActionType, DataDict, DataFormat, JsonlHeader, TaskType
+
+
+# 读取文件头时读入的字节数，足够容纳各格式的版本号
+HEAD_SIZE = 256
+
+
+class Codec(ABC):
+    """数据文件的编码格式。``sniff`` 根据文件开头的字节判断文件是否属于该格式。
+
+    每种格式都把文件的版本号 ``revision`` 写在文件开头，``read_revision`` 只需读取文件头即可取得。
+    """
+
+    name: ClassVar[DataFormat]
+
+    @abstractmethod
+    def sniff(self, head: bytes) -> bool: ...
+
+    @abstractmethod
+    def read_revision(self, head: bytes) -> int: ...
+
+    @abstractmethod
+    def load(self, path: Path) -> tuple[list[Task], list[HistoryItem]]: ...
+
+    @abstractmethod
+    def dump(self, f: BinaryIO, tasks: Collection[Task], history: Sequence[HistoryItem], revision: int = 0) -> None: ...
+
+
+class JsonCodec(Codec):
+    """原有的单个 JSON 对象格式（``DataDict``）。"""
+
+    name = "json"
+    indent: int | None = 2
+    # 版本号是第一个键；旧文件没有版本号，视为 0
+    REVISION_PATTERN = re.compile(rb'\{\s*"revision":\s*(\d+)')
+
+    def sniff(self, head: bytes) -> bool:
+        return head.lstrip().startswith(b"{")
+
+    def read_revision(self, head: bytes) -> int:
+        match = self.REVISION_PATTERN.match(head.lstrip())
+        return int(match.group(1)) if match else 0
+
+    def load(self, path: Path) -> tuple[list[Task], list[HistoryItem]]:
+        with path.open("r", encoding="utf-8") as f:
+            data: DataDict = json.load(f)
+        tasks = [Task.from_dict(t) for t in data.get("tasks", [])]
+        history = [HistoryItem.from_dict(h) for h in data.get("history", [])]
+        return tasks, history
+
+    def dump(self, f: BinaryIO, tasks: Collection[Task], history: Sequence[HistoryItem], revision: int = 0) -> None:
+        data: DataDict = {
+            "revision": revision,
+            "tasks": [t.to_dict() for t in tasks],
+            "history": [h.to_dict() for h in history],
+            "last_updated": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+        }
+        separators = None if self.indent else (",", ":")
+        f.write(json.dumps(data, indent=self.indent, ensure_ascii=False, separators=separators).encode("utf-8"))
+
+
+class CompactJsonCodec(JsonCodec):
+    """与 ``json`` 相同的结构，但不写入缩进和多余空白。"""
+
+    name = "json-compact"
+    indent = None
+
+
+class JsonlCodec(Codec):
+    name = "jsonl"
+
+    def sniff(self, head: bytes) -> bool:
+        return head.startswith(HEADER_PREFIX)
+
+    def read_revision(self, head: bytes) -> int:
+        header: JsonlHeader = json.loads(head.partition(b"\n")[0])
+        return header.get("revision", 0)
+
+    def load(self, path: Path) -> tuple[list[Task], list[HistoryItem]]:
+        return load_jsonl(path)
+
+    def dump(self, f: BinaryIO, tasks: Collection[Task], history: Sequence[HistoryItem], revision: int = 0) -> None:
+        write_jsonl(f, tasks, history, revision)
+
+
+class BinaryCodec(Codec):
+    """列式二进制快照。
+
+    布局：魔数、任务数、历史数与版本号，之后按列存放。字符串列为一整段 UTF-8 加每项的字符长度，
+    整数列为小端 int64 数组，读取时用 ``array.frombytes`` 一次性解出，无需逐条解析文本或日期。
+    无法解析而原样保留的时间字符串与重复规则很少出现，单独以 JSON 附在末尾；
+    历史记录的任务 id 与事件载荷随后再附一段 JSON（早期文件没有这一段）。
+    """
+
+    name = "binary"
+    MAGIC = b"TODOBIN\x02"
+    # 第 1 版文件头中没有版本号，仍可读取
+    MAGIC_V1 = b"TODOBIN\x01"
+    NONE = -1
+
+    def sniff(self, head: bytes) -> bool:
+        return head.startswith((self.MAGIC, self.MAGIC_V1))
+
+    def read_revision(self, head: bytes) -> int:
+        if not head.startswith(self.MAGIC):
+            return 0
+        (revision,) = struct.unpack_from("<Q", head, len(self.MAGIC) + 8)
+        return revision
+
+    def dump(self, f: BinaryIO, tasks: Collection[Task], history: Sequence[HistoryItem], revision: int = 0) -> None:
+        f.write(self.MAGIC)
+        f.write(struct.pack("<IIQ", len(tasks), len(history), revision))
+        write_strings(f, [t.id for t in tasks])
+        write_strings(f, [t.task for t in tasks])
+        write_strings(f, [t.task_type for t in tasks])
+        write_strings(f, [t.color for t in tasks])
+        write_ints(f, [t.created_min for t in tasks])
+        write_ints(f, [int(t.completed) for t in tasks])
+        write_ints(f, [self.NONE if t.completed_min is None else t.completed_min for t in tasks])
+        write_ints(f, [self.NONE if t.due_ord is None else t.due_ord for t in tasks])
+        write_strings(f, [h.id for h in history])
+        write_strings(f, [h.action for h in history])
+        write_strings(f, [h.task_description for h in history])
+        write_strings(f, [h.task_type for h in history])
+        write_ints(f, [h.ts_min for h in history])
+        raw = {i: extra_fields(t) for i, t in enumerate(tasks) if t.raw_fields or t.recurrence}
+        write_strings(f, [json.dumps(raw, ensure_ascii=False)])
+        events = {i: [h.task_id, h.payload] for i, h in enumerate(history) if h.task_id or h.payload}
+        write_strings(f, [json.dumps(events, ensure_ascii=False, separators=(",", ":"))])
+
+    def load(self, path: Path) -> tuple[list[Task], list[HistoryItem]]:
+        reader = ColumnReader(path.read_bytes())
+        magic = reader.read(len(self.MAGIC))
+        if magic not in (self.MAGIC, self.MAGIC_V1):
+            raise ValueError(f"{path} 不是二进制快照文件")
+        n_tasks, n_history = struct.unpack("<II", reader.read(8))
+        if magic == self.MAGIC:
+            reader.read(8)
+        ids, texts = reader.strings(n_tasks), reader.strings(n_tasks)
+        task_types = [sys.intern(s) for s in reader.strings(n_tasks)]
+        colors = [sys.intern(s) for s in reader.strings(n_tasks)]
+        created, completed = reader.ints(n_tasks), reader.ints(n_tasks)
+        completed_at, due = reader.ints(n_tasks), reader.ints(n_tasks)
+        none = self.NONE
+        tasks = [
+            Task.from_parsed(
+                ids[i],
+                texts[i],
+                cast("TaskType", task_types[i]),
+                colors[i],
+                created[i],
+                bool(completed[i]),
+                None if completed_at[i] == none else completed_at[i],
+                None if due[i] == none else due[i],
+            )
+            for i in range(n_tasks)
+        ]
+        h_ids, actions = reader.strings(n_history), [sys.intern(s) for s in reader.strings(n_history)]
+        descriptions, h_types = reader.strings(n_history), [sys.intern(s) for s in reader.strings(n_history)]
+        timestamps = reader.ints(n_history)
+        history = [
+            HistoryItem.from_parsed(
+                h_ids[i], cast("ActionType", actions[i]), descriptions[i], h_types[i], timestamps[i]
+            )
+            for i in range(n_history)
+        ]
+        raw: dict[str, dict[str, str]] = json.loads(reader.strings(1)[0])
+        for row, fields in raw.items():
+            task = tasks[int(row)]
+            for field, value in fields.items():
+                setattr(task, field, value)
+        if not reader.at_end():
+            events: dict[str, list[Any]] = json.loads(reader.strings(1)[0])
+            for row, (task_id, payload) in events.items():
+                item = history[int(row)]
+                item.task_id, item.payload = task_id, payload
+        return tasks, history
+
+
+def extra_fields(task: Task) -> dict[str, str]:
+    fields = task.raw_fields
+    if task.recurrence:
+        fields["recurrence"] = task.recurrence
+    return fields
+
+
+def write_strings(f: BinaryIO, values: list[str]) -> None:
+    blob = "".join(values).encode("utf-8")
+    f.write(struct.pack("<Q", len(blob)))
+    f.write(blob)
+    write_ints(f, [len(v) for v in values])
+
+
+def write_ints(f: BinaryIO, values: list[int]) -> None:
+    column = array("q", values)
+    if sys.byteorder == "big":
+        column.byteswap()
+    f.write(column.tobytes())
+
+
+class ColumnReader:
+    def __init__(self, data: bytes):
+        self.view = memoryview(data)
+        self.pos = 0
+
+    def at_end(self) -> bool:
+        return self.pos >= len(self.view)
+
+    def read(self, size: int) -> bytes:
+        chunk = self.view[self.pos : self.pos + size]
+        if len(chunk) != size:
+            raise ValueError("二进制快照文件不完整")
+        self.pos += size
+        return bytes(chunk)
+
+    def ints(self, count: int) -> array[int]:
+        column = array("q")
+        column.frombytes(self.read(count * column.itemsize))
+        if sys.byteorder == "big":
+            column.byteswap()
+        return column
+
+    def strings(self, count: int) -> list[str]:
+        (size,) = struct.unpack("<Q", self.read(8))
+        text = self.read(size).decode("utf-8")
+        ends = list(accumulate(self.ints(count)))
+        return [text[start:end] for start, end in zip([0, *ends][:-1], ends, strict=True)]
+
+
+CODECS: dict[DataFormat, Codec] = {
+    codec.name: codec for codec in (JsonCodec(), CompactJsonCodec(), JsonlCodec(), BinaryCodec())
+}
+# 自动识别时的尝试顺序：带魔数/文件头的格式优先，两种 JSON 对象格式读取方式相同
+DETECT_ORDER: tuple[Codec, ...] = (CODECS["binary"], CODECS["jsonl"], CODECS["json"])
+
+
+def read_head(path: Path) -> bytes:
+    with path.open("rb") as f:
+        return f.read(HEAD_SIZE)
+
+
+def sniff_codec(head: bytes, path: Path) -> Codec:
+    for codec in DETECT_ORDER:
+        if codec.sniff(head):
+            return codec
+    raise ValueError(f"无法识别数据文件格式: {path}")
+
+
+def detect_codec(path: Path) -> Codec:
+    return sniff_codec(read_head(path), path)
+
+
+def read_revision(path: Path) -> int:
+    """只读取文件头取得数据文件的版本号；文件不存在时为 0。"""
+    try:
+        head = read_head(path)
+    except FileNotFoundError:
+        return 0
+    return sniff_codec(head, path).read_revision(head)
+
+
+def convert(src: Path, dst: Path, data_format: DataFormat) -> tuple[int, int]:
+    """把数据文件转换为另一种格式（保留版本号），返回任务数与历史数。"""
+    tasks, history = detect_codec(src).load(src)
+    with atomic_writer(dst) as f:
+        CODECS[data_format].dump(f, tasks, history, read_revision(src))
+    return len(tasks), len(history)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m todo.storage.codecs", description="转换待办数据文件的格式")
+    parser.add_argument("src", type=Path)
+    parser.add_argument("dst", type=Path)
+    parser.add_argument("--to", dest="data_format", choices=list(CODECS), default="binary")
+    args: Any = parser.parse_args(argv)
+    n_tasks, n_history = convert(args.src, args.dst, args.data_format)
+    print(f"已将 {n_tasks} 个任务、{n_history} 条历史记录写入 {args.dst} ({args.data_format})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from todo._dataclass import HistoryItem, Task
+from todo.storage.base import ChangeSet, Storage, apply_changes, diff_state, event_changes
+from todo.storage.codecs import read_revision
+from todo.storage.json_file import JsonStorage, file_signature
+from todo.storage.locking import file_lock
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Mapping, Sequence
+    from pathlib import Path
+
+    from todo._typing import DataFormat, JournalRecord, TaskDict
+
+
+def journal_path_for(path: Path) -> Path:
+    return path.with_name(path.name + ".journal")
+
+
+class JournalStorage(Storage):
+    """快照 + 事件日志。
+
+    每次操作只向日志末尾追加几行紧凑的 JSON 记录，写入开销与数据总量无关；
+    带载荷的操作记录本身就是事件，重放它即可得到操作后的任务，不再另写任务记录。
+    日志累计 ``checkpoint_interval`` 条记录后把当前状态写成快照并清空日志，
+    启动时读取最近的快照，再按顺序重放其后的事件，恢复时间只与检查点间隔有关。
+
+    多个写入方共用快照的文件锁：追加前先检查快照版本号与日志长度，
+    其他写入方追加的记录从 ``offset`` 处读出并合并，写过检查点时则整体重新读取。
+    ``poll`` 同样只读取日志中新追加的记录。
+    """
+
+    def __init__(
+        self, path: Path, checkpoint_interval: int = 1000, data_format: DataFormat = "json", auto_detect: bool = True
+    ):
+        self.path = path
+        self.journal_path = journal_path_for(path)
+        self.checkpoint_interval = checkpoint_interval
+        self.snapshot = JsonStorage(path, data_format=data_format, auto_detect=auto_detect)
+        self.pending_records = 0
+        # 已读取到的日志字节数
+        self.offset = 0
+        self.signature: tuple[tuple[int, int] | None, int] | None = None
+
+    def load(self) -> tuple[list[Task], list[HistoryItem]]:
+        with file_lock(self.path):
+            tasks, history = self._read_all()
+            if self.pending_records >= self.checkpoint_interval:
+                self._checkpoint(tasks, history)
+        return tasks, history
+
+    def files(self) -> list[Path]:
+        return [self.path, self.journal_path]
+
+    def save(self, tasks: Collection[Task], history: Sequence[HistoryItem]) -> None:
+        with file_lock(self.path):
+            self._checkpoint(tasks, history)
+
+    def commit(
+        self, tasks: Collection[Task], history: Sequence[HistoryItem], changes: ChangeSet
+    ) -> tuple[list[Task], list[HistoryItem]] | None:
+        records = to_records(changes)
+        if not records:
+            return None
+        with file_lock(self.path):
+            merged = None
+            if read_revision(self.path) != self.snapshot.revision:
+                # 其他写入方写过检查点，日志已被清空
+                merged = apply_changes(*self._read_all(), changes)
+            elif self._journal_size() != self.offset:
+                merged = apply_changes(*replay(list(tasks), list(history), self._read_journal()), changes)
+            self.path.parent.mkdir(exist_ok=True)
+            lines = "".join(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n" for record in records)
+            with self.journal_path.open("a", encoding="utf-8") as f:
+                f.write(lines)
+            self.offset = self._journal_size()
+            self.pending_records += len(records)
+            if self.pending_records >= self.checkpoint_interval:
+                self._checkpoint(*(merged or (tasks, history)))
+        return merged
+
+    def poll(self, tasks: Mapping[str, Task], history: Iterable[HistoryItem]) -> ChangeSet | None:
+        signature = (file_signature(self.path), self._journal_size())
+        if signature == self.signature:
+            return None
+        self.signature = signature
+        with file_lock(self.path):
+            if read_revision(self.path) != self.snapshot.revision:
+                changes = diff_state(tasks, history, *self._read_all())
+            else:
+                changes = records_to_changes(self._read_journal())
+        return changes or None
+
+    # 以下方法需要调用方持有文件锁
+    def _read_all(self) -> tuple[list[Task], list[HistoryItem]]:
+        tasks, history = self.snapshot.read()
+        self.offset = self.pending_records = 0
+        records = self._read_journal()
+        if records:
+            tasks, history = replay(tasks, history, records)
+        return tasks, history
+
+    def _checkpoint(self, tasks: Collection[Task], history: Sequence[HistoryItem]) -> None:
+        self.snapshot.write(tasks, history, max(read_revision(self.path), self.snapshot.revision) + 1)
+        self.journal_path.unlink(missing_ok=True)
+        self.offset = self.pending_records = 0
+
+    def _journal_size(self) -> int:
+        try:
+            return self.journal_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+
+    def _read_journal(self) -> list[JournalRecord]:
+        """读取 ``offset`` 之后的日志记录。"""
+        if not self.journal_path.exists():
+            return []
+        with self.journal_path.open("rb") as f:
+            f.seek(self.offset)
+            raw = f.read()
+        complete, _, torn = raw.rpartition(b"\n")
+        if torn:
+            # 上次追加时崩溃留下的半行，截掉以免与后续追加的记录粘在一起
+            with self.journal_path.open("r+b") as f:
+                f.truncate(self.offset + len(complete) + 1 if complete else self.offset)
+        records = [json.loads(line) for line in complete.decode("utf-8").splitlines() if line]
+        self.offset += len(complete) + 1 if complete else 0
+        self.pending_records += len(records)
+        return records
+
+
+def to_records(changes: ChangeSet) -> list[JournalRecord]:
+    """事件记录在前；结果与事件载荷不同的任务（后续又被修改、并发合并等）再写一条任务记录覆盖。"""
+    records: list[JournalRecord] = []
+    effects: dict[str, TaskDict | None] = {}
+    for item in changes.history:
+        records.append({"op": "history", "data": item.to_dict()})
+        if item.payload is not None:
+            effects.update((data["id"], None) for data in item.payload["before"])
+            effects.update((data["id"], data) for data in item.payload["after"])
+    for task in changes.upserted:
+        data = task.to_dict()
+        if effects.get(task.id) != data:
+            records.append({"op": "task", "data": data})
+    records.extend(
+        {"op": "delete", "id": task_id}
+        for task_id in changes.deleted
+        if task_id not in effects or effects[task_id] is not None
+    )
+    records.extend({"op": "drop_history", "id": history_id} for history_id in changes.dropped_history)
+    return records
+
+
+def records_to_changes(records: list[JournalRecord]) -> ChangeSet:
+    """把其他写入方追加的日志记录转换为增量修改，同一任务只保留最终状态。"""
+    upserted: dict[str, Task] = {}
+    deleted: dict[str, None] = {}
+    changes = ChangeSet()
+
+    def upsert(task: Task) -> None:
+        upserted[task.id] = task
+        deleted.pop(task.id, None)
+
+    def delete(task_id: str) -> None:
+        upserted.pop(task_id, None)
+        deleted[task_id] = None
+
+    for record in records:
+        if record["op"] == "task":
+            upsert(Task.from_dict(record["data"]))
+        elif record["op"] == "delete":
+            delete(record["id"])
+        elif record["op"] == "history":
+            item = HistoryItem.from_dict(record["data"])
+            changes.history.append(item)
+            if item.payload is not None:
+                after, removed = event_changes(item.payload)
+                for task in after:
+                    upsert(task)
+                for task_id in removed:
+                    delete(task_id)
+        else:
+            changes.dropped_history.append(record["id"])
+    changes.upserted = list(upserted.values())
+    changes.deleted = list(deleted)
+    return changes
+
+
+def replay(
+    tasks: list[Task], history: list[HistoryItem], records: list[JournalRecord]
+) -> tuple[list[Task], list[HistoryItem]]:
+    """在快照之上按顺序应用日志记录；重复应用同一条记录不会改变结果。"""
+    tasks_by_id = {task.id: task for task in tasks}
+    seen_history = {item.id for item in history}
+    new_history: list[HistoryItem] = []
+    dropped: set[str] = set()
+    for record in records:
+        if record["op"] == "task":
+            task = Task.from_dict(record["data"])
+            tasks_by_id[task.id] = task
+        elif record["op"] == "delete":
+            tasks_by_id.pop(record["id"], None)
+        elif record["op"] == "history":
+            item = HistoryItem.from_dict(record["data"])
+            if item.payload is not None:
+                after, removed = event_changes(item.payload)
+                tasks_by_id.update((task.id, task) for task in after)
+                for task_id in removed:
+                    tasks_by_id.pop(task_id, None)
+            if item.id not in seen_history:
+                seen_history.add(item.id)
+                new_history.append(item)
+        elif record["op"] == "drop_history":
+            dropped.add(record["id"])
+    # 历史按最新在前保存
+    new_history.reverse()
+    history = new_history + history
+    if dropped:
+        history = [item for item in history if item.id not in dropped]
+    return list(tasks_by_id.values()), history
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from todo.storage.base import Storage, apply_changes, atomic_writer, diff_state
+from todo.storage.codecs import CODECS, detect_codec, read_revision
+from todo.storage.locking import file_lock
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Mapping, Sequence
+    from pathlib import Path
+
+    from todo._dataclass import HistoryItem, Task
+    from todo._typing import DataFormat
+    from todo.storage.base import ChangeSet
+
+
+class JsonStorage(Storage):
+    """单个文件保存全部任务与历史。
+
+    ``data_format`` 决定写入时使用的编码（见 ``todo.storage.codecs``）；
+    ``auto_detect`` 为真时读取按文件头识别格式，否则只按 ``data_format`` 读取。
+
+    文件头中的 ``revision`` 每次写入加一。``commit`` 在文件锁内比较磁盘上的版本号与上次读写时的
+    ``revision``：相同则直接写入完整状态，不同说明其他写入方改过文件，先按任务 id 合并再写入。
+    ``poll`` 先比较文件的修改时间与大小，变化后再读文件头中的版本号，确实被其他写入方修改才重新读取。
+    """
+
+    def __init__(self, path: Path, data_format: DataFormat = "json", auto_detect: bool = True):
+        self.path = path
+        self.data_format: DataFormat = data_format
+        self.auto_detect = auto_detect
+        self.revision = 0
+        self.signature: tuple[int, int] | None = None
+
+    def load(self) -> tuple[list[Task], list[HistoryItem]]:
+        with file_lock(self.path):
+            return self.read()
+
+    def files(self) -> list[Path]:
+        return [self.path]
+
+    def save(self, tasks: Collection[Task], history: Sequence[HistoryItem]) -> None:
+        """整体覆盖数据文件（格式转换、迁移、导出等），不做冲突检查。"""
+        with file_lock(self.path):
+            self.write(tasks, history, max(read_revision(self.path), self.revision) + 1)
+
+    def commit(
+        self, tasks: Collection[Task], history: Sequence[HistoryItem], changes: ChangeSet
+    ) -> tuple[list[Task], list[HistoryItem]] | None:
+        with file_lock(self.path):
+            disk_revision = read_revision(self.path)
+            merged = None
+            if disk_revision != self.revision:
+                merged = tasks, history = apply_changes(*self.read(), changes)
+            self.write(tasks, history, disk_revision + 1)
+        return merged
+
+    def poll(self, tasks: Mapping[str, Task], history: Iterable[HistoryItem]) -> ChangeSet | None:
+        signature = file_signature(self.path)
+        if signature == self.signature:
+            return None
+        self.signature = signature
+        with file_lock(self.path):
+            if read_revision(self.path) == self.revision:
+                return None
+            new_tasks, new_history = self.read()
+        return diff_state(tasks, history, new_tasks, new_history) or None
+
+    # 以下两个方法需要调用方持有文件锁
+    def read(self) -> tuple[list[Task], list[HistoryItem]]:
+        if not self.path.exists():
+            self.revision = 0
+            return [], []
+        self.revision = read_revision(self.path)
+        codec = detect_codec(self.path) if self.auto_detect else CODECS[self.data_format]
+        return codec.load(self.path)
+
+    def write(self, tasks: Collection[Task], history: Sequence[HistoryItem], revision: int) -> None:
+        with atomic_writer(self.path) as f:
+            CODECS[self.data_format].dump(f, tasks, history, revision)
+        self.revision = revision
+
+
+def file_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import datetime
+import io
+import json
+from typing import TYPE_CHECKING, Any
+
+from todo._dataclass import HistoryItem, Task
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+    from typing import BinaryIO
+
+    from todo._typing import JsonlHeader
+
+# JSON Lines 数据文件：首行为文件头，之后每行一个任务或一条历史记录
+FORMAT_NAME = "todo-jsonl"
+FORMAT_VERSION = 1
+HEADER_PREFIX = b'{"kind":"header"'
+
+
+def iter_jsonl(path: Path) -> Iterator[Task | HistoryItem]:
+    """逐行解析数据文件，边读边产出 Task / HistoryItem，不会先把整个文件转成字典列表。"""
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record: dict[str, Any] = json.loads(line)
+            kind = record.get("kind")
+            if kind == "task":
+                yield Task.from_dict(record)  # pyright: ignore[reportArgumentType]
+            elif kind == "history":
+                yield HistoryItem.from_dict(record)  # pyright: ignore[reportArgumentType]
+
+
+def load_jsonl(path: Path) -> tuple[list[Task], list[HistoryItem]]:
+    tasks: list[Task] = []
+    history: list[HistoryItem] = []
+    for record in iter_jsonl(path):
+        if isinstance(record, Task):
+            tasks.append(record)
+        else:
+            history.append(record)
+    return tasks, history
+
+
+def write_jsonl(f: BinaryIO, tasks: Iterable[Task], history: Iterable[HistoryItem], revision: int = 0) -> None:
+    """逐条写出记录，不在内存中拼出整个文件。"""
+    header: JsonlHeader = {
+        "kind": "header",
+        "format": FORMAT_NAME,
+        "version": FORMAT_VERSION,
+        "revision": revision,
+        "last_updated": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
+    }
+    out = io.TextIOWrapper(f, encoding="utf-8", newline="\n")
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    out.write(dumps(header) + "\n")
+    for task in tasks:
+        out.write(dumps({"kind": "task", **task.to_dict()}) + "\n")
+    for item in history:
+        out.write(dumps({"kind": "history", **item.to_dict()}) + "\n")
+    out.flush()
+    out.detach()
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import datetime
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from todo._dataclass import HistoryItem, Task
+from todo.storage.base import ChangeSet, QueryableStorage
+from todo.storage.json_file import JsonStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Mapping, Sequence
+
+    from todo._typing import TaskCategory
+
+# 未设置截止日期的任务排在最后，与 sort_tasks_by_due_date 一致
+DUE_KEY = "COALESCE(due_date, '9999-12-31')"
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    color TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    completed INTEGER NOT NULL,
+    completed_at TEXT,
+    due_date TEXT,
+    recurrence TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_open ON tasks (completed, task_type, {DUE_KEY}, created_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_completed ON tasks (completed, completed_at, created_at);
+CREATE TABLE IF NOT EXISTS history (
+    id TEXT PRIMARY KEY,
+    action TEXT NOT NULL,
+    task_description TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    task_id TEXT,
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp);
+"""
+
+TASK_COLUMNS = "id, task, task_type, color, created_at, completed, completed_at, due_date, recurrence"
+HISTORY_COLUMNS = "id, action, task_description, task_type, timestamp, task_id, payload"
+
+# 每个标签页对应的过滤条件与排序，均可由上面的索引直接满足
+CATEGORY_QUERIES: dict[TaskCategory, tuple[str, str]] = {
+    "daily": ("completed = 0 AND task_type = 'daily'", f"{DUE_KEY}, created_at"),
+    "weekly": ("completed = 0 AND task_type = 'weekly'", f"{DUE_KEY}, created_at"),
+    "monthly": ("completed = 0 AND task_type = 'monthly'", f"{DUE_KEY}, created_at"),
+    "completed": ("completed = 1", "completed_at DESC, created_at DESC"),
+}
+
+
+def task_to_row(task: Task) -> tuple[Any, ...]:
+    return (
+        task.id,
+        task.task,
+        task.task_type,
+        task.color,
+        task.created_at,
+        int(task.completed),
+        task.completed_at,
+        task.due_date,
+        task.recurrence,
+    )
+
+
+def row_to_task(row: sqlite3.Row) -> Task:
+    task = Task.from_dict(
+        {
+            "id": row["id"],
+            "task": row["task"],
+            "task_type": row["task_type"],
+            "color": row["color"],
+            "created_at": row["created_at"],
+            "completed": bool(row["completed"]),
+            "completed_at": row["completed_at"],
+            "due_date": row["due_date"],
+        }
+    )
+    task.recurrence = row["recurrence"]
+    return task
+
+
+def history_to_row(item: HistoryItem) -> tuple[Any, ...]:
+    payload = None if item.payload is None else json.dumps(item.payload, ensure_ascii=False, separators=(",", ":"))
+    return (item.id, item.action, item.task_description, item.task_type, item.timestamp, item.task_id, payload)
+
+
+def row_to_history(row: sqlite3.Row) -> HistoryItem:
+    item = HistoryItem.from_dict(
+        {
+            "id": row["id"],
+            "action": row["action"],
+            "task_description": row["task_description"],
+            "task_type": row["task_type"],
+            "timestamp": row["timestamp"],
+        }
+    )
+    item.task_id = row["task_id"]
+    if row["payload"] is not None:
+        item.payload = json.loads(row["payload"])
+    return item
+
+
+class SqliteStorage(QueryableStorage):
+    """SQLite 数据库后端。
+
+    标签页通过 ``query_tasks`` 直接走索引分页查询，不再把全部任务读入内存；
+    每次操作只在一个事务里更新受影响的行。
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Streamlit 会在不同线程中执行脚本，连接共享并由锁串行化
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            # 早期版本创建的数据库没有 recurrence 列与历史记录的事件列
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(tasks)")}
+            if "recurrence" not in columns:
+                self._conn.execute("ALTER TABLE tasks ADD COLUMN recurrence TEXT")
+            # 部分索引只包含未完成的重复任务，catch_up 无需扫描整张表
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_tasks_recurring ON tasks (due_date) "
+                "WHERE recurrence IS NOT NULL AND completed = 0"
+            )
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(history)")}
+            for column in ("task_id", "payload"):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE history ADD COLUMN {column} TEXT")
+            self.data_version: int = self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def load(self) -> tuple[list[Task], list[HistoryItem]]:
+        with self._lock:
+            tasks = [row_to_task(row) for row in self._conn.execute(f"SELECT {TASK_COLUMNS} FROM tasks")]
+            history = [
+                row_to_history(row)
+                for row in self._conn.execute(
+                    f"SELECT {HISTORY_COLUMNS} FROM history ORDER BY timestamp DESC, rowid DESC"
+                )
+            ]
+        return tasks, history
+
+    def save(self, tasks: Collection[Task], history: Sequence[HistoryItem]) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.execute("DELETE FROM history")
+            self._insert_tasks(tasks)
+            # 历史按最新在前传入，倒序插入使 rowid 与时间顺序一致
+            self._insert_history(reversed(history))
+
+    def commit(self, tasks: Collection[Task], history: Sequence[HistoryItem], changes: ChangeSet) -> None:
+        with self._lock, self._conn:
+            self._insert_tasks(changes.upserted)
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", [(task_id,) for task_id in changes.deleted])
+            self._insert_history(changes.history)
+            self._conn.executemany(
+                "DELETE FROM history WHERE id = ?", [(history_id,) for history_id in changes.dropped_history]
+            )
+
+    def query_tasks(self, category: TaskCategory, limit: int, offset: int = 0) -> list[Task]:
+        where, order_by = CATEGORY_QUERIES[category]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE {where} ORDER BY {order_by} LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [row_to_task(row) for row in rows]
+
+    def count_tasks(self, category: TaskCategory) -> int:
+        where, _ = CATEGORY_QUERIES[category]
+        with self._lock:
+            (count,) = self._conn.execute(f"SELECT COUNT(*) FROM tasks WHERE {where}").fetchone()
+        return count
+
+    def count_due(self, category: TaskCategory, thresholds: Sequence[int]) -> list[int]:
+        """每个分界一次范围计数，均由 idx_tasks_open 满足。"""
+        where, _ = CATEGORY_QUERIES[category]
+        dates = [datetime.date.fromordinal(day).isoformat() for day in thresholds]
+        with self._lock:
+            return [
+                self._conn.execute(f"SELECT COUNT(*) FROM tasks WHERE {where} AND {DUE_KEY} < ?", (date,)).fetchone()[0]
+                for date in dates
+            ]
+
+    def overdue_recurring(self, today_ord: int) -> list[Task]:
+        """由 idx_tasks_recurring 满足；没有截止日期的任务 ``due_date < ?`` 为假，不会返回。"""
+        today = datetime.date.fromordinal(today_ord).isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE recurrence IS NOT NULL AND completed = 0 AND due_date < ?",
+                (today,),
+            ).fetchall()
+        return [row_to_task(row) for row in rows]
+
+    def search_tasks(self, query: str, limit: int) -> list[Task]:
+        """逐词做子串匹配；SQLite 的 lower() 只处理 ASCII，中文本身无大小写之分。"""
+        terms = query.lower().split()
+        if not terms:
+            return []
+        where = " AND ".join(["instr(lower(task), ?) > 0"] * len(terms))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE {where} ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                (*terms, limit),
+            ).fetchall()
+        return [row_to_task(row) for row in rows]
+
+    def recent_history(self, limit: int) -> list[HistoryItem]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {HISTORY_COLUMNS} FROM history ORDER BY timestamp DESC, rowid DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [row_to_history(row) for row in rows]
+
+    def expired_history(self, max_items: int, cutoff: str) -> list[HistoryItem]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {HISTORY_COLUMNS} FROM history WHERE timestamp < ? OR rowid NOT IN "
+                "(SELECT rowid FROM history ORDER BY timestamp DESC, rowid DESC LIMIT ?) "
+                "ORDER BY timestamp DESC, rowid DESC",
+                (cutoff, max_items or -1),
+            ).fetchall()
+        return [row_to_history(row) for row in rows]
+
+    def delete_history(self, history_ids: Iterable[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM history WHERE id = ?", [(history_id,) for history_id in history_ids])
+
+    def poll(self, tasks: Mapping[str, Task], history: Iterable[HistoryItem]) -> ChangeSet | None:
+        """``data_version`` 在其他连接提交事务后改变；数据按需查询，内存中没有需要更新的记录。"""
+        with self._lock:
+            (version,) = self._conn.execute("PRAGMA data_version").fetchone()
+        if version == self.data_version:
+            return None
+        self.data_version = version
+        return ChangeSet()
+
+    def files(self) -> list[Path]:
+        return [self.path, self.path.with_name(self.path.name + "-wal")]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _insert_tasks(self, tasks: Iterable[Task]) -> None:
+        self._conn.executemany(
+            f"INSERT OR REPLACE INTO tasks ({TASK_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [task_to_row(task) for task in tasks],
+        )
+
+    def _insert_history(self, history: Iterable[HistoryItem]) -> None:
+        self._conn.executemany(
+            f"INSERT OR IGNORE INTO history ({HISTORY_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [history_to_row(item) for item in history],
+        )
+
+
+def migrate_json_to_sqlite(json_path: Path, db_path: Path) -> tuple[int, int]:
+    """把原有的 JSON 数据文件一次性导入 SQLite，返回导入的任务数与历史数。"""
+    tasks, history = JsonStorage(json_path).load()
+    storage = SqliteStorage(db_path)
+    try:
+        storage.save(tasks, history)
+    finally:
+        storage.close()
+    return len(tasks), len(history)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("用法: python -m todo.storage.sqlite <todo_data.json> <todo_data.sqlite3>")
+        sys.exit(1)
+    n_tasks, n_history = migrate_json_to_sqlite(Path(sys.argv[1]), Path(sys.argv[2]))
+    print(f"已迁移 {n_tasks} 个任务、{n_history} 条历史记录到 {sys.argv[2]}")
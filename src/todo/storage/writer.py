@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+from todo.storage.base import ChangeSet, QueryableStorage, Storage, apply_changes
+from todo.utils.metrics import span
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterable, Mapping, Sequence
+    from pathlib import Path
+
+    from todo._dataclass import HistoryItem, Task
+    from todo._typing import TaskCategory
+
+
+class WriteBehindStorage(Storage):
+    """在后台线程中延迟写入的包装后端。
+
+    ``commit``/``save`` 只记录待写入的状态后立即返回；后台线程在收到第一次修改后
+    等待 ``window`` 秒，把这段时间内的所有修改合并成一次写入。
+    进程退出前应调用 ``close``（或 ``flush``）把尚未落盘的修改写完。
+
+    写入在后台进行，与其他写入方的冲突由内层后端合并后写入文件；合并后的完整状态保存下来，
+    之后的写入都在它之上进行，直到调用方通过 ``take_merged`` 取走并替换内存中的数据。
+    ``poll`` 不会同步写入：有待写的修改或正在写入时直接跳过，其他写入方的修改在写入时合并。
+
+    包装可查询的后端时使用 ``QueryableWriteBehindStorage``，``open_storage`` 会按内层后端自动选择。
+    """
+
+    def __init__(self, inner: Storage, window: float = 0.2):
+        self.inner = inner
+        self.window = window
+        self.last_error: Exception | None = None
+        self._cond = threading.Condition()
+        # 取出待写状态与写入在同一把锁内完成，保证先提交的状态不会覆盖后提交的
+        self._write_lock = threading.Lock()
+        self._state: tuple[list[Task], list[HistoryItem]] | None = None
+        self._changes: ChangeSet | None = None
+        self._full_save = False
+        # 与其他写入方合并后、尚未交给调用方的完整状态，只在 _write_lock 内读写
+        self._merged: tuple[list[Task], list[HistoryItem]] | None = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="todo-write-behind", daemon=True)
+        self._thread.start()
+
+    def load(self) -> tuple[list[Task], list[HistoryItem]]:
+        self.flush()
+        return self.inner.load()
+
+    def save(self, tasks: Collection[Task], history: Sequence[HistoryItem]) -> None:
+        with self._cond:
+            self._state = (list(tasks), list(history))
+            self._changes = None
+            self._full_save = True
+            self._cond.notify()
+
+    def commit(self, tasks: Collection[Task], history: Sequence[HistoryItem], changes: ChangeSet) -> None:
+        with self._cond:
+            self._state = (list(tasks), list(history))
+            if not self._full_save:
+                if self._changes is None:
+                    self._changes = ChangeSet()
+                self._changes.merge(changes)
+            self._cond.notify()
+
+    def poll(self, tasks: Mapping[str, Task], history: Iterable[HistoryItem]) -> ChangeSet | None:
+        # 内存中尚未落盘的任务会被当成已被其他写入方删除，因此有待写的修改时不比较
+        if not self._write_lock.acquire(blocking=False):
+            return None
+        try:
+            if self._pending():
+                return None
+            return self.inner.poll(tasks, history)
+        finally:
+            self._write_lock.release()
+
+    def take_merged(self) -> tuple[list[Task], list[HistoryItem]] | None:
+        if not self._write_lock.acquire(blocking=False):
+            return None
+        try:
+            # 还有待写的修改时先不交出，写入时会把它们并入合并结果
+            if self._pending():
+                return None
+            merged, self._merged = self._merged, None
+            return merged
+        finally:
+            self._write_lock.release()
+
+    def files(self) -> list[Path]:
+        return self.inner.files()
+
+    def flush(self) -> None:
+        """同步写入所有待写的修改。"""
+        self._write_pending()
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        self.inner.close()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._state is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                # 等满合并窗口，期间的修改都并入这一次写入；close 会提前结束等待
+                deadline = time.monotonic() + self.window
+                while not self._closed and (remaining := deadline - time.monotonic()) > 0:
+                    self._cond.wait(remaining)
+            self._write_pending()
+
+    def _pending(self) -> bool:
+        with self._cond:
+            return self._state is not None
+
+    def _write_pending(self) -> None:
+        with self._write_lock:
+            with self._cond:
+                if self._state is None:
+                    return
+                (tasks, history), changes, full_save = self._state, self._changes, self._full_save
+                self._state, self._changes, self._full_save = None, None, False
+            self._write(tasks, history, changes, full_save)
+
+    def _write(self, tasks: list[Task], history: list[HistoryItem], changes: ChangeSet | None, full_save: bool) -> None:
+        try:
+            with span("storage.write_behind"):
+                if full_save or changes is None:
+                    self.inner.save(tasks, history)
+                    self._merged = None
+                else:
+                    # 调用方还没换成合并后的状态，它提交的完整状态缺少其他写入方的修改
+                    if self._merged is not None:
+                        tasks, history = apply_changes(*self._merged, changes)
+                    merged = self.inner.commit(tasks, history, changes)
+                    if merged is not None or self._merged is not None:
+                        self._merged = merged or (tasks, history)
+            self.last_error = None
+        except Exception as e:
+            # 由界面通过 last_error 提示
+            self.last_error = e
+
+
+class QueryableWriteBehindStorage(WriteBehindStorage, QueryableStorage):
+    """包装可查询后端的 ``WriteBehindStorage``，查询直接交给内层后端。"""
+
+    inner: QueryableStorage
+
+    def __init__(self, inner: QueryableStorage, window: float = 0.2):
+        super().__init__(inner, window)
+
+    # 查询前先写完积压的修改，保证读到自己刚提交的数据
+    def query_tasks(self, category: TaskCategory, limit: int, offset: int = 0) -> list[Task]:
+        self.flush()
+        return self.inner.query_tasks(category, limit, offset)
+
+    def count_tasks(self, category: TaskCategory) -> int:
+        self.flush()
+        return self.inner.count_tasks(category)
+
+    def count_due(self, category: TaskCategory, thresholds: Sequence[int]) -> list[int]:
+        self.flush()
+        return self.inner.count_due(category, thresholds)
+
+    def overdue_recurring(self, today_ord: int) -> list[Task]:
+        self.flush()
+        return self.inner.overdue_recurring(today_ord)
+
+    def search_tasks(self, query: str, limit: int) -> list[Task]:
+        self.flush()
+        return self.inner.search_tasks(query, limit)
+
+    def recent_history(self, limit: int) -> list[HistoryItem]:
+        self.flush()
+        return self.inner.recent_history(limit)
+
+    def expired_history(self, max_items: int, cutoff: str) -> list[HistoryItem]:
+        self.flush()
+        return self.inner.expired_history(max_items, cutoff)
+
+    def delete_history(self, history_ids: Iterable[str]) -> None:
+        self.flush()
+        self.inner.delete_history(history_ids)
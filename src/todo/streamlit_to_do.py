@@ -1,121 +1,81 @@
 from __future__ import annotations
 
 import datetime
-import json
+import html
+import time
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Iterable
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 from todo._dataclass import HistoryItem, Task
-from todo._dictionary import LANGUAGES
+from todo.locales import DEFAULT_LANGUAGE, available_languages
 
 if TYPE_CHECKING:
-    from todo._typing import TaskType
+    from todo._typing import DueStatus, TabKey, TaskCategory, TaskType
+    from todo.core import TaskStore
+    from todo.core.analytics import Analytics
+    from todo.core.importer import ImportReport
+    from todo.core.recurrence import Frequency
+    from todo.utils.metrics import RunMetrics
 from todo._dataclass import ToDoSettings
-from todo.styles.global_style import style
-from todo.utils.config import load_settings_file
-
-# Load settings
-settings: ToDoSettings = load_settings_file("todo.toml", ToDoSettings)
-
-
-# ========================
-# Filter Functions
-# ========================
-def filter_daily_tasks(task: Task) -> bool:
-    return task.task_type == "daily" and not task.completed
-
-
-def filter_weekly_tasks(task: Task) -> bool:
-    return task.task_type == "weekly" and not task.completed
-
-
-def filter_monthly_tasks(task: Task) -> bool:
-    return task.task_type == "monthly" and not task.completed
-
-
-def filter_completed_tasks(task: Task) -> bool:
-    return task.completed
-
-
-# ========================
-# Sorting Functions
-# ========================
-def sort_tasks_by_due_date(task: Task) -> tuple[datetime.date, datetime.datetime]:
-    """Sort key function for tasks - by due date (earliest first) then creation date (oldest first)"""
-    # Handle due_date (primary sort key)
-    if task.due_date is None:
-        due_date = datetime.date.max
-    else:
-        safe_time = safe_strptime(task.due_date, "%Y-%m-%d")
-        if safe_time is None:
-            # Fallback to max date if parsing fails
-            due_date = datetime.date.max
-        else:
-            due_date = safe_time.date()
-    # Handle created_at (secondary sort key)
-    created_at = safe_strptime(task.created_at, "%Y-%m-%d %H:%M") or datetime.datetime.min
-    return (due_date, created_at)
-
-
-def sort_completed_tasks(task: Task) -> tuple[datetime.datetime, datetime.datetime]:
-    completed_at = safe_strptime(task.completed_at, "%Y-%m-%d %H:%M") or datetime.datetime.min
-    created_at = safe_strptime(task.created_at, "%Y-%m-%d %H:%M") or datetime.datetime.min
-    return (completed_at, created_at)
-
-
-def sort_history_items(item: HistoryItem) -> datetime.datetime:
-    return safe_strptime(item.timestamp, "%Y-%m-%d %H:%M") or datetime.datetime.min
+from todo.core import CATEGORIES, Recurrence, StoreHolder, due_statuses, get_translator
+from todo.core.importer import import_tasks
+from todo.core.recurrence import FREQUENCIES
+from todo.storage import QueryableStorage, WriteBehindStorage
+from todo.styles.assets import inject_styles
+from todo.utils import metrics
+from todo.utils.config import load_settings_cached
+from todo.utils.metrics import span
+
+run_started = time.perf_counter()
+# Load settings：配置在进程内缓存，文件改变后自动重新加载
+try:
+    settings: ToDoSettings = load_settings_cached("todo.toml", ToDoSettings)
+except Exception as e:
+    st.error(f"Error loading settings: {e}")
+    st.stop()
+
+# 性能埋点：未启用时 span 只返回一个共享的空上下文
+metrics.REGISTRY.enabled = settings.metrics_enabled or settings.metrics_debug_panel
+run_metrics: RunMetrics | None = None
+if metrics.REGISTRY.enabled:
+    run_metrics = metrics.start_run(run_started)
+    metrics.record("load_settings", time.perf_counter() - run_started)
+
+
+def widget_count() -> int:
+    ctx = get_script_run_ctx()
+    return len(ctx.widget_ids_this_run) if ctx is not None else 0
+
+
+def end_run(data_files: Iterable[Path] = ()) -> None:
+    """结束本次运行并写出指标。st.rerun/st.stop 会中断脚本，保存数据后重跑、加载失败停止前都要先调用它。"""
+    if run_metrics is None or run_metrics.finished:
+        return
+    metrics.finish_run(run_metrics, widget_count(), metrics.total_size(data_files))
+    try:
+        if settings.metrics_file_path:
+            metrics.append_run(
+                run_metrics,
+                settings.metrics_file_path,
+                settings.metrics_file_max_kb * 1024,
+                settings.metrics_file_backups,
+            )
+        if settings.metrics_prometheus_path:
+            metrics.write_prometheus(settings.metrics_prometheus_path)
+    except OSError as e:
+        st.error(f"Error writing metrics: {e}")
 
 
 # ========================
 # Helper Functions
 # ========================
-def safe_strptime(date_string: str | None, format: str) -> datetime.datetime | None:
-    if not date_string:
-        return None
-    try:
-        return datetime.datetime.strptime(date_string, format)
-    except (ValueError, TypeError):
-        return None
-
-
-def t(key: str) -> str:
-    return LANGUAGES.get(st.session_state.get("language", "en"), {}).get(key, key)
-
-
-def get_due_date_info(task: Task, lang: str, today: datetime.date) -> str:
-    """返回任务的截止日期信息和状态"""
-    if task.completed:
-        if task.completed_at:
-            try:
-                completed_dt = datetime.datetime.strptime(task.completed_at, "%Y-%m-%d %H:%M")
-                completed_str = completed_dt.strftime("%Y-%m-%d %H:%M" if lang == "en" else "%Y年%m月%d日 %H:%M")
-                return f"✓ {t('Completed')} {completed_str}"
-            except (ValueError, TypeError):
-                return f"✓ {t('Completed')}"
-        else:
-            return f"✓ {t('Completed')}"
-    elif task.due_date:
-        try:
-            due_date_obj = datetime.datetime.strptime(task.due_date, "%Y-%m-%d").date()
-            days_diff = (due_date_obj - today).days
-            if days_diff < 0:
-                return f"🔥 {t('Overdue')} {-days_diff} {t('days')}"
-            elif days_diff == 0:
-                return f"⏰ {t('Due today')}"
-            elif days_diff <= 3:
-                return f"🗓️ {t('Due in')} {days_diff} {t('days')}"
-            else:
-                due_date_str = due_date_obj.strftime("%b %d, %Y" if lang == "en" else "%Y年%m月%d日")
-                return f"🗓️ {t('Due')} {due_date_str}"
-        except (ValueError, TypeError):
-            return f"🗓️ {task.due_date} (Invalid)"
-
-    return ""
+# 每次重跑按当前语言绑定一次翻译器，之后的词条查找只是一次字典查找
+t = get_translator(st.session_state.get("language", DEFAULT_LANGUAGE))
 
 
 # ========================
@@ -124,140 +84,35 @@ def get_due_date_info(task: Task, lang: str, today: datetime.date) -> str:
 DATA_FILE = Path(settings.history_file_path)
 
 
-# ========================
-# CSS Styling - 只保留布局相关的CSS
-# ========================
-def get_layout_css() -> str:
-    return """
-    <style>
-    /* --- Task Card Styling --- */
-    .task-card {
-        padding: 1rem 1.2rem;
-        border-radius: 8px;
-        margin-bottom: 1rem;
-        position: relative;
-        overflow: hidden;
-        transition: all 0.2s ease;
-    }
-    .task-card:hover {
-        transform: translateY(-1px);
-    }
-    .task-card.completed-card {
-        border-left-width: 4px;
-        border-left-style: solid;
-    }
-    .task-card .task-content {
-        font-size: 1rem;
-        font-weight: 500;
-        margin-bottom: 0.6rem;
-        word-wrap: break-word;
-        white-space: pre-wrap;
-    }
-    .task-card .task-content.completed {
-        text-decoration: line-through;
-        opacity: 0.8;
-    }
-    .task-card .meta-info {
-        font-size: 0.8rem;
-        margin-bottom: 0.8rem;
-        display: flex;
-        flex-wrap: wrap;
-        gap: 0.4rem 1rem;
-        align-items: center;
-    }
-    .meta-due-date {
-        display: inline-flex;
-        align-items: center;
-        gap: 0.3em;
-        white-space: nowrap;
-    }
-    /* --- Action Buttons Container --- */
-    .task-actions {
-        display: flex;
-        justify-content: flex-end;
-        align-items: center;
-        gap: 0.5rem;
-        padding-top: 0.5rem;
-    }
-    .task-actions .stButton>button {
-        padding: 0.25rem 0.6rem !important;
-        font-size: 0.85rem !important;
-        min-height: auto !important;
-        line-height: 1.3 !important;
-        border-radius: 5px !important;
-        width: auto;
-        min-width: 35px;
-        text-align: center;
-        transition: transform 0.1s ease;
-    }
-    .task-actions .stButton>button:hover {
-        transform: scale(1.05);
-    }
-    /* History item styling */
-    .history-item {
-        padding: 0.6rem 1rem;
-        margin-bottom: 0.5rem;
-        border-radius: 6px;
-        border-left: 3px solid;
-        font-size: 0.9rem;
-        transition: background-color 0.2s ease;
-    }
-    .history-item .action-text {
-        font-weight: 600;
-        margin-right: 0.4em;
-    }
-    .history-item .history-task-preview {
-        font-style: italic;
-        opacity: 0.9;
-    }
-    .history-meta {
-        font-size: 0.8rem;
-        opacity: 0.8;
-        margin-top: 0.2rem;
-    }
-    </style>
-    """
+@st.cache_resource(show_spinner=False)
+def get_store_holder() -> StoreHolder:
+    """每个进程只加载一次数据，所有会话共享同一个仓库、数据库连接与后台写入线程。"""
+    return StoreHolder()
 
 
 # ========================
 # Data Persistence
 # ========================
-def save_data(tasks: list[Task], history: list[HistoryItem]) -> None:
-    data = {
-        "tasks": [t.to_dict() for t in tasks],
-        "history": [h.to_dict() for h in history],
-        "last_updated": datetime.datetime.now().strftime("%Y-%m-%d %H:%M"),
-    }
+def run_action(action: Callable[..., object], *args: object) -> None:
+    """执行一次修改并重跑页面，持久化失败时提示错误。"""
     try:
-        DATA_FILE.parent.mkdir(exist_ok=True)
-        with DATA_FILE.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        with span("save_data"):
+            action(*args)
     except Exception as e:
         st.error(f"Error saving data: {e}")
-
-
-def load_data() -> tuple[list[Task], list[HistoryItem]]:
-    if DATA_FILE.exists():
-        try:
-            with DATA_FILE.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-                tasks = [Task.from_dict(t) for t in data.get("tasks", [])]
-                history = [HistoryItem.from_dict(h) for h in data.get("history", [])]
-                return tasks, history
-        except Exception as e:
-            st.error(f"Error loading data: {e}")
-    return [], []
+        return
+    end_run(store.storage.files())
+    st.rerun()
 
 
 # ========================
 # UI Components
 # ========================
-def display_task_list(tasks: list[Task], list_context: str, lang: str) -> None:
-    today = datetime.date.today()
-    for task in tasks:
+def display_task_list(tasks: list[Task], list_context: str, statuses: list[DueStatus | None] | None = None) -> None:
+    for i, task in enumerate(tasks):
         completed_class_card = "completed-card" if task.completed else ""
         card_style = f"background-color: {task.color}1A; border-left-color: {task.color if task.completed else ''};"
-        safe_task_desc = task.task
+        safe_task_desc = html.escape(task.task)
         completed_class_content = "completed" if task.completed else ""
 
         st.markdown(
@@ -274,10 +129,12 @@ def display_task_list(tasks: list[Task], list_context: str, lang: str) -> None:
             pass
 
         with col_meta:
-            due_info = get_due_date_info(task, lang, today)
+            due_info = t.task_info(task, today_ord)
             if due_info:
+                status = statuses[i] if statuses else None
+                status_class = f" due-{status}" if status else ""
                 st.markdown(
-                    f"<div class='meta-info'><span class='meta-due-date'>{due_info}</span></div>",
+                    f"<div class='meta-info'><span class='meta-due-date{status_class}'>{due_info}</span></div>",
                     unsafe_allow_html=True,
                 )
             else:
@@ -293,40 +150,87 @@ def display_task_list(tasks: list[Task], list_context: str, lang: str) -> None:
                     if st.button(
                         "✓", key=f"complete_{button_key_base}", help=t("mark_complete"), use_container_width=True
                     ):
-                        task.completed = True
-                        task.completed_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-                        st.session_state.history.insert(0, HistoryItem("Completed_action", task.task, task.task_type))
-                        save_data(st.session_state.tasks, st.session_state.history)
-                        st.rerun()
+                        run_action(store.complete, task)
                 else:
                     if st.button(
                         "↩", key=f"undo_{button_key_base}", help=t("mark_incomplete"), use_container_width=True
                     ):
-                        task.completed = False
-                        task.completed_at = None
-                        st.session_state.history.insert(0, HistoryItem("Uncompleted", task.task, task.task_type))
-                        save_data(st.session_state.tasks, st.session_state.history)
-                        st.rerun()
+                        run_action(store.uncomplete, task)
 
             with cols_buttons[1]:
                 if st.button("🗑️", key=f"delete_{button_key_base}", help=t("delete"), use_container_width=True):
-                    st.session_state.tasks = [t for t in st.session_state.tasks if t and t.id != task.id]
-                    st.session_state.history.insert(0, HistoryItem("Deleted", task.task, task.task_type))
-                    save_data(st.session_state.tasks, st.session_state.history)
-                    st.rerun()
+                    run_action(store.delete, task)
 
             st.markdown("</div>", unsafe_allow_html=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
 
+def display_task_page(category: TaskCategory) -> None:
+    """只把当前页的任务渲染成组件，渲染开销受 page_size 限制而与列表长度无关。"""
+    with span("tasks_in"):
+        total = store.count(category)
+    if total == 0:
+        st.info(f"🎉 {t('no_tasks')}")
+        return
+    page_size = settings.page_size or total
+    if isinstance(store.storage, QueryableStorage):
+        # 可查询的后端每次最多读取 query_limit 行，不分页时也按它分页
+        page_size = min(page_size, store.query_limit)
+    pages = -(-total // page_size)
+    page_key = f"page_{category}"
+    page = min(st.session_state.get(page_key, 0), pages - 1)
+    with span("tasks_in"):
+        tasks = store.tasks_in(category, page * page_size, (page + 1) * page_size)
+        # 列表按截止日期排序，本页各任务的截止状态由各状态的数量直接推出
+        counts = store.due_counts(category, today_ord)
+        statuses = due_statuses(counts, page * page_size, page * page_size + len(tasks))
+    if counts[0] or counts[1]:
+        st.caption(f"🔥 {counts[0]} {t('Overdue')} · ⏰ {counts[1]} {t('Due today')}")
+    with span("render_tasks"):
+        display_task_list(tasks, category, statuses)
+    if pages > 1:
+        col_prev, col_info, col_next = st.columns([1, 4, 1])
+        with col_prev:
+            st.button(
+                "◀",
+                key=f"prev_{page_key}",
+                help=t("prev_page"),
+                disabled=page == 0,
+                on_click=set_page,
+                args=(page_key, page - 1),
+                use_container_width=True,
+            )
+        with col_info:
+            st.caption(f"{page + 1} / {pages} · {total} {t('tasks_total')}")
+        with col_next:
+            st.button(
+                "▶",
+                key=f"next_{page_key}",
+                help=t("next_page"),
+                disabled=page == pages - 1,
+                on_click=set_page,
+                args=(page_key, page + 1),
+                use_container_width=True,
+            )
+
+
+def set_page(page_key: str, page: int) -> None:
+    st.session_state[page_key] = page
+
+
 def display_history_items(history_items: list[HistoryItem]) -> None:
-    for record in history_items[:30]:
+    for record in history_items:
         action_class = record.action.lower().replace("_", "-")
+        # 描述与任务类型可能来自导入的外部数据，写入 HTML 前转义
+        description = html.escape(record.task_description)
+        task_type = (
+            t(record.task_type) if record.task_type in ["daily", "weekly", "monthly"] else html.escape(record.task_type)
+        )
         st.markdown(
             f"""<div class='history-item history-{action_class}'>
                 <span class='action-text'>{t(record.action)}:</span>
-                <span class='history-task-preview'>"{record.task_description}"</span>
-                <div class='history-meta'>{t("task_type")}: {t(record.task_type) if record.task_type in ["daily", "weekly", "monthly"] else record.task_type} | {record.timestamp}</div>
+                <span class='history-task-preview'>"{description}"</span>
+                <div class='history-meta'>{t("task_type")}: {task_type} | {record.timestamp}</div>
             </div>""",
             unsafe_allow_html=True,
         )
@@ -335,20 +239,35 @@ def display_history_items(history_items: list[HistoryItem]) -> None:
 # ========================
 # Main Application
 # ========================
-# Initialize session state
-if "tasks" not in st.session_state:
-    st.session_state.tasks, st.session_state.history = load_data()
-    st.session_state.tasks.sort(key=sort_tasks_by_due_date)
-    st.session_state.history.sort(key=sort_history_items, reverse=True)
+# Shared store
+# 一次重跑内的“今天”，截止状态与重复任务都以它为准
+today_ord = datetime.date.today().toordinal()
+try:
+    with span("open_store"):
+        store = get_store_holder().get(settings)
+        # 其他进程改过数据文件时先把变化的记录合并进来；未修改时只需比较文件状态
+        store.refresh()
+        # 停机期间错过的重复任务移到最近一次，每天只检查一次
+        store.catch_up(today_ord)
+except Exception as e:
+    st.error(f"Error loading data: {e}")
+    end_run()
+    st.stop()
+# 本次渲染所依据的数据版本，定时检查发现版本变化时重跑整页
+st.session_state._seen_revision = store.revision
+if isinstance(store.storage, WriteBehindStorage) and store.storage.last_error is not None:
+    st.error(f"Error saving data: {store.storage.last_error}")
+if store.archive_error is not None:
+    st.error(f"Error archiving history: {store.archive_error}")
 
 if settings.as_package:
     pass
 else:
     st.set_page_config(page_title="✓ 轻简待办", page_icon="✓", layout="wide")
-    style()  # 应用全局样式
 
-# 应用布局CSS
-st.markdown(get_layout_css(), unsafe_allow_html=True)
+# 应用全局样式与布局CSS
+with span("styles"):
+    inject_styles(settings.font_source, settings.asset_delivery, standalone=not settings.as_package)
 
 # UI Layout
 with st.container():
@@ -358,15 +277,15 @@ with st.container():
     with cols[1]:
         st.selectbox(
             "Language/语言",
-            options=list(LANGUAGES.keys()),
-            format_func=lambda lang_code: "English" if lang_code == "en" else "中文",
+            options=available_languages(),
+            format_func=lambda lang_code: get_translator(lang_code)("language_name"),
             key="language",
             label_visibility="collapsed",
         )
     st.divider()
 
 # Sidebar
-with st.sidebar:
+with st.sidebar, span("sidebar"):
     st.header(f"{t('add_task')}")
     with st.form("add_task_form", clear_on_submit=True):
         task_desc = st.text_area(t("task_desc"), placeholder=t("task_placeholder"), key="new_task_desc")
@@ -387,47 +306,261 @@ with st.sidebar:
         due_date_option = st.date_input(
             t("due_date"), value=None, min_value=datetime.date.today(), key="new_task_due_date"
         )
+        col_r1, col_r2 = st.columns([2, 1])
+        with col_r1:
+            repeat_freq: Frequency | None = st.selectbox(
+                t("repeat"),
+                options=[None, *FREQUENCIES],
+                format_func=lambda freq: t(f"repeat_{freq}") if freq else t("repeat_none"),
+                key="new_task_repeat",
+            )
+        with col_r2:
+            repeat_interval = st.number_input(
+                t("repeat_interval"), min_value=1, max_value=365, value=1, step=1, key="new_task_repeat_interval"
+            )
         submitted = st.form_submit_button(f"✓ {t('add_task')}")
         if submitted and task_desc.strip():
+            recurrence = None
+            if repeat_freq is not None:
+                # 重复任务需要一个起始日期，未选择时从今天开始
+                due_date_option = due_date_option or datetime.date.today()
+                month_day = due_date_option.day if repeat_freq == "MONTHLY" else None
+                recurrence = Recurrence(repeat_freq, int(repeat_interval), month_day).text
             new_task = Task(
                 task=task_desc.strip(),
                 task_type=task_type,
                 color=task_color,
                 due_date=due_date_option.strftime("%Y-%m-%d") if due_date_option else None,
+                recurrence=recurrence,
             )
-            st.session_state.tasks.insert(0, new_task)
-            st.session_state.history.insert(0, HistoryItem("Added", new_task.task, new_task.task_type))
-            save_data(st.session_state.tasks, st.session_state.history)
-            st.rerun()
+            run_action(store.add, new_task)
+
+    with st.expander(f"📥 {t('import_tasks')}", expanded=False):
+        uploaded = st.file_uploader(t("import_file"), type=["csv", "json", "jsonl"], key="import_file")
+        if st.button(t("import_button"), key="import_button", disabled=uploaded is None) and uploaded is not None:
+            try:
+                with st.spinner(t("import_tasks")):
+                    st.session_state.import_report = import_tasks(
+                        store,
+                        uploaded,
+                        uploaded.name,
+                        workers=settings.import_workers,
+                        parallel_min_rows=settings.import_parallel_min_rows,
+                    )
+            except Exception as e:
+                st.error(f"Error saving data: {e}")
+            else:
+                end_run(store.storage.files())
+                st.rerun()
+        report: ImportReport | None = st.session_state.get("import_report")
+        if report is not None:
+            st.success(
+                t("import_summary").format(
+                    rows=report.rows,
+                    imported=report.imported,
+                    duplicates=report.duplicates,
+                    errors=len(report.errors),
+                    seconds=report.seconds,
+                    rate=report.rows_per_second,
+                )
+            )
+            if report.errors:
+                st.text("\n".join(f"{t('import_row')} {line_num}: {error}" for line_num, error in report.errors[:200]))
+
+
+# Undo / Redo
+def describe_event(item: HistoryItem) -> str:
+    return f'{t(item.action)}: "{item.task_description}"'
+
+
+def display_undo_redo() -> None:
+    """撤销、重做按钮，按钮上为可用的步数，连续点击即可逐步撤销或重做多次操作。"""
+    stack = store.undo_stack
+    col_undo, col_redo, _ = st.columns([1, 1, 8])
+    with col_undo:
+        if st.button(
+            f"↶ {len(stack.undo)}",
+            key="undo",
+            help=f"{t('undo')} · {describe_event(stack.undo[-1])}" if stack.undo else t("undo"),
+            disabled=not stack.undo,
+            use_container_width=True,
+        ):
+            run_action(store.undo)
+    with col_redo:
+        if st.button(
+            f"↷ {len(stack.redo)}",
+            key="redo",
+            help=f"{t('redo')} · {describe_event(stack.redo[-1])}" if stack.redo else t("redo"),
+            disabled=not stack.redo,
+            use_container_width=True,
+        ):
+            run_action(store.redo)
+
+
+# Analytics
+@st.cache_data(max_entries=4, show_spinner=False)
+def load_analytics(data_file: str, store_id: int, revision: int, day: int, _store: TaskStore) -> Analytics:
+    """统计结果按仓库与其 revision 缓存：数据未变化时切换标签或重跑只读取缓存。"""
+    from todo.core.analytics import compute_analytics
+
+    with span("analytics"):
+        tasks, history = _store.snapshot()
+        return compute_analytics(tasks, history, day)
+
+
+def display_analytics() -> None:
+    """图表只接收按天、按周或按分类聚合后的行，历史记录再多也不会拖慢前端。"""
+    from todo.core.analytics import relabel
+
+    analytics = load_analytics(str(DATA_FILE), id(store), store.revision, today_ord, store)
+    if analytics.empty:
+        st.info(t("no_history"))
+        return
+    labels = {
+        "completed": t("Completed_action"),
+        "added": t("Added"),
+        "median": t("median"),
+        "p90": t("p90"),
+        "mean": t("mean"),
+        "count": t("task_count"),
+        "overdue": t("overdue"),
+        "due": t("with_due_date"),
+        "rate": t("overdue_rate"),
+    }
+
+    def label(key: str) -> str:
+        return labels.get(key) or t(key)
+
+    col_done, col_latency, col_overdue = st.columns(3)
+    col_done.metric(t("completed_7d"), analytics.completed_7d)
+    col_latency.metric(t("median_latency"), f"{analytics.median_latency_days:.1f} {t('days')}")
+    col_overdue.metric(t("overdue_rate"), f"{analytics.overdue_share:.0%}")
+
+    st.subheader(t("throughput"))
+    by_week = st.radio(
+        t("throughput"),
+        options=[False, True],
+        format_func=lambda weekly: t("by_week") if weekly else t("by_day"),
+        horizontal=True,
+        key="analytics_by_week",
+        label_visibility="collapsed",
+    )
+    # 图表组件的参数类型包含未标注的 pandas 类型，严格模式下在调用处忽略
+    throughput = analytics.weekly if by_week else analytics.daily
+    st.bar_chart(relabel(throughput, label), stack=False)  # pyright: ignore[reportUnknownMemberType]
+
+    st.subheader(t("completion_latency"))
+    st.dataframe(relabel(analytics.latency, label), use_container_width=True)  # pyright: ignore[reportUnknownMemberType]
+
+    st.subheader(t("overdue_rate"))
+    st.bar_chart(  # pyright: ignore[reportUnknownMemberType]
+        relabel(analytics.overdue, label), y=t("overdue_rate"), horizontal=True
+    )
+
+
+# Search
+def display_search_results(query: str) -> None:
+    """搜索结果沿用任务卡片渲染，数量不超过一页。"""
+    with span("search"):
+        results = store.search(query, limit=settings.page_size or None)
+    if not results:
+        st.info(t("no_results"))
+        return
+    st.caption(f"{len(results)} {t('search_results')}")
+    with span("render_tasks"):
+        display_task_list(results, "search")
+
 
 # Main Tabs
-tab_keys = ["daily", "weekly", "monthly", "completed"]
-tabs = st.tabs([t(key) for key in tab_keys])
-task_filters: dict[str, Callable[[Task], bool]] = {
-    "daily": filter_daily_tasks,
-    "weekly": filter_weekly_tasks,
-    "monthly": filter_monthly_tasks,
-    "completed": filter_completed_tasks,
-}
-
-for i, key in enumerate(tab_keys):
-    with tabs[i]:
-        filtered_tasks = [task for task in st.session_state.tasks if task_filters[key](task)]
-
-        if key == "completed":
-            filtered_tasks.sort(key=sort_completed_tasks, reverse=True)
-        else:
-            filtered_tasks.sort(key=sort_tasks_by_due_date)
-
-        if not filtered_tasks:
-            st.info(f"🎉 {t('no_tasks')}")
-        else:
-            display_task_list(filtered_tasks, key, st.session_state.get("language", "en"))
-
-        if key == "completed":
-            st.markdown("---")
-            with st.expander(f"📜 {t('history')}", expanded=False):
-                if not st.session_state.history:
+def display_tab(key: TabKey) -> None:
+    if key == "analytics":
+        display_analytics()
+        return
+    display_task_page(key)
+    if key == "completed":
+        st.markdown("---")
+        with st.expander(f"📜 {t('history')}", expanded=False):
+            with span("history"):
+                history_items = store.recent_history(30)
+                if not history_items:
                     st.info(t("no_history"))
                 else:
-                    display_history_items(st.session_state.history)
+                    display_history_items(history_items)
+
+
+def tab_label(key: TabKey) -> str:
+    """标签文字是组件 ID 的一部分，只用固定的名称；数量变化时选中项才不会被重置。"""
+    return f"📊 {t(key)}" if key == "analytics" else t(key)
+
+
+def tab_counts(key: TaskCategory) -> str:
+    """任务数与逾期数都来自索引，不逐个检查任务。"""
+    overdue = store.due_counts(key, today_ord)[0]
+    return f"{t(key)} {store.count(key)}" + (f" 🔥{overdue}" if overdue else "")
+
+
+tab_keys: tuple[TabKey, ...] = (*CATEGORIES, "analytics") if settings.show_analytics else CATEGORIES
+if settings.undo_depth:
+    display_undo_redo()
+search_query = st.text_input(
+    t("search"), placeholder=t("search_placeholder"), key="search_query", label_visibility="collapsed"
+).strip()
+if search_query:
+    display_search_results(search_query)
+    st.divider()
+if settings.lazy_tabs:
+    # 只构建当前选中的分类；标签下方的数量来自索引，开销为 O(1)
+    # 选中项由组件的 key 保存；不传 index，否则它随选中项变化，组件 ID 改变后下一次点击会丢失。
+    # 侧边栏的操作在组件渲染前就 st.rerun，Streamlit 会清掉这次没有渲染的组件状态，因此另存一份用于恢复
+    if st.session_state.get("active_tab") not in tab_keys:
+        saved_tab = st.session_state.get("saved_tab")
+        st.session_state.active_tab = saved_tab if saved_tab in tab_keys else "daily"
+    active_tab = st.radio(
+        t("task_type"),
+        options=tab_keys,
+        format_func=tab_label,
+        key="active_tab",
+        horizontal=True,
+        label_visibility="collapsed",
+    )
+    st.session_state.saved_tab = active_tab
+    st.caption(" · ".join(tab_counts(key) for key in CATEGORIES))
+    display_tab(active_tab)
+else:
+    tabs = st.tabs([t(key) for key in tab_keys])
+    for i, key in enumerate(tab_keys):
+        with tabs[i]:
+            display_tab(key)
+
+
+# ========================
+# Live Sync
+# ========================
+def watch_data_file() -> None:
+    """定时运行：其他会话或其他进程修改过数据时重跑整页。"""
+    try:
+        store.refresh()
+    except Exception as e:
+        st.error(f"Error loading data: {e}")
+        return
+    if store.revision != st.session_state.get("_seen_revision"):
+        st.rerun()
+
+
+if settings.watch_interval_s:
+    st.fragment(run_every=settings.watch_interval_s)(watch_data_file)()
+
+
+# ========================
+# Metrics
+# ========================
+def display_metrics_panel(run: RunMetrics) -> None:
+    with st.sidebar, st.expander(f"⏱ {t('perf_panel')}", expanded=False):
+        st.caption(t("perf_summary").format(ms=run.seconds * 1e3, widgets=run.widgets, kib=run.data_bytes / 1024))
+        rows = sorted(run.totals.items(), key=lambda item: item[1], reverse=True)
+        st.text("\n".join(f"{name:<14}{run.counts[name]:>4} × {seconds * 1e3:>9.2f} ms" for name, seconds in rows))
+
+
+end_run(store.storage.files())
+if run_metrics is not None and settings.metrics_debug_panel:
+    display_metrics_panel(run_metrics)
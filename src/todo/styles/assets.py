@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from todo._dictionary import LANGUAGES
+from todo.styles.global_style import GLOBAL_CSS, GOOGLE_FONTS_IMPORT
+from todo.styles.layout import LAYOUT_CSS
+
+if TYPE_CHECKING:
+    from todo._typing import AssetDelivery, FontSource
+
+# Streamlit 从主脚本旁的 static 目录提供静态文件（需开启 server.enableStaticServing）
+STATIC_DIR = Path(__file__).parent.parent / "static"
+FONT_FILE = "fonts/NotoSansSC-subset.woff2"
+# 子集字体额外保留的字符：ASCII、常用中文标点与界面上的图标
+EXTRA_GLYPHS = "".join(chr(c) for c in range(0x20, 0x7F)) + "，。、；：？！“”‘’（）《》【】…—·✓↩◀▶"
+
+
+class Stylesheet:
+    """合并、压缩后的样式表，``digest`` 为内容哈希。"""
+
+    def __init__(self, css: str):
+        self.css = css
+        self.digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def file_name(self) -> str:
+        # Streamlit 把 .css 文件当作 text/plain 返回，浏览器不会将其作为样式表应用；
+        # 因此以 JSON 发布，由注入脚本读取后写入 <style>
+        return f"todo-{self.digest}.json"
+
+    def style_tag(self) -> str:
+        return f"<style>{self.css}</style>"
+
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.DOTALL)
+    css = re.sub(r"\s+", " ", css).replace(": ", ":")
+    return re.sub(r"\s*([{};,>])\s*", r"\1", css).replace(";}", "}").strip()
+
+
+def static_url(name: str, digest: str) -> str:
+    """静态文件的访问路径。带 ``v`` 参数时 Tornado 返回长期缓存的响应头，内容变化后哈希随之改变。"""
+    base = str(st.get_option("server.baseUrlPath") or "").strip("/")
+    return f"/{base + '/' if base else ''}app/static/{name}?v={digest}"
+
+
+def static_serving_enabled() -> bool:
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+@lru_cache(maxsize=1)
+def font_digest() -> str | None:
+    path = STATIC_DIR / FONT_FILE
+    if not path.exists():
+        return None
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+
+
+def font_css(font_source: FontSource, with_static: bool) -> str:
+    if font_source == "google":
+        return GOOGLE_FONTS_IMPORT
+    if font_source == "local" and with_static and (digest := font_digest()) is not None:
+        url = static_url(FONT_FILE, digest)
+        return (
+            "@font-face{font-family:'Noto Sans SC';font-style:normal;font-weight:300 700;"
+            f"font-display:swap;src:url('{url}') format('woff2')}}"
+        )
+    # system 或本地字体不可用时只使用系统字体，不发起任何外部请求
+    return ""
+
+
+@lru_cache(maxsize=8)
+def build_stylesheet(font_source: FontSource, with_static: bool, standalone: bool) -> Stylesheet:
+    """每个进程只拼接、压缩一次样式表。"""
+    parts = [GLOBAL_CSS, LAYOUT_CSS] if standalone else [LAYOUT_CSS]
+    return Stylesheet(font_css(font_source, with_static) + minify_css("".join(parts)))
+
+
+def publish(sheet: Stylesheet) -> bool:
+    """把样式表写入 static 目录；文件名含哈希，已存在时不重复写入。目录不可写时返回 False。"""
+    path = STATIC_DIR / sheet.file_name
+    if path.exists():
+        return True
+    try:
+        STATIC_DIR.mkdir(exist_ok=True)
+        for stale in STATIC_DIR.glob("todo-*.json"):
+            stale.unlink(missing_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"css": sheet.css}, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        return False
+    return True
+
+
+INJECT_SCRIPT = """
+<script>
+const doc = window.parent.document;
+const id = "todo-style-{digest}";
+if (!doc.getElementById(id)) {{
+  fetch(new URL({url}, window.parent.location.origin))
+    .then((response) => response.json())
+    .then((data) => {{
+      doc.querySelectorAll("style[id^='todo-style-']").forEach((el) => el.remove());
+      const style = doc.createElement("style");
+      style.id = id;
+      style.textContent = data.css;
+      doc.head.appendChild(style);
+    }});
+}}
+</script>
+"""
+
+
+def inject_styles(font_source: FontSource, delivery: AssetDelivery, standalone: bool = True) -> None:
+    """注入应用样式。
+
+    ``inline`` 每次重跑发送一段预先压缩好的 <style>（Streamlit 会移除未在本次重跑中输出的元素）。
+    ``static`` 每个会话只输出一次注入脚本：脚本从静态文件读取样式表并写入页面 <head>，
+    之后的重跑不再发送样式，浏览器按哈希长期缓存样式表与字体文件。
+    作为子项目嵌入（``standalone`` 为假）时只注入布局样式；主脚本不同，static 目录不可用，此时也使用 ``inline``。
+    """
+    with_static = standalone and static_serving_enabled()
+    sheet = build_stylesheet(font_source, with_static, standalone)
+    if delivery == "static" and with_static:
+        if st.session_state.get("_todo_style_digest") == sheet.digest:
+            return
+        if publish(sheet):
+            components.html(
+                INJECT_SCRIPT.format(digest=sheet.digest, url=json.dumps(static_url(sheet.file_name, sheet.digest))),
+                height=0,
+            )
+            st.session_state["_todo_style_digest"] = sheet.digest
+            return
+    st.markdown(sheet.style_tag(), unsafe_allow_html=True)
+
+
+def subset_font(source: Path, text: str = "") -> Path:
+    """把字体裁剪为界面文字、常用标点与 ``text`` 中出现的字符，输出 woff2 到 static 目录。需要 fonttools[woff]。"""
+    try:
+        subset: Any = importlib.import_module("fontTools.subset")
+    except ImportError as e:
+        raise SystemExit("需要安装 fonttools[woff]: pip install 'streamlib-to-do-list[fonts]'") from e
+
+    glyphs = set(EXTRA_GLYPHS + text)
+    for words in LANGUAGES.values():
+        for value in words.values():
+            glyphs.update(value)
+    output = STATIC_DIR / FONT_FILE
+    output.parent.mkdir(parents=True, exist_ok=True)
+    options: Any = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = ["*"]
+    font: Any = subset.load_font(str(source), options)
+    subsetter: Any = subset.Subsetter(options)
+    subsetter.populate(text="".join(sorted(glyphs)))
+    subsetter.subset(font)
+    subset.save_font(font, str(output), options)
+    return output
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m todo.styles.assets", description="生成本地子集字体")
+    parser.add_argument("font", type=Path, help="Noto Sans SC 等字体文件（.otf/.ttf）")
+    parser.add_argument("--text-file", type=Path, help="额外需要保留字符的文本文件，例如导出的任务描述")
+    args: Any = parser.parse_args(argv)
+    text = args.text_file.read_text(encoding="utf-8") if args.text_file else ""
+    output = subset_font(args.font, text)
+    print(
+        f'已生成 {output}（{output.stat().st_size / 1024:.0f} KiB），在 todo.toml 中设置 font_source = "local" 即可使用'
+    )
+
+
+if __name__ == "__main__":
+    main()
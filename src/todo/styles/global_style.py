@@ -2,23 +2,11 @@ from __future__ import annotations
 
 import streamlit as st
 
+GOOGLE_FONTS_IMPORT = (
+    "@import url('https://fonts.googleapis.com/css2?family=Noto+Sans+SC:wght@300;400;500;700&display=swap');"
+)
 
-def style(home: bool = False):  # 定义应用自定义字体的函数
-    if home:
-        st.set_page_config(
-            page_title="✓ 轻简待办",
-            page_icon="✓",
-            layout="wide",
-            menu_items={
-                "Get Help": "https://lab.xnnehang.top/audio",
-                "Report a bug": "https://github.com/MrXnneHang/MrXnneHang/issues",
-                "About": "#### @2024 XnneHang 版权所有",
-            },
-        )
-    st.markdown(
-        """
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Noto+Sans+SC:wght@300;400;500;700&display=swap');
+GLOBAL_CSS = """
         /* 全局样式 */
         body {
             font-family: 'Noto Sans SC', sans-serif;
@@ -324,7 +312,19 @@ def style(home: bool = False):  # 定义应用自定义字体的函数
             box-shadow: 0px 6px 10px rgba(0, 0, 0, 0.08);
             margin-top: -6px;
         }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+"""
+
+
+def style(home: bool = False):  # 定义应用自定义字体的函数
+    if home:
+        st.set_page_config(
+            page_title="✓ 轻简待办",
+            page_icon="✓",
+            layout="wide",
+            menu_items={
+                "Get Help": "https://lab.xnnehang.top/audio",
+                "Report a bug": "https://github.com/MrXnneHang/MrXnneHang/issues",
+                "About": "#### @2024 XnneHang 版权所有",
+            },
+        )
+    st.markdown(f"<style>{GOOGLE_FONTS_IMPORT}{GLOBAL_CSS}</style>", unsafe_allow_html=True)
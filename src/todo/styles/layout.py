@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+# 任务卡片与历史记录的布局样式
+LAYOUT_CSS = """
+    /* --- Task Card Styling --- */
+    .task-card {
+        padding: 1rem 1.2rem;
+        border-radius: 8px;
+        margin-bottom: 1rem;
+        position: relative;
+        overflow: hidden;
+        transition: all 0.2s ease;
+    }
+    .task-card:hover {
+        transform: translateY(-1px);
+    }
+    .task-card.completed-card {
+        border-left-width: 4px;
+        border-left-style: solid;
+    }
+    .task-card .task-content {
+        font-size: 1rem;
+        font-weight: 500;
+        margin-bottom: 0.6rem;
+        word-wrap: break-word;
+        white-space: pre-wrap;
+    }
+    .task-card .task-content.completed {
+        text-decoration: line-through;
+        opacity: 0.8;
+    }
+    .task-card .meta-info {
+        font-size: 0.8rem;
+        margin-bottom: 0.8rem;
+        display: flex;
+        flex-wrap: wrap;
+        gap: 0.4rem 1rem;
+        align-items: center;
+    }
+    .meta-due-date {
+        display: inline-flex;
+        align-items: center;
+        gap: 0.3em;
+        white-space: nowrap;
+    }
+    .meta-due-date.due-overdue {
+        color: #FF3B30;
+        font-weight: 600;
+    }
+    .meta-due-date.due-today {
+        color: #FF9500;
+        font-weight: 600;
+    }
+    /* --- Action Buttons Container --- */
+    .task-actions {
+        display: flex;
+        justify-content: flex-end;
+        align-items: center;
+        gap: 0.5rem;
+        padding-top: 0.5rem;
+    }
+    .task-actions .stButton>button {
+        padding: 0.25rem 0.6rem !important;
+        font-size: 0.85rem !important;
+        min-height: auto !important;
+        line-height: 1.3 !important;
+        border-radius: 5px !important;
+        width: auto;
+        min-width: 35px;
+        text-align: center;
+        transition: transform 0.1s ease;
+    }
+    .task-actions .stButton>button:hover {
+        transform: scale(1.05);
+    }
+    /* History item styling */
+    .history-item {
+        padding: 0.6rem 1rem;
+        margin-bottom: 0.5rem;
+        border-radius: 6px;
+        border-left: 3px solid;
+        font-size: 0.9rem;
+        transition: background-color 0.2s ease;
+    }
+    .history-item .action-text {
+        font-weight: 600;
+        margin-right: 0.4em;
+    }
+    .history-item .history-task-preview {
+        font-style: italic;
+        opacity: 0.9;
+    }
+    .history-meta {
+        font-size: 0.8rem;
+        opacity: 0.8;
+        margin-top: 0.2rem;
+    }
+"""
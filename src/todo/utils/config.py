@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import os
 import platform
+import threading
 
 # if sys.version_info >= (3, 11):
 import tomllib  # Python 3.11+ 自带
@@ -59,10 +61,55 @@ def load_settings_file(
     with settings_file.open("r", encoding="utf-8") as f:
         settings_raw: Any = tomllib.loads(f.read())
     validated_settings = setting.model_validate(settings_raw)
-    write_settings_file(settings_name=setting_name, settings=validated_settings)
+    if validated_settings.model_dump() != settings_raw:
+        # 只有缺少字段或需要补全默认值时才写回，避免每次加载都改写文件
+        write_settings_file(settings_name=setting_name, settings=validated_settings)
     return validated_settings
 
 
+class CachedSettings:
+    def __init__(self, path: Path, settings: ToDoSettings):
+        self.path = path
+        self.settings = settings
+        stat = path.stat()
+        self.signature = (stat.st_mtime_ns, stat.st_size)
+        self.digest = hashlib.sha256(path.read_bytes()).digest()
+
+
+# 以配置文件的绝对路径为键：工作目录改变后相对路径相同的文件也不会混用
+_settings_cache: dict[tuple[Path, type[ToDoSettings]], CachedSettings] = {}
+_settings_lock = threading.Lock()
+
+
+def load_settings_cached(
+    setting_name: str,
+    setting: type[ToDoSettings],
+) -> ToDoSettings:
+    """跨重跑、跨会话复用已校验的配置。
+
+    每次调用只 stat 一次配置文件：mtime 与大小都没变时直接返回缓存；
+    变了再比较内容哈希，内容确实改变才重新解析和校验，修改配置无需重启即可生效。
+    """
+    with _settings_lock:
+        settings_file = search_for_settings_file(setting_name=setting_name)
+        if settings_file is not None:
+            path = settings_file.resolve()
+            cached = _settings_cache.get((path, setting))
+            if cached is not None:
+                stat = path.stat()
+                if (stat.st_mtime_ns, stat.st_size) == cached.signature:
+                    return cached.settings
+                if hashlib.sha256(path.read_bytes()).digest() == cached.digest:
+                    cached.signature = (stat.st_mtime_ns, stat.st_size)
+                    return cached.settings
+        settings = load_settings_file(setting_name, setting)
+        settings_file = search_for_settings_file(setting_name=setting_name)
+        if settings_file is not None:
+            path = settings_file.resolve()
+            _settings_cache[(path, setting)] = CachedSettings(path, settings)
+        return settings
+
+
 def write_settings_file(settings_name: str, settings: ToDoSettings) -> None:
     """将 Setting 对象写入 TOML 文件。"""
     settings_file = search_for_settings_file(setting_name=settings_name)
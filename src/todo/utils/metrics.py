@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import datetime
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from contextlib import AbstractContextManager
+    from types import TracebackType
+    from typing import Self
+
+# 直方图的桶上界（秒），覆盖从单次字典查找到整页重跑的耗时范围
+BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+
+class Registry:
+    """进程内的指标汇总：各计时区间的耗时直方图与若干仪表值，可导出为 Prometheus 文本格式。
+
+    ``enabled`` 为假时 ``span`` 直接返回一个共享的空上下文，埋点本身几乎没有开销。
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.lock = threading.Lock()
+        self.spans: dict[str, Histogram] = {}
+        self.gauges: dict[str, float] = {}
+        self.reruns = 0
+
+    def observe(self, name: str, seconds: float) -> None:
+        with self.lock:
+            histogram = self.spans.get(name)
+            if histogram is None:
+                histogram = self.spans[name] = Histogram()
+            histogram.observe(seconds)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        with self.lock:
+            self.gauges[name] = value
+
+    def clear(self) -> None:
+        with self.lock:
+            self.spans.clear()
+            self.gauges.clear()
+            self.reruns = 0
+
+    def prometheus(self) -> str:
+        lines = [
+            "# HELP todo_span_seconds Time spent in instrumented phases.",
+            "# TYPE todo_span_seconds histogram",
+        ]
+        with self.lock:
+            for name, histogram in sorted(self.spans.items()):
+                cumulative = 0
+                for bound, count in zip((*BUCKETS, "+Inf"), histogram.buckets, strict=True):
+                    cumulative += count
+                    lines.append(f'todo_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'todo_span_seconds_sum{{span="{name}"}} {histogram.sum:.6f}')
+                lines.append(f'todo_span_seconds_count{{span="{name}"}} {histogram.count}')
+            lines += ["# HELP todo_reruns_total Completed script runs.", "# TYPE todo_reruns_total counter"]
+            lines.append(f"todo_reruns_total {self.reruns}")
+            for name, value in sorted(self.gauges.items()):
+                lines += [f"# TYPE todo_{name} gauge", f"todo_{name} {value:g}"]
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+NULL_SPAN = nullcontext()
+
+
+class RunMetrics:
+    """一次脚本运行中各区间的累计耗时与次数。"""
+
+    def __init__(self, started: float | None = None):
+        self.started = time.perf_counter() if started is None else started
+        self.totals: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.widgets = 0
+        self.data_bytes = 0
+        self.seconds = 0.0
+        self.finished = False
+
+    def add(self, name: str, seconds: float) -> None:
+        self.totals[name] = self.totals.get(name, 0.0) + seconds
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "timestamp": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "total_ms": round(self.seconds * 1e3, 3),
+            "widgets": self.widgets,
+            "data_bytes": self.data_bytes,
+            "spans": {
+                name: {"count": self.counts[name], "ms": round(seconds * 1e3, 3)}
+                for name, seconds in self.totals.items()
+            },
+        }
+
+
+# Streamlit 在各自的线程中运行每个会话的脚本，当前运行通过上下文变量区分
+_current_run: ContextVar[RunMetrics | None] = ContextVar("todo_current_run", default=None)
+
+
+class Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> Self:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self, exc_type: type[BaseException] | None, exc: BaseException | None, traceback: TracebackType | None
+    ) -> None:
+        record(self.name, time.perf_counter() - self.start)
+
+
+def record(name: str, seconds: float) -> None:
+    """计入进程汇总，并计入当前脚本运行（如果有）。"""
+    REGISTRY.observe(name, seconds)
+    run = _current_run.get()
+    if run is not None:
+        run.add(name, seconds)
+
+
+def span(name: str) -> AbstractContextManager[object]:
+    """计时一个区间，未启用时返回空上下文。"""
+    if not REGISTRY.enabled:
+        return NULL_SPAN
+    return Span(name)
+
+
+def start_run(started: float | None = None) -> RunMetrics:
+    run = RunMetrics(started)
+    _current_run.set(run)
+    return run
+
+
+def finish_run(run: RunMetrics, widgets: int, data_bytes: int) -> None:
+    run.seconds = time.perf_counter() - run.started
+    run.finished = True
+    run.widgets = widgets
+    run.data_bytes = data_bytes
+    _current_run.set(None)
+    REGISTRY.observe("rerun", run.seconds)
+    with REGISTRY.lock:
+        REGISTRY.reruns += 1
+    REGISTRY.set_gauge("widgets_last_run", widgets)
+    REGISTRY.set_gauge("data_file_bytes", data_bytes)
+
+
+def total_size(paths: Iterable[Path]) -> int:
+    return sum(path.stat().st_size for path in paths if path.exists())
+
+
+@lru_cache(maxsize=4)
+def metrics_log(path: str, max_bytes: int, backups: int) -> RotatingFileHandler:
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    return RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8", delay=True)
+
+
+def append_run(run: RunMetrics, path: str, max_bytes: int, backups: int) -> None:
+    """把一次运行的指标追加为一行 JSON，文件超过 ``max_bytes`` 时轮转。"""
+    line = json.dumps(run.to_dict(), ensure_ascii=False, separators=(",", ":"))
+    metrics_log(path, max_bytes, backups).handle(logging.makeLogRecord({"msg": line}))
+
+
+def write_prometheus(path: str) -> None:
+    """先写临时文件再替换，抓取方（如 node_exporter 的 textfile 收集器）不会读到写了一半的文件。"""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    tmp.write_text(REGISTRY.prometheus(), encoding="utf-8")
+    tmp.replace(target)
@@ -0,0 +1,86 @@
+# pyright: reportMissingTypeStubs=false, reportUnknownMemberType=false, reportUnknownVariableType=false, reportUnknownArgumentType=false
+from __future__ import annotations
+
+import datetime
+import math
+import pickle
+import statistics
+from collections import Counter
+
+from todo._dataclass import MINUTES_PER_DAY, HistoryItem, Task
+from todo.bench.data import BASE_DATE, generate_tasks
+from todo.core.analytics import TASK_TYPES, compute_analytics, relabel
+
+TODAY = BASE_DATE.toordinal()
+
+
+def is_late(task: Task) -> bool:
+    if task.due_ord is None:
+        return False
+    if task.completed_min is not None:
+        return task.completed_min // MINUTES_PER_DAY > task.due_ord
+    return not task.completed and task.due_ord < TODAY
+
+
+def test_analytics_match_brute_force():
+    tasks, history = generate_tasks(2000, seed=3)
+    result = compute_analytics(tasks, history, TODAY)
+
+    completed_days = Counter(item.ts_min // MINUTES_PER_DAY for item in history if item.action == "Completed_action")
+    daily = result.daily
+    assert len(daily) == (daily.index[-1] - daily.index[0]).days + 1
+    for date, count in zip(daily.index, daily["completed"], strict=True):
+        assert count == completed_days[date.date().toordinal()]
+    assert result.weekly["added"].sum() == sum(item.action == "Added" for item in history)
+    assert all(date.weekday() == 0 for date in result.weekly.index)
+    assert result.completed_7d == sum(n for day, n in completed_days.items() if TODAY - 7 < day <= TODAY)
+
+    for task_type in TASK_TYPES:
+        days = [
+            (task.completed_min - task.created_min) / MINUTES_PER_DAY
+            for task in tasks
+            if task.task_type == task_type and task.completed and task.completed_min is not None
+        ]
+        row = result.latency.loc[task_type]
+        assert row["count"] == len(days)
+        assert math.isclose(row["median"], statistics.median(days))
+
+        dated = [task for task in tasks if task.task_type == task_type and task.due_ord is not None]
+        late = [task for task in dated if is_late(task)]
+        assert result.overdue.loc[task_type, "due"] == len(dated)
+        assert result.overdue.loc[task_type, "overdue"] == len(late)
+
+    # 只保存聚合后的结果，缓存体积与任务数无关
+    assert len(pickle.dumps(result)) < 64 * 1024
+
+
+def test_analytics_empty():
+    result = compute_analytics([], [], datetime.date.today().toordinal())
+    assert result.empty
+    assert result.daily.empty and result.weekly.empty
+    assert result.latency["count"].sum() == 0
+    assert result.overdue_share == 0.0
+
+
+def test_analytics_skips_unparsed_times():
+    item, broken = HistoryItem("Completed_action", "a", "daily"), HistoryItem("Added", "b", "daily")
+    broken.timestamp = "not a time"
+    task, unparsed = Task("a"), Task("b")
+    unparsed.created_at = "not a time"
+    for done in (task, unparsed):
+        done.completed = True
+        done.completed_min = done.created_min + 2 * MINUTES_PER_DAY if done.created_min else MINUTES_PER_DAY
+    result = compute_analytics([task, unparsed], [item, broken], datetime.date.today().toordinal())
+    assert broken.ts_min == unparsed.created_min == 0
+    assert len(result.daily) == 1
+    assert result.daily["added"].sum() == 0
+    assert result.latency.loc["daily", "count"] == 1
+    assert result.median_latency_days == 2.0
+
+
+def test_relabel_keeps_dates():
+    tasks, history = generate_tasks(50, seed=1)
+    result = compute_analytics(tasks, history, TODAY)
+    assert list(relabel(result.daily, str.upper).columns) == ["COMPLETED", "ADDED"]
+    assert relabel(result.daily, str.upper).index.equals(result.daily.index)
+    assert list(relabel(result.overdue, str.upper).index) == ["DAILY", "WEEKLY", "MONTHLY"]
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from todo.styles import assets
+from todo.styles.assets import Stylesheet, build_stylesheet, minify_css, publish
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_minify_css_keeps_rules():
+    css = "/* 注释 */\n.a > .b {\n    color: red;\n    margin: 0 1px;\n}\n@media (max-width: 600px) { .a { top: 0; } }"
+    assert minify_css(css) == ".a>.b{color:red;margin:0 1px}@media (max-width:600px){.a{top:0}}"
+
+
+def test_stylesheet_digest_follows_font_source():
+    google = build_stylesheet("google", False, True)
+    system = build_stylesheet("system", False, True)
+    assert "fonts.googleapis.com" in google.css
+    assert "fonts.googleapis.com" not in system.css
+    assert google.digest != system.digest
+    assert build_stylesheet("system", False, True) is system
+    assert ".task-card" in build_stylesheet("system", False, False).css
+
+
+def test_publish_writes_hashed_file_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(assets, "STATIC_DIR", tmp_path / "static")
+    old, new = Stylesheet(".a{color:red}"), Stylesheet(".a{color:blue}")
+    assert publish(old)
+    assert publish(new)
+    assert [p.name for p in (tmp_path / "static").iterdir()] == [new.file_name]
+    assert json.loads((tmp_path / "static" / new.file_name).read_text()) == {"css": ".a{color:blue}"}
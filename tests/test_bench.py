@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from todo.bench import compare, generate_tasks, run
+from todo.bench.runner import Recorder, bench_app
+from todo.storage import JsonStorage
+from todo.storage.codecs import read_revision
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_generate_tasks_is_deterministic():
+    tasks, history = generate_tasks(500, seed=3)
+    again, _ = generate_tasks(500, seed=3)
+    assert len(tasks) == 500
+    assert [t.raw_fields for t in tasks] == [t.raw_fields for t in again]
+    assert any(t.completed for t in tasks) and any(not t.completed for t in tasks)
+    assert [h.ts_min for h in history] == sorted((h.ts_min for h in history), reverse=True)
+
+
+def test_run_and_compare():
+    results = run([200], formats=["json", "binary"])
+    names = {(r["name"], r["variant"]) for r in results["results"]}
+    assert {
+        ("save", "binary"),
+        ("load", "json"),
+        ("filter_sort", "completed"),
+        ("search", "cjk"),
+        ("app_run", "warm"),
+    } <= names
+
+    assert compare(results, results) == []
+    slower = {"results": [{**r, "min_s": r["min_s"] * 2} for r in results["results"]]}
+    assert len(compare(slower, results)) == len(results["results"])
+
+
+def test_app_run_uses_its_own_unchanged_data(tmp_path: Path):
+    tasks, history = generate_tasks(1500, seed=1)
+    recorder = Recorder()
+    bench_app(recorder, len(tasks), tmp_path, tasks, history)
+    assert [(r["name"], r["variant"]) for r in recorder.results] == [("app_run", "cold"), ("app_run", "warm")]
+    # 数据文件独立于 --formats 写出，整页运行不会整理历史而改写它
+    data_file = tmp_path / "app-1500" / "config" / "todo_data.json"
+    assert read_revision(data_file) == 1
+    assert len(JsonStorage(data_file).load()[1]) == len(history)
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import threading
+from typing import TYPE_CHECKING
+
+import pytest
+
+from todo._dataclass import Task
+from todo.core import TaskStore
+from todo.storage import JournalStorage, JsonStorage, WriteBehindStorage
+from todo.storage.codecs import read_revision
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from pathlib import Path
+
+    from todo.storage import Storage
+
+BACKENDS: dict[str, Callable[[Path], Storage]] = {
+    "json": lambda path: JsonStorage(path),
+    "binary": lambda path: JsonStorage(path, data_format="binary"),
+    "jsonl": lambda path: JsonStorage(path, data_format="jsonl"),
+    "journal": lambda path: JournalStorage(path, checkpoint_interval=7),
+}
+
+
+@pytest.mark.parametrize("backend", list(BACKENDS))
+def test_concurrent_writers_merge_by_task_id(tmp_path: Path, backend: str):
+    """每个写入方有自己的内存副本，同时增删改同一个数据文件，任何一方的修改都不能丢失。"""
+    path = tmp_path / "data.bin"
+    writers, ops = 8, 20
+    expected: dict[str, bool] = {}
+    deleted: set[str] = set()
+    history_count = 0
+    lock = threading.Lock()
+
+    def writer(n: int) -> None:
+        nonlocal history_count
+        store = TaskStore(BACKENDS[backend](path))
+        mine: list[Task] = []
+        for i in range(ops):
+            task = Task(f"{n}-{i}")
+            store.add(task)
+            mine.append(task)
+            results = {task.id: False}
+            actions = 1
+            if i % 3 == 2:
+                store.complete(mine[-2])
+                results[mine[-2].id] = True
+                actions += 1
+            if i % 5 == 4:
+                store.delete(mine[-3])
+                deleted.add(mine[-3].id)
+                actions += 1
+            with lock:
+                expected.update(results)
+                history_count += actions
+            # 自己的修改总是可见
+            assert store.get(task.id) is not None
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    tasks, history = BACKENDS[backend](path).load()
+    assert {t.id: t.completed for t in tasks} == {k: v for k, v in expected.items() if k not in deleted}
+    assert len(history) == len({h.id for h in history}) == history_count
+    if backend != "journal":
+        assert read_revision(path) == history_count
+
+
+WRITER = """
+import sys
+from todo._dataclass import Task
+from todo.core import TaskStore
+from todo.storage import JsonStorage
+
+store = TaskStore(JsonStorage(__import__("pathlib").Path(sys.argv[1])))
+for i in range(40):
+    store.add(Task(f"{sys.argv[2]}-{i}"))
+"""
+
+
+def test_concurrent_processes(tmp_path: Path):
+    path = tmp_path / "data.json"
+    processes = [subprocess.Popen([sys.executable, "-c", WRITER, str(path), str(n)]) for n in range(4)]
+    assert [process.wait() for process in processes] == [0] * 4
+    tasks, history = JsonStorage(path).load()
+    assert sorted(t.task for t in tasks) == sorted(f"{n}-{i}" for n in range(4) for i in range(40))
+    assert len(history) == 160
+
+
+def test_revision_survives_format_round_trip(tmp_path: Path):
+    for data_format in ("json", "json-compact", "jsonl", "binary"):
+        path = tmp_path / f"data.{data_format}"
+        storage = JsonStorage(path, data_format=data_format)
+        storage.save([Task("a")], [])
+        storage.save([Task("b")], [])
+        assert read_revision(path) == storage.revision == 2
+        assert [t.task for t in JsonStorage(path).load()[0]] == ["b"]
+
+
+def test_write_behind_keeps_merged_state(tmp_path: Path):
+    """后台写入与其他写入方冲突时，合并结果要交回仓库，之后的写入不能覆盖掉对方的修改。"""
+    path = tmp_path / "data.json"
+    writer = WriteBehindStorage(JsonStorage(path), window=60)
+    ours = TaskStore(writer)
+    ours.add(Task("a1"))
+    writer.flush()
+    theirs = TaskStore(JsonStorage(path))
+    theirs.add(Task("b1"))
+
+    ours.add(Task("a2"))
+    writer.flush()
+    # 合并后还有待写的修改：先写完并入合并结果，再交给仓库
+    ours.add(Task("a3"))
+    assert not ours.refresh()
+    writer.flush()
+    assert ours.refresh()
+    assert sorted(t.task for t in ours.tasks) == ["a1", "a2", "a3", "b1"]
+    assert not ours.refresh()
+
+    ours.add(Task("a4"))
+    ours.close()
+    tasks, history = JsonStorage(path).load()
+    assert sorted(t.task for t in tasks) == ["a1", "a2", "a3", "a4", "b1"]
+    assert len(history) == 5
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+from todo._dataclass import ToDoSettings
+from todo.core import StoreHolder
+from todo.storage import JsonStorage
+from todo.utils.config import load_settings_cached, load_settings_file, toml_dumps
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_settings_written_back_only_when_defaults_are_filled(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    settings_file = tmp_path / "config" / "todo.toml"
+    settings_file.write_text("page_size = 10\n")
+    assert load_settings_file("todo.toml", ToDoSettings).page_size == 10
+    assert "lazy_tabs" in settings_file.read_text()
+
+    os.utime(settings_file, ns=(0, 0))
+    load_settings_file("todo.toml", ToDoSettings)
+    assert settings_file.stat().st_mtime_ns == 0
+
+
+def test_cached_settings_reload_only_on_content_change(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    settings_file = tmp_path / "config" / "todo.toml"
+    settings_file.write_text(toml_dumps(ToDoSettings.model_validate({}).model_dump()))
+
+    first = load_settings_cached("todo.toml", ToDoSettings)
+    assert load_settings_cached("todo.toml", ToDoSettings) is first
+    # 只改 mtime、内容不变时不重新解析
+    os.utime(settings_file, ns=(1, 1))
+    assert load_settings_cached("todo.toml", ToDoSettings) is first
+
+    settings_file.write_text(settings_file.read_text().replace("page_size = 50", "page_size = 7"))
+    reloaded = load_settings_cached("todo.toml", ToDoSettings)
+    assert reloaded is not first
+    assert reloaded.page_size == 7
+
+
+def test_cached_settings_follow_working_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    defaults = toml_dumps(ToDoSettings.model_validate({}).model_dump())
+    for name, page_size in (("one", "11"), ("two", "22")):
+        settings_file = tmp_path / name / "config" / "todo.toml"
+        settings_file.parent.mkdir(parents=True)
+        settings_file.write_text(defaults.replace("page_size = 50", f"page_size = {page_size}"))
+        # 相对路径、mtime 与大小都相同，只有所在目录不同
+        os.utime(settings_file, ns=(1, 1))
+
+    monkeypatch.chdir(tmp_path / "one")
+    assert load_settings_cached("todo.toml", ToDoSettings).page_size == 11
+    monkeypatch.chdir(tmp_path / "two")
+    assert load_settings_cached("todo.toml", ToDoSettings).page_size == 22
+
+
+def test_store_holder_reopens_only_for_store_settings(tmp_path: Path):
+    holder = StoreHolder()
+    settings = ToDoSettings.model_validate({"history_file_path": str(tmp_path / "data.json")})
+    store = holder.get(settings)
+    assert holder.get(settings.model_copy(update={"page_size": 5})) is store
+    moved = holder.get(settings.model_copy(update={"history_file_path": str(tmp_path / "other.json")}))
+    assert moved is not store
+    assert isinstance(moved.storage, JsonStorage)
+    assert moved.storage.path == tmp_path / "other.json"
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import datetime
+
+from todo._dataclass import HistoryItem, Task, minutes_to_datetime, parse_date, parse_minutes
+
+
+def test_task_round_trip_keeps_strings():
+    data = Task("task", due_date="2025-04-01").to_dict()
+    data.update(created_at="2025-03-27 16:08", completed=True, completed_at="2025-03-28 09:05")
+    task = Task.from_dict(data)
+    assert task.due_ord == datetime.date(2025, 4, 1).toordinal()
+    assert minutes_to_datetime(task.created_min) == datetime.datetime(2025, 3, 27, 16, 8)
+    assert task.to_dict() == data
+
+
+def test_task_keeps_unparseable_values():
+    data = Task("task").to_dict()
+    data.update(created_at="yesterday", due_date="2025-13-01")
+    task = Task.from_dict(data)
+    assert (task.created_min, task.due_ord) == (0, None)
+    assert task.to_dict() == data
+    task.due_date = "2025-12-01"
+    assert task.to_dict()["due_date"] == "2025-12-01"
+
+
+def test_history_item_round_trip():
+    data = HistoryItem("Added", "task", "daily").to_dict()
+    data["timestamp"] = "2025-03-27 16:08"
+    assert HistoryItem.from_dict(data).to_dict() == data
+
+
+def test_parsers_reject_malformed_input():
+    assert parse_date("2025-4-1") is None
+    assert parse_minutes("2025-04-01 24:00") is None
+    assert parse_minutes(None) is None
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from todo import locales
+from todo._dataclass import Task
+from todo.core import Translator, get_translator
+from todo.locales import available_languages, load_catalog
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_catalogs_share_keys():
+    assert available_languages()[0] == "en"
+    assert {lang: set(load_catalog(lang)) for lang in available_languages()} == {
+        lang: set(load_catalog("en")) for lang in available_languages()
+    }
+
+
+def test_new_language_loads_lazily_with_fallback(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    (tmp_path / "en.json").write_text(json.dumps({"title": "Title", "days": "days"}))
+    (tmp_path / "de.json").write_text(json.dumps({"title": "Titel"}))
+    monkeypatch.setattr(locales, "LOCALES_DIR", tmp_path)
+    available_languages.cache_clear()
+    load_catalog.cache_clear()
+    try:
+        assert available_languages() == ("en", "de")
+        assert load_catalog.cache_info().currsize == 0
+        translator = Translator("de")
+        assert (translator("title"), translator("days"), translator("missing")) == ("Titel", "days", "missing")
+    finally:
+        available_languages.cache_clear()
+        load_catalog.cache_clear()
+
+
+def test_translator_memoizes_formatted_dates():
+    translator = get_translator("zh")
+    task = Task("a", due_date="2025-03-20")
+    today = 739_320  # 2025-03-10
+    first = translator.task_info(task, today)
+    assert first == "🗓️ 截止于 2025年03月20日"
+    assert translator.task_info(Task("b", due_date="2025-03-20"), today) is first
+    # 换日后相对天数重新计算
+    assert translator.task_info(task, today + 8) == "🗓️ 还剩 2 天"
+    task.completed, task.completed_at = True, "2025-03-09 08:05"
+    assert translator.task_info(task, today) == "✓ 完成于 2025年03月09日 08:05"
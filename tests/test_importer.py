@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import io
+import json
+from typing import TYPE_CHECKING
+
+from todo._dataclass import Task, format_date
+from todo.core import TaskStore
+from todo.core.importer import import_tasks, normalize_due_date, normalize_row
+from todo.storage import JournalStorage, JsonStorage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CSV = """title,type,color,due
+Write report,weekly,#f00,2025/03/01
+写周报,每周,00ff00,2025年3月2日
+  write   REPORT ,Weekly,,2025-03-01
+,daily,,
+Bad type,yearly,,
+Bad color,daily,red,
+Bad date,daily,,2025-02-30
+Existing,daily,,
+"""
+
+
+def test_import_csv_validates_dedupes_and_commits_once(tmp_path: Path):
+    storage = JournalStorage(tmp_path / "data.json")
+    store = TaskStore(storage)
+    store.add(Task("existing"))
+
+    report = import_tasks(store, io.BytesIO(CSV.encode()), "export.csv")
+    assert (report.rows, report.imported, report.duplicates) == (8, 2, 2)
+    assert [line for line, _ in report.errors] == [5, 6, 7, 8]
+
+    imported = {t.task: t for t in store.tasks}
+    assert imported["Write report"].color == "#FF0000"
+    assert imported["Write report"].due_date == "2025-03-01"
+    assert (imported["写周报"].task_type, imported["写周报"].color) == ("weekly", "#00FF00")
+    assert [(h.action, h.task_description) for h in store.recent_history(1)] == [("Imported", "2 × export.csv")]
+    # 每次操作只追加一条事件记录，导入的任务都在事件载荷中，重放即可恢复
+    assert len(storage.journal_path.read_text().splitlines()) == 1 + 1
+    assert len(JournalStorage(tmp_path / "data.json").load()[0]) == 3
+
+
+def test_import_json_and_jsonl(tmp_path: Path):
+    store = TaskStore(JsonStorage(tmp_path / "data.json"))
+    records = [{"task": "a", "due_date": format_date(739000)}, {"task": "b", "task_type": "monthly"}, "oops"]
+    report = import_tasks(store, io.BytesIO(json.dumps({"tasks": records}).encode()), "tasks.json")
+    assert (report.imported, report.errors) == (2, [(3, "记录不是对象")])
+
+    lines = [{"kind": "header"}, {"kind": "task", "task": "c"}, {"kind": "history", "action": "Added"}]
+    data = "\n".join(json.dumps(line) for line in lines).encode()
+    report = import_tasks(store, io.BytesIO(data), "tasks.jsonl", dry_run=True)
+    assert (report.rows, report.imported) == (1, 1)
+    assert sorted(t.task for t in store.tasks) == ["a", "b"]
+
+    top_levels: list[object] = [3, "x", None, {"tasks": 3}, {"items": []}]
+    for top_level in top_levels:
+        report = import_tasks(store, io.BytesIO(json.dumps(top_level).encode()), "tasks.json")
+        assert report.imported == 0
+        assert [line for line, _ in report.errors] == [1]
+
+
+def test_import_in_process_pool_keeps_row_order(tmp_path: Path):
+    store = TaskStore(JsonStorage(tmp_path / "data.json"))
+    rows = "".join(f"task {i},daily,,\n" if i % 7 else f"task {i},bogus,,\n" for i in range(200))
+    report = import_tasks(
+        store,
+        io.BytesIO(("task,type,color,due\n" + rows).encode()),
+        "big.csv",
+        workers=2,
+        chunk_size=16,
+        parallel_min_rows=32,
+    )
+    assert report.imported == 200 - 29
+    assert [line for line, _ in report.errors] == [i + 2 for i in range(0, 200, 7)]
+    assert [t.task for t in store.tasks_in("daily", 0, 3)] == ["task 1", "task 2", "task 3"]
+
+
+def test_normalize_row_accepts_interface_labels():
+    assert normalize_row(1, {"Task": "x", "分类": "日常", "颜色": "#abc"}) == (1, "x", "daily", "#AABBCC", None)
+
+
+def test_normalize_due_date_rejects_trailing_text():
+    assert normalize_due_date("2025年3月1日") == normalize_due_date("20250301") > 0
+    assert normalize_due_date("2025-03-01garbage") == -1
+    assert normalize_row(2, {"task": "x", "due_date": "2025-03-01<script>"})[1] == "无效的截止日期: 2025-03-01<script>"
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import datetime
+import random
+from typing import TYPE_CHECKING
+
+from todo._dataclass import Task
+from todo.core import (
+    CATEGORIES,
+    DUE_STATUSES,
+    TaskIndex,
+    TaskStore,
+    due_statuses,
+    filter_completed_tasks,
+    filter_daily_tasks,
+    filter_monthly_tasks,
+    filter_weekly_tasks,
+    sort_completed_tasks,
+    sort_tasks_by_due_date,
+)
+from todo.storage import SqliteStorage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+FILTERS = {
+    "daily": filter_daily_tasks,
+    "weekly": filter_weekly_tasks,
+    "monthly": filter_monthly_tasks,
+    "completed": filter_completed_tasks,
+}
+
+
+def expected(tasks: list[Task], category: str) -> list[str]:
+    selected = [task for task in tasks if FILTERS[category](task)]
+    if category == "completed":
+        selected.sort(key=sort_completed_tasks, reverse=True)
+    else:
+        selected.sort(key=sort_tasks_by_due_date)
+    return [task.id for task in selected]
+
+
+def make_task(rng: random.Random) -> Task:
+    task = Task("task", task_type=rng.choice(["daily", "weekly", "monthly"]))
+    task.due_date = rng.choice([None, f"2025-04-{rng.randint(1, 28):02d}"])
+    task.created_min += rng.randint(-10_000, 0)
+    return task
+
+
+def test_index_matches_filter_and_sort_after_mutations():
+    rng = random.Random(0)
+    tasks = [make_task(rng) for _ in range(200)]
+    index = TaskIndex(tasks)
+    for _ in range(500):
+        op = rng.random()
+        if op < 0.3:
+            task = make_task(rng)
+            tasks.append(task)
+            index.add(task)
+        elif op < 0.5 and tasks:
+            task = tasks.pop(rng.randrange(len(tasks)))
+            index.remove(task)
+        elif tasks:
+            task = rng.choice(tasks)
+            index.remove(task)
+            task.completed = not task.completed
+            task.completed_min = task.created_min + rng.randint(0, 5) if task.completed else None
+            index.add(task)
+
+    assert len(index) == len(tasks)
+    for category in CATEGORIES:
+        assert [task.id for task in index.bucket(category)] == expected(tasks, category)
+
+
+def test_index_lookup_and_discard():
+    task = Task("task")
+    index = TaskIndex([task])
+    assert index.get(task.id) is task
+    assert index.discard(Task("other")) is False
+    assert index.discard(task) is True
+    assert task.id not in index
+
+
+def due_status(task: Task, today_ord: int) -> str | None:
+    if task.due_ord is None:
+        return None
+    days = task.due_ord - today_ord
+    return "overdue" if days < 0 else "today" if days == 0 else "soon" if days <= 3 else "later"
+
+
+def test_due_counts_follow_mutations_and_rollover():
+    rng = random.Random(1)
+    tasks = [make_task(rng) for _ in range(300)]
+    index = TaskIndex(tasks)
+    for today in range(1, 29):
+        today_ord = datetime.date(2025, 4, today).toordinal()
+        for _ in range(10):
+            task = rng.choice(tasks)
+            index.remove(task)
+            task.completed = not task.completed
+            index.add(task)
+        for category in CATEGORIES:
+            bucket = index.bucket(category)
+            counts = index.due_counts(category, today_ord)
+            if category == "completed":
+                assert counts == (0, 0, 0, 0)
+                continue
+            assert counts == tuple(sum(due_status(t, today_ord) == s for t in bucket) for s in DUE_STATUSES)
+            assert due_statuses(counts, 5, 40) == [due_status(t, today_ord) for t in bucket[5:40]]
+
+
+def test_due_counts_from_sqlite_match_index(tmp_path: Path):
+    rng = random.Random(2)
+    tasks = [make_task(rng) for _ in range(200)]
+    today_ord = datetime.date(2025, 4, 10).toordinal()
+    store = TaskStore(SqliteStorage(tmp_path / "data.sqlite3"))
+    store.add_many(tasks, "test")
+    index = TaskIndex(tasks)
+    for category in CATEGORIES:
+        assert store.due_counts(category, today_ord) == index.due_counts(category, today_ord)
+    store.close()
+
+
+def test_sqlite_pages_past_query_limit(tmp_path: Path):
+    rng = random.Random(4)
+    tasks = [make_task(rng) for _ in range(300)]
+    store = TaskStore(SqliteStorage(tmp_path / "data.sqlite3"), query_limit=50)
+    store.add_many(tasks, "test")
+    index = TaskIndex(tasks)
+    for category in CATEGORIES:
+        bucket = [t.id for t in index.bucket(category)]
+        assert store.count(category) == len(bucket)
+        assert [t.id for t in store.tasks_in(category, 60, 80)] == bucket[60:80]
+        # 每次查询最多 query_limit 行
+        assert len(store.tasks_in(category, 0, 200)) == min(len(bucket), 50)
+    store.close()
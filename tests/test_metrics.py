@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+
+from todo.utils import metrics
+from todo.utils.metrics import NULL_SPAN, REGISTRY, span
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+def test_span_is_noop_when_disabled():
+    REGISTRY.clear()
+    assert span("load") is NULL_SPAN
+    with span("load"):
+        pass
+    assert REGISTRY.spans == {}
+
+
+def test_spans_recorded_per_run_and_exported(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(REGISTRY, "enabled", True)
+    REGISTRY.clear()
+    run = metrics.start_run()
+    for _ in range(3):
+        with span("render"):
+            pass
+    with span("save"):
+        pass
+    data = tmp_path / "data.json"
+    data.write_text("x" * 100)
+    metrics.finish_run(run, widgets=7, data_bytes=metrics.total_size([data, tmp_path / "missing"]))
+    with span("outside_run"):
+        pass
+
+    assert run.counts == {"render": 3, "save": 1}
+    assert run.data_bytes == 100
+    text = REGISTRY.prometheus()
+    assert 'todo_span_seconds_count{span="render"} 3' in text
+    assert 'todo_span_seconds_bucket{span="save",le="+Inf"} 1' in text
+    assert 'todo_span_seconds_count{span="outside_run"} 1' in text
+    assert "todo_reruns_total 1" in text
+    assert "todo_widgets_last_run 7" in text
+
+    log = tmp_path / "metrics.jsonl"
+    for _ in range(20):
+        metrics.append_run(run, str(log), max_bytes=1024, backups=2)
+    record = json.loads(log.read_text().splitlines()[-1])
+    assert record["widgets"] == 7
+    assert record["spans"]["render"]["count"] == 3
+    assert sorted(p.name for p in tmp_path.glob("metrics.jsonl*")) == [
+        "metrics.jsonl",
+        "metrics.jsonl.1",
+        "metrics.jsonl.2",
+    ]
+    REGISTRY.clear()
+
+
+def test_runs_that_save_data_are_recorded(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """保存数据后脚本以 st.rerun 结束，这次运行也要写入指标文件。"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    from todo.bench.runner import SCRIPT
+
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "todo.toml").write_text('metrics_enabled = true\nmetrics_file_path = "metrics.jsonl"\n')
+    monkeypatch.chdir(tmp_path)
+    # 脚本会打开全局埋点开关，测试结束后恢复
+    monkeypatch.setattr(REGISTRY, "enabled", False)
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(SCRIPT), default_timeout=30).run()
+    at.sidebar.text_area[0].input("task")
+    at.sidebar.button[0].click().run()
+    assert not at.exception
+    st.cache_resource.clear()
+    # 首次运行、点击添加后保存并重跑的运行、重跑
+    assert len((tmp_path / "metrics.jsonl").read_text(encoding="utf-8").splitlines()) == 3
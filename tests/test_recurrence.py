@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+import pytest
+
+from todo._dataclass import Task
+from todo.core import Recurrence, TaskStore, get_due_date_info, parse_rule
+from todo.storage import JournalStorage, JsonStorage, SqliteStorage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def d(text: str) -> int:
+    return datetime.date.fromisoformat(text).toordinal()
+
+
+def test_next_occurrence():
+    weekly = Recurrence("WEEKLY", 2)
+    assert weekly.next_after(d("2025-03-03"), d("2025-03-01")) == d("2025-03-17")
+    assert weekly.next_after(d("2025-03-03"), d("2025-04-01")) == d("2025-04-14")
+    # 按月重复保持每月 31 日，短月份取月末而不漂移
+    monthly = Recurrence("MONTHLY", 1, 31)
+    assert monthly.next_after(d("2025-01-31"), d("2025-01-31")) == d("2025-02-28")
+    assert monthly.next_after(d("2025-02-28"), d("2025-02-28")) == d("2025-03-31")
+    assert Recurrence("MONTHLY", 3).next_after(d("2025-01-15"), d("2025-05-20")) == d("2025-07-15")
+
+
+def test_catch_up_is_closed_form():
+    assert Recurrence("DAILY").catch_up(d("2020-01-01"), d("2025-01-01")) == (d("2025-01-01"), 1827)
+    assert Recurrence("WEEKLY").catch_up(d("2025-01-06"), d("2025-01-20")) == (d("2025-01-20"), 2)
+    assert Recurrence("MONTHLY", 1, 31).catch_up(d("2024-01-31"), d("2025-03-30")) == (d("2025-02-28"), 13)
+    assert Recurrence("DAILY").catch_up(d("2025-01-06"), d("2025-01-01")) == (d("2025-01-06"), 0)
+
+
+def test_parse_rule_round_trip():
+    rule = Recurrence("MONTHLY", 2, 15)
+    assert rule.text == "FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=15"
+    parsed = parse_rule(rule.text)
+    assert parsed is not None and (parsed.freq, parsed.interval, parsed.month_day) == ("MONTHLY", 2, 15)
+    assert parse_rule("FREQ=YEARLY") is None
+    assert parse_rule("garbage") is None
+
+
+@pytest.mark.parametrize("backend", ["json", "binary", "journal", "sqlite"])
+def test_completing_recurring_task_materializes_next(tmp_path: Path, backend: str):
+    def open_storage():
+        if backend == "sqlite":
+            return SqliteStorage(tmp_path / "data.sqlite3")
+        if backend == "journal":
+            return JournalStorage(tmp_path / "data.json")
+        return JsonStorage(tmp_path / "data.json", data_format="binary" if backend == "binary" else "json")
+
+    today = datetime.date.today()
+    store = TaskStore(open_storage())
+    task = Task("water plants", "weekly", due_date=today.isoformat(), recurrence="FREQ=WEEKLY;INTERVAL=1")
+    store.add(task)
+    store.complete(task)
+    store.close()
+
+    reloaded = TaskStore(open_storage())
+    (done,) = reloaded.tasks_in("completed")
+    (following,) = reloaded.tasks_in("weekly")
+    assert done.id == task.id and done.recurrence is None
+    assert following.task == "water plants" and following.recurrence == "FREQ=WEEKLY;INTERVAL=1"
+    assert following.due_ord == today.toordinal() + 7
+    assert "🔁" in get_due_date_info(following, "en", today)
+    reloaded.close()
+
+
+def test_store_catch_up_moves_missed_occurrences(tmp_path: Path):
+    store = TaskStore(JsonStorage(tmp_path / "data.json"))
+    daily = Task("stretch", due_date="2024-01-01", recurrence="FREQ=DAILY;INTERVAL=1")
+    once = Task("one-off", due_date="2024-01-01")
+    store.add(daily)
+    store.add(once)
+    assert store.catch_up(d("2025-01-01")) == 366
+    assert store.catch_up(d("2025-01-01")) == 0
+    assert daily.due_date == "2025-01-01" and once.due_date == "2024-01-01"
+    assert [t.task for t in store.tasks_in("daily")] == ["one-off", "stretch"]
+    assert TaskStore(JsonStorage(tmp_path / "data.json")).get(daily.id).due_date == "2025-01-01"  # pyright: ignore[reportOptionalMemberAccess]
+
+
+def test_sqlite_catch_up_queries_only_overdue_recurring(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    storage = SqliteStorage(tmp_path / "data.sqlite3")
+    store = TaskStore(storage)
+    daily = Task("stretch", due_date="2024-01-01", recurrence="FREQ=DAILY;INTERVAL=1")
+    upcoming = Task("review", due_date="2025-06-01", recurrence="FREQ=WEEKLY;INTERVAL=1")
+    store.add(daily)
+    store.add(upcoming)
+    store.add(Task("one-off", due_date="2024-01-01"))
+
+    def full_load() -> None:
+        raise AssertionError("catch_up 不应读取全部任务")
+
+    monkeypatch.setattr(storage, "load", full_load)
+    assert [t.id for t in storage.overdue_recurring(d("2025-01-01"))] == [daily.id]
+    assert store.catch_up(d("2025-01-01")) == 366
+    assert [t.due_date for t in store.tasks_in("daily")] == ["2024-01-01", "2025-01-01", "2025-06-01"]
+    store.close()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from functools import partial
+from typing import TYPE_CHECKING
+
+from todo._dataclass import Task
+from todo.bench.data import generate_tasks
+from todo.bench.runner import SEARCH_LIMIT, SEARCH_QUERIES, measure
+from todo.core import SearchIndex, TaskStore, store as store_module, tokenize
+from todo.core.search import created_at
+from todo.storage import JsonStorage, SqliteStorage
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    import pytest
+
+
+def test_tokenize_mixes_words_and_cjk_bigrams():
+    assert tokenize("Buy MILK 买牛奶") == {"buy", "milk", "买", "牛", "奶", "买牛", "牛奶"}
+
+
+def test_search_matches_words_and_cjk_phrases():
+    milk, bread, scattered = Task("Buy milk 买牛奶"), Task("buy bread 买面包"), Task("牛奶 ... 买牛")
+    index = SearchIndex([milk, bread, scattered])
+    assert {t.id for t in index.search("BUY")} == {milk.id, bread.id}
+    assert [t.id for t in index.search("buy 牛奶")] == [milk.id]
+    assert {t.id for t in index.search("奶")} == {milk.id, scattered.id}
+    # 两字词元都命中但片段不连续的任务会被排除
+    assert [t.id for t in index.search("买牛奶")] == [milk.id]
+    assert index.search("cheese") == index.search("   ") == []
+
+    index.remove(milk)
+    assert index.search("milk") == []
+    assert "milk" not in index.postings
+
+
+def test_search_beats_linear_scan():
+    """耗时的绝对值由 bench 中的 search 项记录；这里只要求与逐条扫描相比快一个数量级。"""
+    tasks, _ = generate_tasks(50_000, seed=1)
+    index = SearchIndex(tasks)
+    by_time = sorted(tasks, key=created_at, reverse=True)
+    for query in SEARCH_QUERIES.values():
+        terms = query.split()
+        results = index.search(query, limit=SEARCH_LIMIT)
+        assert results == index.search(query)[:SEARCH_LIMIT]
+        assert results == [t for t in by_time if all(term in t.task for term in terms)][:SEARCH_LIMIT]
+        # 逐条扫描必须看完全部任务才能得到完整结果，与索引一样取前 limit 条
+        scan, _ = measure(lambda: [t for t in by_time if all(term in t.task for term in terms)][:SEARCH_LIMIT], 5)
+        best, _ = measure(partial(index.search, query, SEARCH_LIMIT), 5)
+        assert best * 10 < scan, query
+
+
+def test_search_orders_by_creation_time():
+    # 文件中的顺序与创建时间无关
+    old, new, same_minute = Task("report"), Task("report"), Task("report")
+    old.created_min -= 5 * 365 * 24 * 60
+    same_minute.created_min = new.created_min
+    index = SearchIndex([new, old, same_minute])
+    assert index.search("report") == [same_minute, new, old]
+    newest = Task("report")
+    newest.created_min = new.created_min + 1
+    index.add(newest)
+    index.remove(same_minute)
+    assert index.search("report", limit=2) == [newest, new]
+
+
+def test_store_builds_search_index_in_background(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "data.json"
+    kept, removed = Task("apple pie"), Task("apple juice")
+    JsonStorage(path).save([kept, removed], [])
+    gate = threading.Event()
+
+    class SlowIndex(SearchIndex):
+        def __init__(self, tasks: Iterable[Task] = ()):
+            gate.wait()
+            super().__init__(tasks)
+
+    monkeypatch.setattr(store_module, "SearchIndex", SlowIndex)
+    store = TaskStore(JsonStorage(path))
+    # 索引还在建立，修改不受影响
+    added = Task("apple tart")
+    store.add(added)
+    store.delete(store.get(removed.id) or removed)
+    gate.set()
+    assert [t.id for t in store.search("apple")] == [added.id, kept.id]
+
+
+def test_store_search_with_each_backend(tmp_path: Path):
+    for storage in (JsonStorage(tmp_path / "data.json"), SqliteStorage(tmp_path / "data.sqlite3")):
+        store = TaskStore(storage)
+        kept, removed = Task("写周报 weekly report"), Task("写日报 daily report")
+        store.add(kept)
+        store.add(removed)
+        store.delete(removed)
+        assert [t.id for t in store.search("Report")] == [kept.id]
+        assert [t.id for t in store.search("周报")] == [kept.id]
+        # 索引建立后继续随增删更新
+        added = Task("月报 monthly report")
+        store.add(added)
+        assert [t.id for t in store.search("report")] == [added.id, kept.id]
+        store.close()
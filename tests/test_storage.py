@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import datetime
+from typing import TYPE_CHECKING
+
+import pytest
+
+from todo._dataclass import HistoryItem, Task, ToDoSettings
+from todo.core import TaskStore
+from todo.storage import (
+    ChangeSet,
+    JournalStorage,
+    JsonStorage,
+    QueryableStorage,
+    SqliteStorage,
+    Storage,
+    WriteBehindStorage,
+    iter_jsonl,
+    migrate_json_to_sqlite,
+    open_storage,
+)
+from todo.storage.codecs import BinaryCodec, convert, detect_codec
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+    from pathlib import Path
+
+    from todo._typing import DataFormat
+
+
+def test_journal_replays_on_top_of_snapshot(tmp_path: Path):
+    storage = JournalStorage(tmp_path / "data.json")
+    first, second = Task("first"), Task("second")
+    storage.save([first], [])
+
+    storage.commit([first, second], [], ChangeSet([second], history=[HistoryItem("Added", "second", "daily")]))
+    first.completed = True
+    storage.commit([first, second], [], ChangeSet([first]))
+    storage.commit([first], [], ChangeSet(deleted=[second.id]))
+
+    tasks, history = JournalStorage(tmp_path / "data.json").load()
+    assert [(t.id, t.completed) for t in tasks] == [(first.id, True)]
+    assert [h.action for h in history] == ["Added"]
+
+
+def test_journal_checkpoint_truncates_log(tmp_path: Path):
+    storage = JournalStorage(tmp_path / "data.json", checkpoint_interval=2)
+    task = Task("task")
+    storage.commit([task], [], ChangeSet([task]))
+    assert storage.journal_path.exists()
+    storage.commit([task], [], ChangeSet([task]))
+    assert not storage.journal_path.exists()
+    tasks, _ = storage.load()
+    assert [t.id for t in tasks] == [task.id]
+
+
+def test_journal_ignores_torn_tail(tmp_path: Path):
+    storage = JournalStorage(tmp_path / "data.json")
+    task = Task("task")
+    storage.commit([task], [], ChangeSet([task]))
+    with storage.journal_path.open("a", encoding="utf-8") as f:
+        f.write('{"op":"delete","id"')
+    tasks, _ = storage.load()
+    assert [t.id for t in tasks] == [task.id]
+    assert storage.journal_path.read_text(encoding="utf-8").endswith("}\n")
+
+
+def test_sqlite_queries_follow_tab_order(tmp_path: Path):
+    storage = SqliteStorage(tmp_path / "data.sqlite3")
+    later, sooner, undated = (
+        Task("later", due_date="2030-01-02"),
+        Task("sooner", due_date="2030-01-01"),
+        Task("undated"),
+    )
+    weekly = Task("weekly", task_type="weekly")
+    storage.save([undated, later, sooner, weekly], [])
+
+    assert [t.task for t in storage.query_tasks("daily", limit=10)] == ["sooner", "later", "undated"]
+    assert [t.task for t in storage.query_tasks("daily", limit=1, offset=1)] == ["later"]
+    assert storage.count_tasks("weekly") == 1
+
+    sooner.completed, sooner.completed_at = True, "2030-01-01 08:00"
+    storage.commit(
+        [], [], ChangeSet([sooner], deleted=[later.id], history=[HistoryItem("Completed_action", "s", "daily")])
+    )
+    assert [t.task for t in storage.query_tasks("daily", limit=10)] == ["undated"]
+    assert [t.task for t in storage.query_tasks("completed", limit=10)] == ["sooner"]
+    assert [h.action for h in storage.recent_history(5)] == ["Completed_action"]
+
+
+def test_migrate_json_to_sqlite(tmp_path: Path):
+    JsonStorage(tmp_path / "data.json").save([Task("a"), Task("b")], [HistoryItem("Added", "a", "daily")])
+    assert migrate_json_to_sqlite(tmp_path / "data.json", tmp_path / "data.sqlite3") == (2, 1)
+    tasks, history = SqliteStorage(tmp_path / "data.sqlite3").load()
+    assert sorted(t.task for t in tasks) == ["a", "b"]
+    assert len(history) == 1
+
+
+class CountingStorage(Storage):
+    def __init__(self):
+        self.saved: list[list[str]] = []
+
+    def load(self) -> tuple[list[Task], list[HistoryItem]]:
+        return [], []
+
+    def save(self, tasks: Collection[Task], history: Sequence[HistoryItem]) -> None:
+        self.saved.append([t.id for t in tasks])
+
+
+def test_write_behind_coalesces_burst():
+    inner = CountingStorage()
+    storage = WriteBehindStorage(inner, window=60)
+    tasks: list[Task] = []
+    for _ in range(20):
+        tasks.append(Task("task"))
+        storage.commit(tasks, [], ChangeSet([tasks[-1]]))
+    assert inner.saved == []
+    storage.close()
+    assert inner.saved == [[t.id for t in tasks]]
+
+
+def test_write_behind_keeps_failure_in_last_error(capsys: pytest.CaptureFixture[str]):
+    class FailingStorage(CountingStorage):
+        def save(self, tasks: Collection[Task], history: Sequence[HistoryItem]) -> None:
+            raise OSError("disk full")
+
+    storage = WriteBehindStorage(FailingStorage(), window=60)
+    storage.save([Task("task")], [])
+    storage.flush()
+    assert isinstance(storage.last_error, OSError)
+    assert capsys.readouterr().out == ""
+    storage.close()
+
+
+def test_write_behind_keeps_sqlite_queryable(tmp_path: Path):
+    settings = ToDoSettings.model_validate(
+        {
+            "storage_backend": "sqlite",
+            "sqlite_file_path": str(tmp_path / "data.sqlite3"),
+            "history_file_path": str(tmp_path / "data.json"),
+            "write_behind": True,
+            "write_coalesce_ms": 60_000,
+        }
+    )
+    storage = open_storage(settings)
+    assert isinstance(storage, QueryableStorage)
+    store = TaskStore(storage)
+    store.add(Task("overdue", due_date="2024-01-01"))
+    # 查询先写完积压的修改
+    assert store.count("daily") == 1
+    assert store.due_counts("daily", datetime.date(2025, 1, 1).toordinal())[0] == 1
+    store.close()
+    json_storage = open_storage(settings.model_copy(update={"storage_backend": "json"}))
+    assert isinstance(json_storage, WriteBehindStorage) and not isinstance(json_storage, QueryableStorage)
+    json_storage.close()
+
+
+def test_changeset_merge_keeps_final_state():
+    task = Task("task")
+    changes = ChangeSet([task])
+    changes.merge(ChangeSet(deleted=[task.id]))
+    assert (changes.upserted, changes.deleted) == ([], [task.id])
+    changes.merge(ChangeSet([task]))
+    assert (changes.upserted, changes.deleted) == ([task], [])
+
+
+def test_json_save_leaves_no_temp_files(tmp_path: Path):
+    JsonStorage(tmp_path / "data.json").save([Task("task")], [])
+    # 只剩数据文件与持久存在的锁文件
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["data.json", "data.json.lock"]
+
+
+def test_jsonl_round_trip_and_format_detection(tmp_path: Path):
+    task, item = Task("任务\nwith newline"), HistoryItem("Added", "任务", "daily")
+    JsonStorage(tmp_path / "data.json", data_format="jsonl").save([task], [item])
+    assert (tmp_path / "data.json").read_bytes().startswith(b'{"kind":"header"')
+    assert [type(r).__name__ for r in iter_jsonl(tmp_path / "data.json")] == ["Task", "HistoryItem"]
+
+    # 读取时自动识别格式，与配置的写入格式无关
+    tasks, history = JsonStorage(tmp_path / "data.json").load()
+    assert [t.to_dict() for t in tasks] == [task.to_dict()]
+    assert [h.to_dict() for h in history] == [item.to_dict()]
+
+
+@pytest.mark.parametrize("data_format", ["json", "json-compact", "jsonl", "binary"])
+def test_codec_round_trip(tmp_path: Path, data_format: DataFormat):
+    done = Task("已完成 done", task_type="weekly", color="#FF0000", due_date="2025-01-02")
+    done.completed, done.completed_at = True, "2025-01-01 08:30"
+    broken = Task("bad date")
+    broken.due_date = "not a date"
+    tasks = [Task("任务\nwith newline"), done, broken, Task("")]
+    deleted = Task("deleted")
+    history = [
+        HistoryItem("Added", "任务", "daily"),
+        HistoryItem("Completed_action", "", "weekly"),
+        HistoryItem("Deleted", "deleted", "daily", deleted.id, {"before": [deleted.to_dict()], "after": []}),
+    ]
+
+    path = tmp_path / "data"
+    JsonStorage(path, data_format=data_format).save(tasks, history)
+    # 紧凑 JSON 与缩进 JSON 结构相同，识别为同一种读取方式
+    assert detect_codec(path).name == data_format.removesuffix("-compact")
+    loaded, loaded_history = JsonStorage(path).load()
+    assert [t.to_dict() for t in loaded] == [t.to_dict() for t in tasks]
+    assert [h.to_dict() for h in loaded_history] == [h.to_dict() for h in history]
+
+
+def test_convert_between_codecs(tmp_path: Path):
+    tasks = [Task(f"task {i}") for i in range(10)]
+    JsonStorage(tmp_path / "data.json").save(tasks, [])
+    assert convert(tmp_path / "data.json", tmp_path / "data.bin", "binary") == (10, 0)
+    assert (tmp_path / "data.bin").read_bytes().startswith(BinaryCodec.MAGIC)
+    loaded, _ = JsonStorage(tmp_path / "data.bin").load()
+    assert [t.to_dict() for t in loaded] == [t.to_dict() for t in tasks]
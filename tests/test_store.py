@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import datetime
+import subprocess
+import sys
+import threading
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from todo._dataclass import Task
+from todo.core import TaskStore, get_due_date_info
+from todo.storage import JournalStorage, JsonStorage, SqliteStorage, WriteBehindStorage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_store_mutations_are_persisted(tmp_path: Path):
+    store = TaskStore(JournalStorage(tmp_path / "data.json"))
+    done, removed = Task("done"), Task("removed")
+    store.add(done)
+    store.add(removed)
+    store.complete(done)
+    store.delete(removed)
+    assert store.revision == 4
+
+    reloaded = TaskStore(JournalStorage(tmp_path / "data.json"))
+    assert [(t.id, t.completed) for t in reloaded.tasks] == [(done.id, True)]
+    assert [h.action for h in reloaded.history] == ["Deleted", "Completed_action", "Added", "Added"]
+
+
+def test_store_concurrent_sessions_do_not_lose_writes(tmp_path: Path):
+    store = TaskStore(JournalStorage(tmp_path / "data.json"))
+
+    def session(n: int) -> None:
+        for i in range(50):
+            store.add(Task(f"{n}-{i}"))
+
+    threads = [threading.Thread(target=session, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reloaded = TaskStore(JournalStorage(tmp_path / "data.json"))
+    assert len(reloaded.tasks) == 400
+
+
+def test_history_retention_archives_expired_items(tmp_path: Path):
+    archive = tmp_path / "archive.jsonl"
+    store = TaskStore(JournalStorage(tmp_path / "data.json"), history_max_items=3, archive_path=archive)
+    for i in range(5):
+        store.add(Task(f"task {i}"))
+    assert store.compact_history() == 2
+    assert [h.task_description for h in store.history] == ["task 4", "task 3", "task 2"]
+    assert archive.read_text(encoding="utf-8").count("\n") == 2
+
+    reloaded = TaskStore(JournalStorage(tmp_path / "data.json"))
+    assert len(reloaded.history) == 3
+
+
+def test_history_retention_keeps_items_when_archive_fails(tmp_path: Path):
+    path = tmp_path / "data.json"
+    store = TaskStore(JournalStorage(path))
+    for i in range(6):
+        store.add(Task(f"task {i}"))
+    # 归档路径是目录，写入失败
+    store = TaskStore(JournalStorage(path), history_max_items=3, archive_path=tmp_path)
+    assert isinstance(store.archive_error, OSError)
+    assert store.compact_history() == 0
+    store.add(Task("task 6"))
+    assert len(store.history) == 7
+    assert len(TaskStore(JournalStorage(path)).history) == 7
+
+
+def test_history_retention_with_sqlite(tmp_path: Path):
+    archive = tmp_path / "archive.jsonl"
+    store = TaskStore(SqliteStorage(tmp_path / "data.sqlite3"), history_max_items=2, archive_path=archive)
+    for i in range(4):
+        store.add(Task(f"task {i}"))
+    assert store.compact_history() == 2
+    assert [h.task_description for h in store.recent_history(10)] == ["task 3", "task 2"]
+
+
+def test_core_imports_without_streamlit():
+    code = "import sys, todo.core, todo.core.importer; assert 'streamlit' not in sys.modules"
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_due_date_info_is_available_headless():
+    today = datetime.date(2025, 3, 10)
+    overdue, soon = Task("a", due_date="2025-03-08"), Task("b", due_date="2025-03-12")
+    assert get_due_date_info(overdue, "en", today) == "🔥 Overdue 2 days"
+    assert get_due_date_info(soon, "zh", today) == "🗓️ 还剩 2 天"
+    assert get_due_date_info(Task("c"), "en", today) == ""
+
+
+@pytest.mark.parametrize("storage_class", [JsonStorage, JournalStorage])
+def test_refresh_applies_external_changes(tmp_path: Path, storage_class: type[JsonStorage | JournalStorage]):
+    ours = TaskStore(storage_class(tmp_path / "data.json"))
+    theirs = TaskStore(storage_class(tmp_path / "data.json"))
+    kept, removed = Task("kept apple"), Task("removed")
+    ours.add(kept)
+    ours.add(removed)
+    assert ours.search("apple") == [kept]
+    assert not ours.refresh()
+
+    assert theirs.refresh()
+    assert {t.id for t in theirs.tasks} == {kept.id, removed.id}
+    theirs.complete(theirs.get(kept.id) or kept)
+    theirs.delete(removed)
+    theirs.add(Task("new apple"))
+
+    revision = ours.revision
+    assert ours.refresh()
+    assert ours.revision == revision + 1
+    assert [(t.task, t.completed) for t in ours.tasks_in("completed")] == [("kept apple", True)]
+    assert [t.task for t in ours.tasks_in("daily")] == ["new apple"]
+    assert [t.task for t in ours.search("apple")] == ["new apple", "kept apple"]
+    assert [h.action for h in ours.recent_history(3)] == ["Added", "Deleted", "Completed_action"]
+    assert not ours.refresh()
+
+
+def test_refresh_without_changes_does_not_read_file(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    store = TaskStore(JsonStorage(tmp_path / "data.json"))
+    store.add(Task("a"))
+    store.refresh()
+
+    def fail(self: JsonStorage) -> None:
+        raise AssertionError("unchanged file was re-read")
+
+    monkeypatch.setattr(JsonStorage, "read", fail)
+    for _ in range(3):
+        assert not store.refresh()
+
+
+def test_refresh_does_not_flush_write_behind(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """每次操作后界面都会重跑并调用 refresh，它不能把待写的修改同步写出，否则合并窗口失效。"""
+    writes: list[int] = []
+    write = JsonStorage.write
+
+    def counting_write(self: JsonStorage, *args: Any) -> None:
+        writes.append(1)
+        write(self, *args)
+
+    monkeypatch.setattr(JsonStorage, "write", counting_write)
+    storage = WriteBehindStorage(JsonStorage(tmp_path / "data.json"), window=60)
+    store = TaskStore(storage)
+    for i in range(5):
+        store.add(Task(f"task {i}"))
+        assert not store.refresh()
+    assert writes == []
+    store.close()
+    assert writes == [1]
+    assert len(JsonStorage(tmp_path / "data.json").load()[0]) == 5
+
+
+@pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+def test_undo_redo_across_restarts(tmp_path: Path, backend: str):
+    def open_store() -> TaskStore:
+        if backend == "sqlite":
+            return TaskStore(SqliteStorage(tmp_path / "data.sqlite3"))
+        storage_class = JournalStorage if backend == "journal" else JsonStorage
+        return TaskStore(storage_class(tmp_path / "data.json"))
+
+    def state(store: TaskStore) -> list[tuple[str, bool]]:
+        return sorted((t.task, t.completed) for t in store.all_tasks())
+
+    store = open_store()
+    first, second = Task("first"), Task("second")
+    store.add(first)
+    store.add(second)
+    store.complete(first)
+    store.delete(second)
+    assert [item.action for item in store.undo(2)] == ["Deleted", "Completed_action"]
+    assert state(store) == [("first", False), ("second", False)]
+    store.close()
+
+    # 撤销栈由事件日志推出，重启后仍可继续重做
+    store = open_store()
+    assert (len(store.undo_stack.undo), len(store.undo_stack.redo)) == (2, 2)
+    assert [item.action for item in store.redo()] == ["Completed_action"]
+    assert state(store) == [("first", True), ("second", False)]
+    store.add(Task("third"))
+    assert not store.undo_stack.redo
+    assert [item.action for item in store.undo(10)] == ["Added", "Completed_action", "Added", "Added"]
+    assert state(store) == []
+    assert [h.action for h in store.recent_history(2)] == ["Undone", "Undone"]
+    store.close()
+
+
+def test_undo_recurring_completion_removes_next_occurrence(tmp_path: Path):
+    store = TaskStore(JsonStorage(tmp_path / "data.json"))
+    task = Task("water plants", due_date=datetime.date.today().isoformat(), recurrence="FREQ=DAILY;INTERVAL=1")
+    store.add(task)
+    store.complete(task)
+    assert len(store.tasks) == 2
+    store.undo()
+    (restored,) = store.tasks
+    assert (restored.id, restored.completed, restored.recurrence) == (task.id, False, "FREQ=DAILY;INTERVAL=1")
+
+
+def test_journal_rebuilds_from_snapshot_and_events(tmp_path: Path):
+    store = TaskStore(JournalStorage(tmp_path / "data.json", checkpoint_interval=5))
+    tasks = [Task(f"task {i}") for i in range(7)]
+    for task in tasks:
+        store.add(task)
+    store.complete(tasks[0])
+    store.undo()
+    # 检查点之后的日志只有事件记录，每次操作一条
+    lines = (tmp_path / "data.json.journal").read_text().splitlines()
+    assert len(lines) == 4 and all(line.startswith('{"op":"history"') for line in lines)
+    loaded, _ = JournalStorage(tmp_path / "data.json").load()
+    assert sorted((t.task, t.completed) for t in loaded) == [(t.task, False) for t in tasks]
+    store.close()
@@ -1,7 +1,95 @@
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
 from todo import __version__
+from todo._dataclass import Task
+from todo.storage import JsonStorage
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
 
 
 def test_version():
     assert __version__ == "0.1.0"
+
+
+def test_lazy_tabs_follow_every_click(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """连续切换标签页，每次点击都要显示点中的分类。"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    from todo.bench.runner import SCRIPT
+
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "todo.toml").write_text('lazy_tabs = true\nhistory_file_path = "data.json"\n')
+    tasks = [Task(f"{task_type} task", task_type=task_type) for task_type in ("daily", "weekly", "monthly")]
+    done = Task("done task")
+    done.completed = True
+    JsonStorage(tmp_path / "data.json").save([*tasks, done], [])
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(SCRIPT), default_timeout=30).run()
+
+    def shown() -> list[str]:
+        return [
+            text
+            for text in ("daily task", "weekly task", "monthly task", "done task")
+            if any(text in m.value for m in at.markdown)
+        ]
+
+    assert shown() == ["daily task"]
+    for tab in ("weekly", "monthly", "completed", "daily", "monthly", "weekly"):
+        at.radio(key="active_tab").set_value(tab).run()
+        assert not at.exception
+        assert shown() == [f"{tab} task" if tab != "completed" else "done task"]
+    st.cache_resource.clear()
+
+
+def test_lazy_tab_selection_survives_count_changes(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """标签文字不含数量，完成任务改变数量后仍停留在选中的分类。"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    from todo.bench.runner import SCRIPT
+
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "todo.toml").write_text('lazy_tabs = true\nhistory_file_path = "data.json"\n')
+    overdue = Task("overdue task", task_type="weekly", due_date="2024-01-01")
+    JsonStorage(tmp_path / "data.json").save([overdue, Task("later task", task_type="weekly")], [])
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(SCRIPT), default_timeout=30).run()
+    at.radio(key="active_tab").set_value("weekly").run()
+    assert "Weekly 2 🔥1" in at.caption[0].value
+    at.button(key=f"complete_button_weekly_{overdue.id}").click().run()
+    assert not at.exception
+    assert at.radio(key="active_tab").value == "weekly"
+    assert "Weekly 1 ·" in at.caption[0].value and "🔥" not in at.caption[0].value
+    assert any("later task" in m.value for m in at.markdown)
+    st.cache_resource.clear()
+
+
+def test_lazy_tab_selection_survives_sidebar_actions(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    """侧边栏添加任务后在渲染标签页之前重跑，重跑后仍停留在选中的分类。"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    from todo.bench.runner import SCRIPT
+
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "todo.toml").write_text('lazy_tabs = true\nhistory_file_path = "data.json"\n')
+    JsonStorage(tmp_path / "data.json").save([Task("weekly task", task_type="weekly")], [])
+    monkeypatch.chdir(tmp_path)
+    st.cache_resource.clear()
+    at = AppTest.from_file(str(SCRIPT), default_timeout=30).run()
+    at.radio(key="active_tab").set_value("weekly").run()
+    at.sidebar.text_area[0].input("daily task")
+    at.sidebar.button[0].click().run()
+    assert not at.exception
+    assert at.radio(key="active_tab").value == "weekly"
+    assert any("weekly task" in m.value for m in at.markdown)
+    assert "General 1" in at.caption[0].value
+    st.cache_resource.clear()